@@ -0,0 +1,106 @@
+import argparse
+import os
+import resource
+import subprocess
+import tempfile
+import time
+from multiprocessing.pool import ThreadPool
+from threading import RLock
+
+from gitclone.backends import BACKENDS
+from gitclone.progress import GitRemoteProgress, GitRichProgress
+
+
+class CountingProgress(GitRemoteProgress):
+    def __init__(self, progressbar: GitRichProgress) -> None:
+        super().__init__(progressbar, None, "bench")
+        self.task = 0  # type: ignore
+        self.updates = 0
+
+    def update_phase(self, phase: str, percentage: int) -> None:
+        with self.progressbar.lock:
+            self.updates += 1
+
+
+def git(*args: str, cwd: str | None = None) -> None:
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=gitclone",
+            "-c",
+            "user.email=gitclone@example.com",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def create_remote(root: str, commits: int, files: int) -> str:
+    work = os.path.join(root, "work")
+    git("init", "-q", work)
+    for commit in range(commits):
+        for i in range(files):
+            with open(os.path.join(work, f"file{i}.txt"), "w") as f:
+                f.write(f"{commit} {i}\n" * 20)
+        git("add", ".", cwd=work)
+        git("commit", "-q", "-m", f"Commit {commit}", cwd=work)
+    remote = os.path.join(root, "remote.git")
+    git("clone", "-q", "--bare", work, remote)
+    return f"file://localhost{remote}"
+
+
+def cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench(
+    backend: str, url: str, root: str, clones: int, parallel: int
+) -> None:
+    progressbar = GitRichProgress(RLock())
+    progressbar.close()
+    tasks = [CountingProgress(progressbar) for _ in range(clones)]
+
+    def clone(i: int) -> None:
+        BACKENDS[backend].clone(
+            url=url,
+            dest=os.path.join(root, f"{backend}{i}"),
+            branch=None,
+            options=[],
+            task=tasks[i],
+        )
+
+    start_cpu = cpu_time()
+    start = time.perf_counter()
+    with ThreadPool(parallel) as pool:
+        pool.map(clone, range(clones))
+    elapsed = time.perf_counter() - start
+    cpu = cpu_time() - start_cpu
+    updates = sum(t.updates for t in tasks)
+    print(f"{backend}:")
+    print(f"  wall time:              {elapsed:.3f}s")
+    print(f"  python cpu per clone:   {cpu / clones * 1000:.2f}ms")
+    print(f"  progress updates/clone: {updates / clones:.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the CPU time spent in the gitclone process"
+        " per clone for the available git backends."
+    )
+    parser.add_argument("--clones", type=int, default=40)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--commits", type=int, default=20)
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as root:
+        url = create_remote(root, args.commits, args.files)
+        for backend in sorted(BACKENDS):
+            bench(backend, url, root, args.clones, args.parallel)
+
+
+if __name__ == "__main__":
+    main()
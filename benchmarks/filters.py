@@ -0,0 +1,97 @@
+import argparse
+import random
+import time
+from typing import Callable
+
+from gitclone.repositories import RepoFilter, RepoSpecification
+
+WORDS = ["api", "web", "docs", "tools", "infra", "mobile", "data", "ml"]
+
+
+def synthetic_repos(count: int, seed: int = 0) -> list[RepoSpecification]:
+    rng = random.Random(seed)
+    repos: list[RepoSpecification] = []
+    for i in range(count):
+        org = f"org{rng.randrange(50)}"
+        name = "-".join(rng.sample(WORDS, 2)) + f"-{i}"
+        repos.append(
+            RepoSpecification(
+                url=f"git@github.com:{org}/{name}.git",
+                dest=f"github.com/{org}/{name}",
+            )
+        )
+    return repos
+
+
+def per_pattern_filter(
+    repos: list[RepoSpecification], includes: list[str], excludes: list[str]
+) -> list[RepoSpecification]:
+    if includes:
+        repos = [r for r in repos if any(r.matches(p) for p in includes)]
+    if excludes:
+        repos = [r for r in repos if not any(r.matches(p) for p in excludes)]
+    return repos
+
+
+def compiled_filter(
+    repos: list[RepoSpecification], includes: list[str], excludes: list[str]
+) -> list[RepoSpecification]:
+    return RepoFilter(includes, excludes).filter(repos)
+
+
+def measure(
+    name: str,
+    func: Callable[
+        [list[RepoSpecification], list[str], list[str]],
+        list[RepoSpecification],
+    ],
+    repos: list[RepoSpecification],
+    includes: list[str],
+    excludes: list[str],
+    rounds: int,
+) -> list[RepoSpecification]:
+    best = float("inf")
+    result: list[RepoSpecification] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(repos, includes, excludes)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<14} {best * 1000:9.1f}ms ({len(result)} matched)")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-pattern re.match filtering against the"
+        " compiled single-pass include/exclude filter."
+    )
+    parser.add_argument("--repos", type=int, default=100_000)
+    parser.add_argument("--patterns", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    repos = synthetic_repos(args.repos)
+    includes = [f".*/org{i}/" for i in range(0, args.patterns * 5, 5)] + [
+        ".*-tools-"
+    ]
+    excludes = [f".*{word}-{word}" for word in WORDS] + [".*docs"]
+    print(
+        f"repos={args.repos} includes={len(includes)}"
+        f" excludes={len(excludes)}"
+    )
+    expected = measure(
+        "per-pattern",
+        per_pattern_filter,
+        repos,
+        includes,
+        excludes,
+        args.rounds,
+    )
+    result = measure(
+        "compiled", compiled_filter, repos, includes, excludes, args.rounds
+    )
+    assert result == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import statistics
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+
+from gitclone.gitcmds import GitActionMultiprocessingHandler, GitRichProgress
+
+
+@dataclass
+class Timeline:
+    lock: Lock = field(default_factory=Lock)
+    starts: list[float] = field(default_factory=list)
+    ends: list[float] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class SleepAction:
+    timeline: Timeline
+    server: str
+    name: str
+    duration: float
+    progress_updates: int = 0
+    connections: int = 1
+
+    def run(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        start = time.perf_counter()
+        if self.progress_updates:
+            task = progress.task(self.name, self.desc)
+            for i in range(self.progress_updates):
+                task.update_phase(
+                    "Receiving", i * 100 // self.progress_updates
+                )
+                time.sleep(self.duration / self.progress_updates)
+            task.stop()
+        else:
+            time.sleep(self.duration)
+        end = time.perf_counter()
+        with self.timeline.lock:
+            self.timeline.starts.append(start)
+            self.timeline.ends.append(end)
+
+    @property
+    def desc(self) -> str:
+        return "Sleep"
+
+
+def idle_gaps(timeline: Timeline, concurrency: int) -> list[float]:
+    ends = sorted(timeline.ends)
+    starts = sorted(timeline.starts)[concurrency:]
+    return [max(0.0, s - e) for s, e in zip(starts, ends)]
+
+
+def bench(
+    actions: int,
+    servers: int,
+    duration: float,
+    per_server: int,
+    total: int,
+    progress_updates: int = 0,
+) -> None:
+    timeline = Timeline()
+    handler = GitActionMultiprocessingHandler(
+        [
+            SleepAction(
+                timeline,
+                f"server{i % servers}",
+                f"a{i}",
+                duration,
+                progress_updates,
+            )
+            for i in range(actions)
+        ],  # type: ignore
+        max_connections_per_server=per_server,
+        max_connections_total=total,
+    )
+    start = time.perf_counter()
+    handler.run()
+    elapsed = time.perf_counter() - start
+
+    concurrency = min(total, servers * per_server)
+    ideal = actions / concurrency * duration
+    gaps = idle_gaps(timeline, concurrency)
+    print(
+        f"actions={actions} servers={servers} duration={duration}s"
+        f" per_server={per_server} total={total}"
+        f" progress_updates={progress_updates}"
+    )
+    print(f"  wall time:        {elapsed:.3f}s (ideal {ideal:.3f}s)")
+    print(f"  scheduling cost:  {elapsed - ideal:.3f}s")
+    if gaps:
+        print(f"  mean idle gap:    {statistics.mean(gaps) * 1000:.3f}ms")
+        print(f"  max idle gap:     {max(gaps) * 1000:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the idle time between action completions"
+        " and the start of the next action in the scheduler."
+    )
+    parser.add_argument("--actions", type=int, default=200)
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=0.01)
+    parser.add_argument("--per-server", type=int, default=5)
+    parser.add_argument("--total", type=int, default=5)
+    parser.add_argument("--progress-updates", type=int, default=0)
+    args = parser.parse_args()
+    bench(
+        args.actions,
+        args.servers,
+        args.duration,
+        args.per_server,
+        args.total,
+        args.progress_updates,
+    )
+    bench(5000, args.servers, 0.0, args.per_server, args.total)
+
+
+if __name__ == "__main__":
+    main()
@@ -200,7 +200,7 @@ setup_info = dict(
                 "--warn-return-any "
                 "--no-implicit-reexport "
                 "--strict-equality "
-                "src tests ext",
+                "src tests ext benchmarks",
                 "mypy --pretty "
                 "--warn-unused-configs "
                 "--disallow-any-generics "
@@ -0,0 +1,105 @@
+import asyncio
+from threading import RLock
+from typing import Protocol, cast
+
+from gitclone.concurrency import ConcurrencyController
+from gitclone.gitcmds import GitAction, GitActionScheduler, GitRichProgress
+from gitclone.retry import RetryPolicy
+
+
+class AsyncGitAction(GitAction, Protocol):
+    async def arun(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        ...
+
+
+class AsyncGitActionHandler(GitActionScheduler):
+    def __init__(
+        self,
+        actions: list[AsyncGitAction] = [],
+        max_connections_per_server: int = 5,
+        max_connections_total: int = 5,
+        controller: ConcurrencyController | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> None:
+        if controller is None:
+            controller = ConcurrencyController(
+                max_per_host=max_connections_per_server,
+                max_total=max_connections_total,
+            )
+        super().__init__(controller, retry)
+
+        self.wakeup: asyncio.Event | None = None
+        self.tasks: set[asyncio.Task[None]] = set()
+
+        for action in actions:
+            self.add_action(action)
+
+    def _notify(self) -> None:
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def add_action(
+        self, action: AsyncGitAction, after: AsyncGitAction | None = None
+    ) -> None:
+        self._add_action(action, after)
+
+    def add_error(self, action: AsyncGitAction, exc: BaseException) -> None:
+        self._add_error(action, exc)
+
+    async def _run_action(
+        self,
+        action: AsyncGitAction,
+        gitrichprogress: GitRichProgress,
+        verbose: bool,
+        dry_run: bool,
+    ) -> None:
+        try:
+            await action.arun(gitrichprogress, verbose, dry_run)
+        except Exception as e:
+            self._finish(action, e)
+        else:
+            self._finish(action)
+
+    async def run(self, verbose: bool = False, dry_run: bool = False) -> None:
+        gitrichprogress = GitRichProgress(RLock())
+        self.wakeup = asyncio.Event()
+
+        try:
+            self._start_progress(gitrichprogress)
+            while not self._is_finished():
+                action = self._get_next_action()
+                if action:
+                    task = asyncio.create_task(
+                        self._run_action(
+                            cast(AsyncGitAction, action),
+                            gitrichprogress,
+                            verbose,
+                            dry_run,
+                        )
+                    )
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+                else:
+                    try:
+                        await asyncio.wait_for(
+                            self.wakeup.wait(), self._next_delay()
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    self.wakeup.clear()
+        finally:
+            tasks = list(self.tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.wakeup = None
+            gitrichprogress.close()
+        self._raise_errors()
+
+
+__all__ = ["AsyncGitAction", "AsyncGitActionHandler"]
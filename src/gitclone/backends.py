@@ -0,0 +1,200 @@
+import asyncio
+import os
+import shlex
+import subprocess
+from collections import deque
+from typing import Protocol
+
+from git import GitCommandError
+from git.repo import Repo
+
+from gitclone.exceptions import GitOperationException
+from gitclone.progress import (
+    GitRemoteProgress,
+    parse_progress,
+    parse_size,
+    split_progress_lines,
+)
+
+
+def git_env() -> dict[str, str]:
+    return dict(os.environ, GIT_TERMINAL_PROMPT="0")
+
+
+def clone_command(
+    url: str,
+    dest: str,
+    branch: str | None,
+    options: list[str],
+) -> list[str]:
+    cmd = ["git", "clone", "--progress"] + options
+    if branch:
+        cmd += ["--branch", branch]
+    return cmd + ["--", url, dest]
+
+
+class GitOutput:
+    def __init__(self, task: GitRemoteProgress | None) -> None:
+        self.task = task
+        self.lines: deque[str] = deque(maxlen=100)
+        self.buffer = b""
+
+    def feed(self, chunk: bytes) -> None:
+        lines, self.buffer = split_progress_lines(self.buffer + chunk)
+        for line in lines:
+            progress = parse_progress(line)
+            if progress is None:
+                self.lines.append(line.decode("utf-8", "replace"))
+            elif self.task is not None:
+                self.task.update_phase(*progress)
+                if progress[0] == "Receiving":
+                    self.task.update_received(
+                        parse_size(line.decode("utf-8", "replace"))
+                    )
+
+    def close(self) -> str:
+        if self.buffer:
+            self.lines.append(self.buffer.decode("utf-8", "replace"))
+            self.buffer = b""
+        return "\n".join(self.lines)
+
+
+def run_git(cmd: list[str], task: GitRemoteProgress | None = None) -> None:
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=git_env(),
+    )
+    assert process.stderr is not None
+    output = GitOutput(task)
+    fd = process.stderr.fileno()
+    while chunk := os.read(fd, 65536):
+        output.feed(chunk)
+    process.stderr.close()
+    status = process.wait()
+    if status:
+        raise GitCommandError(cmd, status, output.close())
+
+
+def git_output(cmd: list[str]) -> str:
+    result = subprocess.run(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        env=git_env(),
+    )
+    if result.returncode:
+        raise GitCommandError(
+            cmd,
+            result.returncode,
+            result.stderr.decode("utf-8", "replace"),
+        )
+    return result.stdout.decode("utf-8", "replace").strip()
+
+
+def ls_remote(url: str) -> dict[str, str]:
+    output = git_output(["git", "ls-remote", "--heads", "--tags", url])
+    refs: dict[str, str] = {}
+    for line in output.splitlines():
+        sha, _, ref = line.partition("\t")
+        refs[ref] = sha
+    return refs
+
+
+async def run_git_async(
+    cmd: list[str], task: GitRemoteProgress | None = None
+) -> None:
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        env=git_env(),
+    )
+    assert process.stderr is not None
+    output = GitOutput(task)
+    try:
+        while chunk := await process.stderr.read(65536):
+            output.feed(chunk)
+        status = await process.wait()
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if status:
+        raise GitCommandError(cmd, status, output.close())
+
+
+class GitBackend(Protocol):
+    def clone(
+        self,
+        url: str,
+        dest: str,
+        branch: str | None,
+        options: list[str],
+        task: GitRemoteProgress | None,
+    ) -> None:
+        ...
+
+
+class GitPythonBackend(GitBackend):
+    def clone(
+        self,
+        url: str,
+        dest: str,
+        branch: str | None,
+        options: list[str],
+        task: GitRemoteProgress | None,
+    ) -> None:
+        Repo.clone_from(  # type: ignore
+            url=url,
+            to_path=dest,
+            progress=task,  # type: ignore
+            env=dict(GIT_TERMINAL_PROMPT="0"),
+            branch=branch,
+            multi_options=[shlex.quote(option) for option in options],
+        )
+
+
+class SubprocessBackend(GitBackend):
+    def clone(
+        self,
+        url: str,
+        dest: str,
+        branch: str | None,
+        options: list[str],
+        task: GitRemoteProgress | None,
+    ) -> None:
+        run_git(clone_command(url, dest, branch, options), task)
+
+
+BACKENDS: dict[str, GitBackend] = {
+    "gitpython": GitPythonBackend(),
+    "subprocess": SubprocessBackend(),
+}
+
+
+def get_backend(name: str) -> GitBackend:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise GitOperationException(f"Unknown git backend: {name}")
+
+
+__all__ = [
+    "git_env",
+    "clone_command",
+    "GitOutput",
+    "run_git",
+    "git_output",
+    "ls_remote",
+    "run_git_async",
+    "GitBackend",
+    "GitPythonBackend",
+    "SubprocessBackend",
+    "BACKENDS",
+    "get_backend",
+]
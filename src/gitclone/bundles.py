@@ -0,0 +1,102 @@
+import hashlib
+import os
+import re
+import threading
+
+from git import GitCommandError
+
+from gitclone.backends import git_output, run_git
+from gitclone.progress import GitRemoteProgress
+
+BUNDLE_REFS = "refs/bundle/"
+
+
+def bundle_name(url: str) -> str:
+    name = url.rstrip("/").rpartition("/")[2].rpartition(":")[2]
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name.removesuffix(".git"))
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+    return f"{name or 'repository'}-{digest}.bundle"
+
+
+def bundle_path(directory: str, url: str) -> str:
+    return os.path.join(os.path.expanduser(directory), bundle_name(url))
+
+
+def create_bundle(repo: str, path: str) -> None:
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    git_output(["git", "-C", repo, "bundle", "create", "-q", tmp, "--all"])
+    os.replace(tmp, path)
+
+
+def bundle_head(bundle: str) -> str | None:
+    heads: dict[str, str] = {}
+    listing = git_output(["git", "bundle", "list-heads", bundle])
+    for line in listing.splitlines():
+        sha, _, ref = line.partition(" ")
+        heads[ref] = sha
+    branches = [
+        ref.removeprefix("refs/heads/")
+        for ref, sha in heads.items()
+        if ref.startswith("refs/heads/") and sha == heads.get("HEAD")
+    ]
+    return branches[0] if len(branches) == 1 else None
+
+
+def _default_branch(dest: str, bundle: str) -> str:
+    branch = bundle_head(bundle)
+    if branch:
+        try:
+            git_output(
+                ["git", "-C", dest, "rev-parse", "--verify", "-q"]
+                + [f"refs/remotes/origin/{branch}"]
+            )
+            return branch
+        except GitCommandError:
+            pass
+    git_output(["git", "-C", dest, "remote", "set-head", "origin", "--auto"])
+    head = git_output(
+        ["git", "-C", dest, "symbolic-ref", "refs/remotes/origin/HEAD"]
+    )
+    return head.removeprefix("refs/remotes/origin/")
+
+
+def seed_from_bundle(
+    bundle: str,
+    url: str,
+    dest: str,
+    branch: str | None,
+    submodule_options: list[str],
+    task: GitRemoteProgress | None = None,
+) -> None:
+    git = ["git", "-C", dest]
+    bundle = os.path.abspath(bundle)
+    git_output(["git", "init", "-q", dest])
+    git_output(git + ["fetch", "-q", bundle, f"+refs/*:{BUNDLE_REFS}*"])
+    git_output(git + ["remote", "add", "origin", url])
+    run_git(git + ["fetch", "--progress", "origin"], task)
+    branch = branch or _default_branch(dest, bundle)
+    git_output(
+        git + ["checkout", "-q", "-B", branch, "--track", f"origin/{branch}"]
+    )
+    if os.path.exists(os.path.join(dest, ".gitmodules")):
+        git_output(
+            git
+            + ["submodule", "update", "--init", "--recursive"]
+            + submodule_options
+        )
+    refs = git_output(
+        git + ["for-each-ref", "--format=%(refname)", BUNDLE_REFS]
+    )
+    for ref in refs.splitlines():
+        git_output(git + ["update-ref", "-d", ref])
+
+
+__all__ = [
+    "bundle_name",
+    "bundle_path",
+    "create_bundle",
+    "bundle_head",
+    "seed_from_bundle",
+]
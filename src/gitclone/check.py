@@ -0,0 +1,235 @@
+import configparser
+import os
+import subprocess
+from dataclasses import asdict, dataclass
+from multiprocessing.pool import ThreadPool
+
+from gitclone.backends import git_env
+from gitclone.syncstate import SyncState
+
+CHECK_MISSING = "missing"
+CHECK_INVALID = "invalid"
+CHECK_DIRTY = "dirty"
+CHECK_DIVERGED = "diverged"
+CHECK_BEHIND = "behind"
+CHECK_AHEAD = "ahead"
+CHECK_STALE = "stale"
+CHECK_CLEAN = "clean"
+
+STATUS_ARGS = [
+    "--no-optional-locks",
+    "-c",
+    "core.untrackedCache=true",
+    "status",
+    "--porcelain",
+    "--untracked-files=normal",
+    "--ignore-submodules=dirty",
+]
+
+
+@dataclass
+class CheckResult:
+    dest: str
+    status: str
+    branch: str | None = None
+    head: str | None = None
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+    dirty: bool = False
+    stale: bool | None = None
+
+    def to_dict(self) -> dict[str, str | int | bool | None]:
+        return asdict(self)
+
+
+def find_gitdir(dest: str) -> str | None:
+    gitdir = os.path.join(dest, ".git")
+    if os.path.isdir(gitdir):
+        return gitdir
+    if os.path.isfile(gitdir):
+        with open(gitdir, "r") as f:
+            line = f.readline().strip()
+        if line.startswith("gitdir:"):
+            path = line.partition(":")[2].strip()
+            return os.path.normpath(os.path.join(dest, path))
+    return None
+
+
+def common_dir(gitdir: str) -> str:
+    try:
+        with open(os.path.join(gitdir, "commondir"), "r") as f:
+            return os.path.normpath(os.path.join(gitdir, f.read().strip()))
+    except OSError:
+        return gitdir
+
+
+def read_ref(gitdir: str, ref: str) -> str | None:
+    for directory in dict.fromkeys([gitdir, common_dir(gitdir)]):
+        try:
+            with open(os.path.join(directory, ref), "r") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.startswith("ref:"):
+            return read_ref(gitdir, value[4:].strip())
+        return value or None
+    try:
+        with open(os.path.join(common_dir(gitdir), "packed-refs"), "r") as f:
+            for line in f:
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def read_head(gitdir: str) -> tuple[str | None, str | None]:
+    with open(os.path.join(gitdir, "HEAD"), "r") as f:
+        head = f.read().strip()
+    if not head.startswith("ref:"):
+        return None, head
+    ref = head[4:].strip()
+    branch = ref.removeprefix("refs/heads/")
+    return branch, read_ref(gitdir, ref)
+
+
+def read_upstream(gitdir: str, branch: str) -> tuple[str, str] | None:
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        config.read(os.path.join(common_dir(gitdir), "config"))
+    except configparser.Error:
+        return None
+    section = f'branch "{branch}"'
+    if not config.has_section(section):
+        return None
+    remote = config.get(section, "remote", fallback=None)
+    merge = config.get(section, "merge", fallback=None)
+    if not remote or not merge or remote == ".":
+        return None
+    return remote, merge
+
+
+def read_remote_url(gitdir: str, remote: str = "origin") -> str | None:
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        config.read(os.path.join(common_dir(gitdir), "config"))
+    except configparser.Error:
+        return None
+    return config.get(f'remote "{remote}"', "url", fallback=None)
+
+
+def _git(dest: str, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", dest, *args],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        check=True,
+        env=git_env(),
+        text=True,
+    ).stdout
+
+
+class Checker:
+    def __init__(
+        self,
+        state: SyncState | None = None,
+        max_workers: int = 16,
+        url_for: dict[str, str] | None = None,
+    ) -> None:
+        self.state = state
+        self.max_workers = max(1, max_workers)
+        self.url_for = url_for or {}
+
+    def _stale(
+        self, dest: str, merge: str, upstream: str | None
+    ) -> bool | None:
+        url = self.url_for.get(dest)
+        if self.state is None or url is None:
+            return None
+        remote = self.state.get(dest, url)
+        if remote is None or merge not in remote.refs:
+            return None
+        return remote.refs[merge] != upstream
+
+    def _compare(self, result: CheckResult) -> None:
+        if result.upstream is None or result.head == result.upstream:
+            return
+        ahead, behind = _git(
+            result.dest,
+            "rev-list",
+            "--left-right",
+            "--count",
+            f"{result.head}...{result.upstream}",
+        ).split()
+        result.ahead, result.behind = int(ahead), int(behind)
+
+    def check(self, dest: str) -> CheckResult:
+        if not os.path.exists(dest):
+            return CheckResult(dest=dest, status=CHECK_MISSING)
+        gitdir = find_gitdir(dest)
+        if gitdir is None:
+            return CheckResult(dest=dest, status=CHECK_INVALID)
+        try:
+            branch, head = read_head(gitdir)
+        except OSError:
+            return CheckResult(dest=dest, status=CHECK_INVALID)
+        result = CheckResult(dest=dest, status=CHECK_CLEAN)
+        result.branch, result.head = branch, head
+        if branch:
+            upstream = read_upstream(gitdir, branch)
+            if upstream:
+                remote, merge = upstream
+                result.upstream = read_ref(
+                    gitdir,
+                    f"refs/remotes/{remote}/"
+                    + merge.removeprefix("refs/heads/"),
+                )
+                result.stale = self._stale(dest, merge, result.upstream)
+        try:
+            self._compare(result)
+            result.dirty = bool(_git(dest, *STATUS_ARGS).strip())
+        except subprocess.CalledProcessError:
+            result.status = CHECK_INVALID
+            return result
+        result.status = self.status(result)
+        return result
+
+    def status(self, result: CheckResult) -> str:
+        if result.dirty:
+            return CHECK_DIRTY
+        if result.ahead and result.behind:
+            return CHECK_DIVERGED
+        if result.behind:
+            return CHECK_BEHIND
+        if result.ahead:
+            return CHECK_AHEAD
+        if result.stale:
+            return CHECK_STALE
+        return CHECK_CLEAN
+
+    def run(self, dests: list[str]) -> list[CheckResult]:
+        if not dests:
+            return []
+        with ThreadPool(min(self.max_workers, len(dests))) as pool:
+            return pool.map(self.check, dests)
+
+
+__all__ = [
+    "CHECK_MISSING",
+    "CHECK_INVALID",
+    "CHECK_DIRTY",
+    "CHECK_DIVERGED",
+    "CHECK_BEHIND",
+    "CHECK_AHEAD",
+    "CHECK_STALE",
+    "CHECK_CLEAN",
+    "CheckResult",
+    "Checker",
+    "find_gitdir",
+    "read_ref",
+    "read_head",
+    "read_upstream",
+    "read_remote_url",
+]
@@ -26,7 +26,7 @@ cli = typer.Typer()
 state = {"verbose": False, "debug": False}
 
 
-def command():  # type: ignore
+def command(name: str | None = None):  # type: ignore
     def decorator(f):  # type: ignore
         @functools.wraps(f)  # type: ignore
         def inner_cmd(
@@ -42,9 +42,9 @@ def command():  # type: ignore
                 sys.exit(0)
             f(*args, verbose=state["verbose"], debug=state["debug"], **kwargs)
 
-        COMMANDS.append(f.__name__)  # type: ignore
+        COMMANDS.append(name or f.__name__)  # type: ignore
 
-        inner_cmd = cli.command()(inner_cmd)  # type: ignore
+        inner_cmd = cli.command(name=name)(inner_cmd)  # type: ignore
 
         return inner_cmd
 
@@ -68,7 +68,119 @@ def pull(
     version: bool = typer.Option(None, "--version", help=VERSION_HELP),
     dry_run: bool = typer.Option(None, "--dry-run", "-n", help=DRY_RUN_HELP),
 ) -> None:
-    raise ValueError("pull not implemented")
+    if dry_run:
+        verbose = True
+    core = GitcloneCore(verbose=verbose)
+    core.pull(verbose=verbose, dry_run=dry_run)
+
+
+@command()  # type: ignore
+def check(
+    verbose: bool = typer.Option(None, "--verbose", "-v", help=VERBOSE_HELP),
+    debug: bool = typer.Option(None, "--debug", "-d", help=DEBUG_HELP),
+    version: bool = typer.Option(None, "--version", help=VERSION_HELP),
+    as_json: bool = typer.Option(
+        None, "--json", help="Print the results as JSON"
+    ),
+) -> None:
+    core = GitcloneCore(verbose=verbose)
+    core.check(verbose=verbose, as_json=bool(as_json))
+
+
+@command()  # type: ignore
+def find(
+    root: str = typer.Argument(
+        ".",
+        metavar="<directory>",
+        help="Directory to search for git repositories",
+    ),
+    verbose: bool = typer.Option(None, "--verbose", "-v", help=VERBOSE_HELP),
+    debug: bool = typer.Option(None, "--debug", "-d", help=DEBUG_HELP),
+    version: bool = typer.Option(None, "--version", help=VERSION_HELP),
+) -> None:
+    core = GitcloneCore(verbose=verbose)
+    core.find(root, verbose=verbose)
+
+
+@command("exec")  # type: ignore
+def exec_command(
+    cmd: list[str] = typer.Argument(
+        None,
+        metavar="-- <command>...",
+        help="Command to run in every repository",
+    ),
+    filters: list[str] = typer.Option(
+        [],
+        "--filter",
+        "-f",
+        help="Only run in repositories matching this regex",
+    ),
+    stream: bool = typer.Option(
+        None,
+        "--stream",
+        "-s",
+        help="Print output lines while the commands are running",
+    ),
+    verbose: bool = typer.Option(None, "--verbose", "-v", help=VERBOSE_HELP),
+    debug: bool = typer.Option(None, "--debug", "-d", help=DEBUG_HELP),
+    version: bool = typer.Option(None, "--version", help=VERSION_HELP),
+) -> None:
+    core = GitcloneCore(verbose=verbose)
+    results = core.exec(
+        list(cmd or []), filters=list(filters), stream=bool(stream)
+    )
+    if any(r.returncode for r in results):
+        sys.exit(1)
+
+
+@command()  # type: ignore
+def search(
+    pattern: str = typer.Argument(
+        ..., metavar="<pattern>", help="Pattern for 'git grep'"
+    ),
+    filters: list[str] = typer.Option(
+        [],
+        "--filter",
+        "-f",
+        help="Only search in repositories matching this regex",
+    ),
+    ignore_case: bool = typer.Option(
+        None, "--ignore-case", "-i", help="Ignore case differences"
+    ),
+    max_per_repo: int = typer.Option(
+        None, "--max-per-repo", help="Maximum matches per repository"
+    ),
+    max_total: int = typer.Option(
+        None, "--max-count", "-m", help="Maximum matches in total"
+    ),
+    verbose: bool = typer.Option(None, "--verbose", "-v", help=VERBOSE_HELP),
+    debug: bool = typer.Option(None, "--debug", "-d", help=DEBUG_HELP),
+    version: bool = typer.Option(None, "--version", help=VERSION_HELP),
+) -> None:
+    core = GitcloneCore(verbose=verbose)
+    core.search(
+        pattern,
+        filters=list(filters),
+        ignore_case=bool(ignore_case),
+        max_per_repo=max_per_repo,
+        max_total=max_total,
+        verbose=verbose,
+    )
+
+
+@command()  # type: ignore
+def bundle(
+    directory: str = typer.Option(
+        None,
+        "--dir",
+        help="Directory for the bundles (default: bundle.dir)",
+    ),
+    verbose: bool = typer.Option(None, "--verbose", "-v", help=VERBOSE_HELP),
+    debug: bool = typer.Option(None, "--debug", "-d", help=DEBUG_HELP),
+    version: bool = typer.Option(None, "--version", help=VERSION_HELP),
+) -> None:
+    core = GitcloneCore(verbose=verbose)
+    core.bundle(directory=directory, verbose=verbose)
 
 
 @command()  # type: ignore
@@ -0,0 +1,78 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class HostState:
+    limit: int
+    cap: int
+    completed: int = 0
+    window_start: float = field(default_factory=time.monotonic)
+    throughput: float | None = None
+
+
+class ConcurrencyController:
+    def __init__(
+        self,
+        max_per_host: int = 5,
+        max_total: int = 5,
+        hosts: dict[str, int] = {},
+        adaptive: bool = False,
+        initial: int = 5,
+        tolerance: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_per_host = max(1, max_per_host)
+        self.max_total = max(1, max_total)
+        self.hosts = {k.lower(): max(1, v) for k, v in hosts.items()}
+        self.adaptive = adaptive
+        self.initial = max(1, initial)
+        self.tolerance = tolerance
+        self.clock = clock
+        self.states: dict[str, HostState] = {}
+
+    def cap(self, host: str) -> int:
+        return self.hosts.get(host, self.max_per_host)
+
+    def _state(self, host: str) -> HostState:
+        state = self.states.get(host)
+        if state is None:
+            cap = self.cap(host)
+            limit = min(self.initial, cap) if self.adaptive else cap
+            state = HostState(limit=limit, cap=cap, window_start=self.clock())
+            self.states[host] = state
+        return state
+
+    def limit(self, host: str) -> int:
+        return self._state(host).limit
+
+    def success(self, host: str) -> None:
+        state = self._state(host)
+        if not self.adaptive:
+            return
+        state.completed += 1
+        if state.completed < state.limit:
+            return
+        now = self.clock()
+        elapsed = max(now - state.window_start, 1e-6)
+        throughput = state.completed / elapsed
+        if state.throughput is None or throughput > state.throughput * (
+            1 + self.tolerance
+        ):
+            state.limit = min(state.limit + 1, state.cap)
+        state.throughput = throughput
+        state.completed = 0
+        state.window_start = now
+
+    def failure(self, host: str) -> None:
+        state = self._state(host)
+        if not self.adaptive:
+            return
+        state.limit = max(1, state.limit // 2)
+        state.throughput = None
+        state.completed = 0
+        state.window_start = self.clock()
+
+
+__all__ = ["HostState", "ConcurrencyController"]
@@ -1,4 +1,5 @@
 import os
+import re
 from typing import Any
 
 from pydantic import BaseModel, ValidationError, root_validator, validator
@@ -8,6 +9,26 @@ from gitclone.exceptions import GitConfigurationException
 from gitclone.utils import print
 
 
+def validate_clone_filter(v: str | None) -> str | None:
+    if v is None:
+        return v
+    if not re.match(r"^(blob:none|blob:limit=\d+[kmg]?|tree:\d+)$", v):
+        raise ValueError(f"Filter '{v}' not supported.")
+    return v
+
+
+def validate_clone_depth(v: int | None) -> int | None:
+    if v is not None and v < 1:
+        raise ValueError("Depth must be at least 1.")
+    return v
+
+
+def validate_submodule_jobs(v: int | None) -> int | None:
+    if v is not None and v < 1:
+        raise ValueError("Submodule jobs must be at least 1.")
+    return v
+
+
 class BaseConfig(YamlModelMixin, BaseModel):
     @root_validator(pre=True)
     def check_model(cls, values: dict[str, Any]) -> dict[str, Any]:
@@ -25,9 +46,25 @@ class GithubAutofetchConfig(BaseConfig):
     method: str = "https"
     token: str | None = None
     private: bool = False
+    api_url: str = "https://api.github.com"
+    api: str = "rest"
+    connections: int = 8
+    cache: str | None = None
+    rate_limit_wait: int = 900
     path: str = "{repo}"
     includes: list[str] = []
     excludes: list[str] = []
+    share_objects: bool = False
+    depth: int | None = None
+    filter: str | None = None
+    single_branch: bool | None = None
+
+    _validate_depth = validator("depth", allow_reuse=True)(
+        validate_clone_depth
+    )
+    _validate_filter = validator("filter", allow_reuse=True)(
+        validate_clone_filter
+    )
 
     @validator("method")
     def validate_method(cls, v: str) -> str:
@@ -36,19 +73,204 @@ class GithubAutofetchConfig(BaseConfig):
             raise ValueError(f"Method '{v}' not supported.")
         return v
 
+    @validator("api")
+    def validate_api(cls, v: str, values: dict[str, Any]) -> str:
+        expected = ["rest", "graphql"]
+        if v not in expected:
+            raise ValueError(f"API '{v}' not supported.")
+        if v == "graphql" and not values.get("token"):
+            raise ValueError("The GraphQL API requires a token.")
+        return v
+
     @validator("path")
     def validate_path(cls, v: str) -> str:
         if not v:
             raise ValueError("Empty path given.")
         return v
 
+    @validator("connections")
+    def validate_connections(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Autofetch connections must be at least 1.")
+        return v
+
+    @validator("rate_limit_wait")
+    def validate_rate_limit_wait(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError("Autofetch rate_limit_wait must not be negative.")
+        return v
+
 
 class AuofetchConfig(BaseConfig):
     github: GithubAutofetchConfig | None = None
 
 
+class ConnectionsConfig(BaseConfig):
+    total: int = 5
+    per_host: int = 5
+    hosts: dict[str, int] = {}
+    adaptive: bool = True
+    initial: int = 5
+
+    @validator("total", "per_host", "initial")
+    def validate_limit(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Connection limits must be at least 1.")
+        return v
+
+    @validator("hosts")
+    def validate_hosts(cls, v: dict[str, int]) -> dict[str, int]:
+        for host, limit in v.items():
+            if limit < 1:
+                raise ValueError(
+                    f"Connection limit for '{host}' must be at least 1."
+                )
+        return {host.lower(): limit for host, limit in v.items()}
+
+
+class PreflightConfig(BaseConfig):
+    enabled: bool = True
+    connections: int = 16
+    cache: str | None = None
+    ttl: int = 3600
+
+    @validator("connections")
+    def validate_connections(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Preflight connections must be at least 1.")
+        return v
+
+
+class CloneConfig(BaseConfig):
+    dissociate: bool = False
+    depth: int | None = None
+    filter: str | None = None
+    single_branch: bool = False
+    submodule_jobs: int = 1
+    shallow_submodules: bool = False
+    backend: str = "subprocess"
+
+    @validator("backend")
+    def validate_backend(cls, v: str) -> str:
+        expected = ["subprocess", "gitpython"]
+        if v not in expected:
+            raise ValueError(f"Backend '{v}' not supported.")
+        return v
+
+    _validate_depth = validator("depth", allow_reuse=True)(
+        validate_clone_depth
+    )
+    _validate_filter = validator("filter", allow_reuse=True)(
+        validate_clone_filter
+    )
+    _validate_submodule_jobs = validator("submodule_jobs", allow_reuse=True)(
+        validate_submodule_jobs
+    )
+
+
+class FindConfig(BaseConfig):
+    ignore: list[str] = ["node_modules", ".venv", "__pycache__"]
+    index: str | None = None
+    workers: int = 8
+
+    @validator("workers")
+    def validate_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Find workers must be at least 1.")
+        return v
+
+
+class CheckConfig(BaseConfig):
+    workers: int = 16
+
+    @validator("workers")
+    def validate_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Check workers must be at least 1.")
+        return v
+
+
+class ExecConfig(BaseConfig):
+    workers: int = 8
+
+    @validator("workers")
+    def validate_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Exec workers must be at least 1.")
+        return v
+
+
+class SearchConfig(BaseConfig):
+    workers: int = 8
+    max_per_repo: int | None = None
+    max_total: int | None = None
+
+    @validator("workers")
+    def validate_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Search workers must be at least 1.")
+        return v
+
+
+class MirrorConfig(BaseConfig):
+    dir: str | None = None
+    max_size: int | None = None
+    shared: bool = False
+
+    @validator("max_size")
+    def validate_max_size(cls, v: int | None) -> int | None:
+        if v is not None and v < 1:
+            raise ValueError("Mirror max_size must be at least 1 MB.")
+        return v
+
+
+class BundleConfig(BaseConfig):
+    dir: str | None = None
+    workers: int = 4
+
+    @validator("workers")
+    def validate_workers(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Bundle workers must be at least 1.")
+        return v
+
+
+class SyncConfig(BaseConfig):
+    state: str | None = None
+
+
+class RetryConfig(BaseConfig):
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    jitter: float = 0.5
+
+    @validator("attempts")
+    def validate_attempts(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Attempts must be at least 1.")
+        return v
+
+    @validator("jitter")
+    def validate_jitter(cls, v: float) -> float:
+        if not 0 <= v <= 1:
+            raise ValueError("Jitter must be between 0 and 1.")
+        return v
+
+
 class Config(BaseConfig):
     dest: str = "."
+    clone: CloneConfig = CloneConfig()
+    connections: ConnectionsConfig = ConnectionsConfig()
+    preflight: PreflightConfig = PreflightConfig()
+    retry: RetryConfig = RetryConfig()
+    sync: SyncConfig = SyncConfig()
+    check: CheckConfig = CheckConfig()
+    find: FindConfig = FindConfig()
+    exec: ExecConfig = ExecConfig()
+    search: SearchConfig = SearchConfig()
+    bundle: BundleConfig = BundleConfig()
+    mirror: MirrorConfig = MirrorConfig()
     autofetch: list[AuofetchConfig] = []
     repositories: list[str] | None = []
 
@@ -167,9 +389,23 @@ class ConfigManager:
 
 
 __all__ = [
+    "validate_clone_filter",
+    "validate_clone_depth",
+    "validate_submodule_jobs",
     "BaseConfig",
     "GithubAutofetchConfig",
     "AuofetchConfig",
+    "CloneConfig",
+    "ConnectionsConfig",
+    "PreflightConfig",
+    "RetryConfig",
+    "SyncConfig",
+    "CheckConfig",
+    "FindConfig",
+    "ExecConfig",
+    "SearchConfig",
+    "BundleConfig",
+    "MirrorConfig",
     "Config",
     "ConfigManager",
 ]
@@ -1,20 +1,66 @@
+import asyncio
+import json
 import os
-import pathlib
 import shutil
+import sys
 from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from multiprocessing.pool import ThreadPool
+from threading import Event, Lock, Thread
+from typing import Callable, Iterator
 
-from github import AuthenticatedUser, Github, NamedUser
+from git import GitCommandError
+from rich.table import Table
 
-from gitclone.config import AuofetchConfig, Config, ConfigManager
-from gitclone.exceptions import CoreException
+from gitclone.asyncengine import AsyncGitActionHandler
+from gitclone.bundles import bundle_path, create_bundle
+from gitclone.check import CHECK_CLEAN, Checker, CheckResult
+from gitclone.concurrency import ConcurrencyController
+from gitclone.config import (
+    AuofetchConfig,
+    Config,
+    ConfigManager,
+    ConnectionsConfig,
+    FindConfig,
+    GithubAutofetchConfig,
+    PreflightConfig,
+    RetryConfig,
+    SyncConfig,
+)
+from gitclone.discovery import DirectoryIndex, Discovery
+from gitclone.exceptions import CoreException, GitOperationException
+from gitclone.execute import ExecResult, Executor
 from gitclone.gitcmds import (
-    GitAction,
     GitActionMultiprocessingHandler,
     GitCloneAction,
+    GitPullAction,
+    PullSummary,
+)
+from gitclone.githubapi import (
+    GithubClient,
+    GithubRepository,
+    RateBudget,
+    ResponseCache,
 )
-from gitclone.repositories import RepoSpecification
+from gitclone.mirrors import MirrorCache
+from gitclone.preflight import Preflight, PreflightCache
+from gitclone.repositories import RepoFilter, RepoSpecification
+from gitclone.retry import RetryPolicy
+from gitclone.search import Search
+from gitclone.syncstate import SyncState
 from gitclone.utils import print
 
+FEED_STOP_TIMEOUT = 5.0
+
+
+@dataclass
+class ClonePlan:
+    seen: set[RepoSpecification] = field(default_factory=set)
+    references: dict[str, str] = field(default_factory=dict)
+    sources: dict[str, GitCloneAction] = field(default_factory=dict)
+    actions: list[GitCloneAction] = field(default_factory=list)
+    existing: int = 0
+
 
 class GitcloneCore:
     def __init__(
@@ -39,6 +85,8 @@ class GitcloneCore:
 
         self.configmanager = ConfigManager(verbose=verbose)
         self.verbose = verbose
+        self.github_budgets: dict[tuple[str, str, str | None], RateBudget] = {}
+        self.github_budgets_lock = Lock()
         if not config:
             if resolve_config:
                 config = self.configmanager.get_config(load_global=load_global)
@@ -52,12 +100,328 @@ class GitcloneCore:
         dest_root: str = ".",
         verbose: bool = False,
         dry_run: bool = False,
+        config: Config | None = None,
+    ) -> None:
+        if not config:
+            config = self.config
+        handler = GitActionMultiprocessingHandler(
+            controller=self.create_controller(config.connections),
+            retry=self.create_retry_policy(config.retry),
+        )
+        actions = self.do_plan_clone(
+            handler, repos, dest_root, verbose, config
+        )
+        if actions is not None:
+            try:
+                handler.run(verbose=verbose, dry_run=dry_run)
+            finally:
+                if not dry_run:
+                    self.do_evict_mirrors(config, verbose)
+            if dry_run:
+                self.do_print_savings(actions)
+
+    def do_start_feed(
+        self,
+        handler: GitActionMultiprocessingHandler,
+        feed: Callable[[], None],
+    ) -> Thread:
+        feeder = Thread(target=feed, daemon=True)
+        handler.open_feed()
+        try:
+            feeder.start()
+        except BaseException:
+            handler.close_feed()
+            raise
+        return feeder
+
+    def do_stop_feed(
+        self,
+        feeder: Thread,
+        stop: Event,
+        errors: list[BaseException],
+        failed: bool,
+    ) -> None:
+        stop.set()
+        feeder.join(FEED_STOP_TIMEOUT)
+        if failed:
+            for error in errors:
+                print(f"[red]Error:[/] Autofetch failed: {error}")
+
+    def do_clone_stream(
+        self,
+        repos: list[RepoSpecification],
+        autofetch: list[AuofetchConfig],
+        dest_root: str = ".",
+        verbose: bool = False,
+        dry_run: bool = False,
+        config: Config | None = None,
+    ) -> bool:
+        if not config:
+            config = self.config
+        handler = GitActionMultiprocessingHandler(
+            controller=self.create_controller(config.connections),
+            retry=self.create_retry_policy(config.retry),
+        )
+        plan = ClonePlan()
+        lock = Lock()
+        stop = Event()
+        errors: list[BaseException] = []
+
+        def plan_batch(batch: list[RepoSpecification]) -> None:
+            with lock:
+                self.do_plan_batch(
+                    handler, batch, dest_root, verbose, config, plan
+                )
+
+        def stream(github: GithubAutofetchConfig) -> None:
+            for batch in self.do_github_pages(github):
+                if stop.is_set():
+                    return
+                plan_batch(batch)
+
+        def feed() -> None:
+            try:
+                githubs = [a.github for a in autofetch if a.github]
+                if githubs:
+                    with ThreadPool(len(githubs)) as pool:
+                        pool.map(stream, githubs)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                handler.close_feed()
+
+        plan_batch(repos)
+        feeder = self.do_start_feed(handler, feed)
+        failed = True
+        try:
+            handler.run(verbose=verbose, dry_run=dry_run)
+            failed = False
+        finally:
+            self.do_stop_feed(feeder, stop, errors, failed)
+            if not dry_run:
+                self.do_evict_mirrors(config, verbose)
+        if errors:
+            raise errors[0]
+        self.do_print_plan(plan)
+        if dry_run:
+            self.do_print_savings(plan.actions)
+        return bool(plan.actions or plan.existing)
+
+    async def do_clone_async(
+        self,
+        repos: list[RepoSpecification],
+        dest_root: str = ".",
+        verbose: bool = False,
+        dry_run: bool = False,
+        config: Config | None = None,
+    ) -> None:
+        if not config:
+            config = self.config
+        handler = AsyncGitActionHandler(
+            controller=self.create_controller(config.connections),
+            retry=self.create_retry_policy(config.retry),
+        )
+        actions = await asyncio.to_thread(
+            self.do_plan_clone, handler, repos, dest_root, verbose, config
+        )
+        if actions is not None:
+            try:
+                await handler.run(verbose=verbose, dry_run=dry_run)
+            finally:
+                if not dry_run:
+                    await asyncio.to_thread(
+                        self.do_evict_mirrors, config, verbose
+                    )
+            if dry_run:
+                self.do_print_savings(actions)
+
+    def do_evict_mirrors(self, config: Config, verbose: bool) -> None:
+        if not config.mirror.dir or not config.mirror.max_size:
+            return
+        if config.mirror.shared:
+            if verbose:
+                print(
+                    "[yellow]Info:[/] Not evicting mirrors, shared clones"
+                    " still use their objects"
+                )
+            return
+        evicted = MirrorCache(config.mirror.dir).evict(
+            config.mirror.max_size * 1024 * 1024
+        )
+        if verbose and evicted:
+            print(
+                f"[yellow]Info:[/] Evicted {len(evicted)} least recently"
+                " used mirrors from the cache"
+            )
+
+    def do_pull(
+        self,
+        repos: list[RepoSpecification],
+        dest_root: str = ".",
+        verbose: bool = False,
+        dry_run: bool = False,
+        config: Config | None = None,
+    ) -> PullSummary:
+        if not config:
+            config = self.config
+        handler = GitActionMultiprocessingHandler(
+            controller=self.create_controller(config.connections),
+            retry=self.create_retry_policy(config.retry),
+        )
+        summary = PullSummary()
+        state = self.create_sync_state(config.sync)
+        actions = self.do_clone_actions(repos, dest_root, config)
+        missing = 0
+        for action in actions:
+            if os.path.exists(action.dest):
+                handler.add_action(
+                    GitPullAction(
+                        base_url=action.base_url,
+                        full_url=action.full_url,
+                        dest=action.dest,
+                        pushed_at=action.pushed_at,
+                        summary=summary,
+                        state=state,
+                    )
+                )
+            else:
+                missing += 1
+        if missing:
+            print(
+                f"[yellow]Info:[/] {missing} of {len(actions)}"
+                " repositories are not cloned yet."
+            )
+        try:
+            handler.run(verbose=verbose, dry_run=dry_run)
+        finally:
+            if state:
+                state.save()
+            print(f"[green]Pull:[/] {summary}")
+            if verbose and summary.skipped_fetches:
+                print(
+                    f"[green]Sync:[/] Skipped fetching"
+                    f" {summary.skipped_fetches} unchanged remotes"
+                )
+        return summary
+
+    def do_check(
+        self,
+        repos: list[RepoSpecification],
+        dest_root: str = ".",
+        config: Config | None = None,
+    ) -> list[CheckResult]:
+        if not config:
+            config = self.config
+        actions = self.do_clone_actions(repos, dest_root, config)
+        checker = Checker(
+            state=self.create_sync_state(config.sync),
+            max_workers=config.check.workers,
+            url_for={a.dest: a.full_url for a in actions},
+        )
+        return checker.run([a.dest for a in actions])
+
+    def do_print_check(
+        self, results: list[CheckResult], verbose: bool = False
     ) -> None:
-        repos = list(OrderedDict.fromkeys(repos))
+        table = Table(box=None, pad_edge=False)
+        for column in ["Repository", "Status", "Branch", "Ahead", "Behind"]:
+            table.add_column(column)
+        for result in results:
+            if result.status == CHECK_CLEAN and not verbose:
+                continue
+            color = "green" if result.status == CHECK_CLEAN else "yellow"
+            table.add_row(
+                result.dest,
+                f"[{color}]{result.status}[/]",
+                result.branch or "-",
+                str(result.ahead),
+                str(result.behind),
+            )
+        if table.row_count:
+            print(table)
+        counts: dict[str, int] = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        print(
+            "[green]Check:[/] "
+            + ", ".join(f"{n} {status}" for status, n in counts.items())
+        )
+
+    def do_plan_clone(
+        self,
+        handler: GitActionMultiprocessingHandler | AsyncGitActionHandler,
+        repos: list[RepoSpecification],
+        dest_root: str,
+        verbose: bool,
+        config: Config,
+    ) -> list[GitCloneAction] | None:
+        plan = ClonePlan()
+        self.do_plan_batch(handler, repos, dest_root, verbose, config, plan)
+        self.do_print_plan(plan)
+        if not plan.actions and not handler.errors:
+            return None
+        return plan.actions
+
+    def do_plan_batch(
+        self,
+        handler: GitActionMultiprocessingHandler | AsyncGitActionHandler,
+        repos: list[RepoSpecification],
+        dest_root: str,
+        verbose: bool,
+        config: Config,
+        plan: ClonePlan,
+    ) -> None:
+        repos = [r for r in OrderedDict.fromkeys(repos) if r not in plan.seen]
+        plan.seen.update(repos)
+        repos_existing: list[GitCloneAction] = []
+        repos_to_clone: list[GitCloneAction] = []
+        for action in self.do_clone_actions(repos, dest_root, config):
+            if not os.path.exists(action.dest):
+                repos_to_clone.append(action)
+            else:
+                repos_existing.append(action)
+        plan.existing += len(repos_existing)
+        if repos_to_clone and config.preflight.enabled:
+            repos_to_clone = self.do_preflight(
+                handler, repos_to_clone, config.preflight, verbose
+            )
+        self.do_add_clone_actions(
+            handler, repos_to_clone, repos_existing, plan
+        )
+        plan.actions += repos_to_clone
+
+    def do_print_plan(self, plan: ClonePlan) -> None:
+        if plan.existing and plan.actions:
+            print(
+                f"[yellow]Info:[/] {plan.existing} of"
+                f" {plan.existing + len(plan.actions)}"
+                " repositories already exist."
+            )
+        if plan.existing and not plan.actions:
+            print("[yellow]Info:[/] All repositoried already exist")
+
+    def do_print_savings(self, actions: list[GitCloneAction]) -> None:
+        sized = [a for a in actions if a.size]
+        total = sum(a.size or 0 for a in sized)
+        if not total:
+            return
+        estimated = sum(
+            (a.size or 0) * (1 - a.estimated_savings) for a in sized
+        )
+        print(
+            f"[green]Estimated download:[/] ~{estimated / 1024:.1f} MB"
+            f" of {total / 1024:.1f} MB"
+            f" for {len(sized)} repositories with known size"
+        )
 
-        repos_existing: list[GitAction] = []
-        repos_to_clone: list[GitAction] = []
-        for r in repos:
+    def do_clone_actions(
+        self,
+        repos: list[RepoSpecification],
+        dest_root: str,
+        config: Config,
+    ) -> list[GitCloneAction]:
+        actions: list[GitCloneAction] = []
+        for r in OrderedDict.fromkeys(repos):
             baseurl, delimiter, path, full_url, branch, dest = r.extract()
 
             dest = os.path.expanduser(dest)
@@ -65,90 +429,282 @@ class GitcloneCore:
             if not os.path.isabs(dest):
                 dest = os.path.join(dest_root, dest)
 
-            dest_path = pathlib.Path(dest)
+            bundle: str | None = None
+            if config.bundle.dir:
+                bundle = bundle_path(config.bundle.dir, full_url)
+                if not os.path.exists(bundle):
+                    bundle = None
 
-            action = GitCloneAction(
-                base_url=baseurl,
-                remote_src=path,
-                delimiter=delimiter,
-                full_url=full_url,
-                dest=dest,
-                branch=branch or None,
+            actions.append(
+                GitCloneAction(
+                    base_url=baseurl,
+                    remote_src=path,
+                    delimiter=delimiter,
+                    full_url=full_url,
+                    dest=dest,
+                    branch=branch or None,
+                    group=r.group,
+                    dissociate=config.clone.dissociate,
+                    depth=(
+                        r.depth if r.depth is not None else config.clone.depth
+                    ),
+                    filter=(
+                        r.filter
+                        if r.filter is not None
+                        else config.clone.filter
+                    ),
+                    single_branch=(
+                        r.single_branch
+                        if r.single_branch is not None
+                        else config.clone.single_branch
+                    ),
+                    submodule_jobs=(
+                        r.submodule_jobs
+                        if r.submodule_jobs is not None
+                        else config.clone.submodule_jobs
+                    ),
+                    shallow_submodules=(
+                        r.shallow_submodules
+                        if r.shallow_submodules is not None
+                        else config.clone.shallow_submodules
+                    ),
+                    size=r.size,
+                    pushed_at=r.pushed_at,
+                    bundle=bundle,
+                    mirror=config.mirror.dir,
+                    shared_mirror=config.mirror.shared,
+                    backend=config.clone.backend,
+                )
             )
-            if not dest_path.exists():
-                repos_to_clone.append(action)
+        return actions
+
+    def do_preflight(
+        self,
+        handler: GitActionMultiprocessingHandler | AsyncGitActionHandler,
+        actions: list[GitCloneAction],
+        config: PreflightConfig,
+        verbose: bool = False,
+    ) -> list[GitCloneAction]:
+        preflight = self.create_preflight(config)
+        failures = preflight.run(actions)
+        if verbose:
+            print(
+                f"[green]Preflight:[/] Checked {preflight.checked}"
+                f" of {len(actions)} repositories"
+            )
+        failed = set()
+        for action, exc in failures:
+            handler.add_error(action, exc)
+            failed.add(action)
+        return [a for a in actions if a not in failed]
+
+    def do_add_clone_actions(
+        self,
+        handler: GitActionMultiprocessingHandler | AsyncGitActionHandler,
+        actions: list[GitCloneAction],
+        existing: list[GitCloneAction],
+        plan: ClonePlan | None = None,
+    ) -> None:
+        plan = plan or ClonePlan()
+        references = plan.references
+        for action in existing:
+            if action.group:
+                references.setdefault(action.group, action.dest)
+
+        sources = plan.sources
+        for action in actions:
+            group = action.group
+            if not group:
+                handler.add_action(action)
+            elif group in references:
+                handler.add_action(
+                    replace(action, reference=references[group])
+                )
+            elif group in sources:
+                source = sources[group]
+                handler.add_action(
+                    replace(action, reference=source.dest), after=source
+                )
             else:
-                repos_existing.append(action)
-        if repos_existing and repos_to_clone:
+                sources[group] = action
+                handler.add_action(action)
+
+    def create_controller(
+        self, connections: ConnectionsConfig
+    ) -> ConcurrencyController:
+        return ConcurrencyController(
+            max_per_host=connections.per_host,
+            max_total=connections.total,
+            hosts=connections.hosts,
+            adaptive=connections.adaptive,
+            initial=connections.initial,
+        )
+
+    def create_retry_policy(self, retry: RetryConfig) -> RetryPolicy:
+        return RetryPolicy(
+            attempts=retry.attempts,
+            backoff=retry.backoff,
+            max_backoff=retry.max_backoff,
+            jitter=retry.jitter,
+        )
+
+    def create_sync_state(self, sync: SyncConfig) -> SyncState | None:
+        return SyncState(sync.state) if sync.state else None
+
+    def create_discovery(self, find: FindConfig) -> Discovery:
+        return Discovery(
+            ignore=find.ignore,
+            index=DirectoryIndex(path=find.index, ignore=find.ignore),
+            max_workers=find.workers,
+        )
+
+    def create_preflight(self, preflight: PreflightConfig) -> Preflight:
+        return Preflight(
+            cache=PreflightCache(path=preflight.cache, ttl=preflight.ttl),
+            max_connections=preflight.connections,
+        )
+
+    def create_github_client(
+        self, github: GithubAutofetchConfig
+    ) -> GithubClient:
+        cache = ResponseCache(github.cache) if github.cache else None
+        with self.github_budgets_lock:
+            budget = self.github_budgets.setdefault(
+                (github.api, github.api_url, github.token),
+                RateBudget(max_wait=github.rate_limit_wait),
+            )
+        return GithubClient(
+            token=github.token,
+            api_url=github.api_url,
+            cache=cache,
+            budget=budget,
+        )
+
+    def do_github_repository(
+        self, github: GithubAutofetchConfig, login: str, repo: GithubRepository
+    ) -> RepoSpecification:
+        path = github.path
+        path = path.replace("{user}", login)
+        path = path.replace("{repo}", repo.name)
+        group: str | None = None
+        if github.share_objects:
+            group = (
+                repo.parent if repo.fork and repo.parent else repo.full_name
+            )
+        if github.method == "ssh":
+            url = f"git@github.com:{repo.full_name}.git"
+        elif github.method == "https":
+            url = f"https://github.com/{repo.full_name}.git"
+        else:
+            raise CoreException(
+                f"Unknown autofetch github.method: {github.method}"
+            )
+        return RepoSpecification(
+            url=url,
+            dest=path,
+            group=group,
+            depth=github.depth,
+            filter=github.filter,
+            single_branch=github.single_branch,
+            size=repo.size,
+            pushed_at=repo.pushed_at,
+        )
+
+    def do_github_forks(
+        self,
+        client: GithubClient,
+        github: GithubAutofetchConfig,
+        repos: list[GithubRepository],
+    ) -> list[GithubRepository]:
+        forks = [r for r in repos if r.fork and not r.parent]
+        if not github.share_objects or github.api == "graphql" or not forks:
+            return repos
+        with ThreadPool(min(github.connections, len(forks))) as pool:
+            details = dict(
+                zip(
+                    forks,
+                    pool.map(client.repository, [r.full_name for r in forks]),
+                )
+            )
+        return [details.get(r, r) for r in repos]
+
+    def do_github_listing(
+        self, client: GithubClient, github: GithubAutofetchConfig
+    ) -> Iterator[tuple[str, list[GithubRepository]]]:
+        if github.api == "graphql":
+            yield from client.graphql_repositories(github.private)
+            return
+        login = github.user
+        if github.token and "{user}" in github.path:
+            login = client.login()
+        if github.token:
+            pages = client.repositories(
+                "/user/repos",
+                {"visibility": "all" if github.private else "public"},
+                github.connections,
+            )
+        else:
+            pages = client.repositories(
+                f"/users/{github.user}/repos", {}, github.connections
+            )
+        for page in pages:
+            yield login, page
+
+    def do_github_pages(
+        self, github: GithubAutofetchConfig
+    ) -> Iterator[list[RepoSpecification]]:
+        client = self.create_github_client(github)
+        repo_filter = RepoFilter(github.includes, github.excludes)
+        for login, page in self.do_github_listing(client, github):
+            page = [
+                repo
+                for repo in page
+                if repo_filter.matches(
+                    self.do_github_repository(github, login, repo)
+                )
+            ]
+            page = self.do_github_forks(client, github, page)
+            yield [
+                self.do_github_repository(github, login, repo) for repo in page
+            ]
+        if self.verbose and client.cache:
             print(
-                f"[yellow]Info:[/] {len(repos_existing)} of"
-                f" {len(repos_existing) + len(repos_to_clone)}"
-                " repositories already exist."
+                f"[green]Autofetch:[/] {client.not_modified} of"
+                f" {client.not_modified + client.modified} GitHub responses"
+                f" for {github.user} unchanged"
             )
-        if repos_existing and not repos_to_clone:
-            print("[yellow]Info:[/] All repositoried already exist")
-        if repos_to_clone:
-            GitActionMultiprocessingHandler(repos_to_clone).run(
-                verbose=verbose, dry_run=dry_run
+        if self.verbose:
+            print(
+                f"[green]Autofetch:[/] GitHub API budget for {github.user}:"
+                f" {client.budget}"
             )
 
+    def do_resolve_github(
+        self, github: GithubAutofetchConfig
+    ) -> list[RepoSpecification]:
+        return [r for page in self.do_github_pages(github) for r in page]
+
     def do_resolve_autofetch(
         self, *config: AuofetchConfig
     ) -> list[RepoSpecification]:
-        repos: list[RepoSpecification] = []
-        for autofetch in config:
-            if autofetch.github:
-                github = autofetch.github
-
-                user: (
-                    NamedUser.NamedUser | AuthenticatedUser.AuthenticatedUser
-                ) | None = None
-                if github.token:
-                    g = Github(github.token)
-                    user = g.get_user()
-                    remote_repos = user.get_repos(
-                        visibility="all" if github.private else "public"
-                    )
-                else:
-                    g = Github()
-                    user = g.get_user(github.user)
-                    remote_repos = user.get_repos()
-                for repo in remote_repos:
-                    path = github.path
-                    path = path.replace("{user}", user.login)
-                    path = path.replace("{repo}", repo.name)
-                    if github.method == "ssh":
-                        repos.append(
-                            RepoSpecification(
-                                url=f"git@github.com:{repo.full_name}.git",
-                                dest=path,
-                            )
-                        )
-                    elif github.method == "https":
-                        repos.append(
-                            RepoSpecification(
-                                url=f"https://github.com/{repo.full_name}.git",
-                                dest=path,
-                            )
-                        )
-                    else:
-                        raise CoreException(
-                            f"Unknown autofetch github.method: {github.method}"
-                        )
-                results: list[RepoSpecification] = []
-                if github.includes:
-                    results.clear()
-                    for include in github.includes:
-                        innerresults = [r for r in repos if r.matches(include)]
-                        results += innerresults
-                    repos = results
-                if github.excludes:
-                    results.clear()
-                    for exclude in github.excludes:
-                        for r in repos:
-                            if not r.matches(exclude):
-                                results.append(r)
-                    repos = results
+        githubs = [a.github for a in config if a.github]
+        if not githubs:
+            return []
+        with ThreadPool(len(githubs)) as pool:
+            resolved = pool.map(self.do_resolve_github, githubs)
+        return [repo for repos in resolved for repo in repos]
+
+    def do_resolve_repositories(
+        self, repos: list[RepoSpecification], config: Config
+    ) -> list[RepoSpecification]:
+        if repos:
+            return repos
+        repos = self.do_resolve_autofetch(*config.autofetch)
+        if config.repositories:
+            repos += [
+                RepoSpecification.parse(repostr)
+                for repostr in config.repositories
+            ]
         return repos
 
     def clone(
@@ -164,16 +720,268 @@ class GitcloneCore:
             verbose = self.verbose
         if dry_run:
             verbose = True
-        repos_to_clone = list(repos)
-        if not repos_to_clone:
-            repos_to_clone = self.do_resolve_autofetch(*config.autofetch)
-            if config.repositories:
-                repos_to_clone += [
+        if not repos and config.autofetch:
+            found = self.do_clone_stream(
+                [
                     RepoSpecification.parse(repostr)
-                    for repostr in config.repositories
-                ]
+                    for repostr in config.repositories or []
+                ],
+                config.autofetch,
+                config.dest,
+                verbose,
+                dry_run,
+                config,
+            )
+        else:
+            repos_to_clone = self.do_resolve_repositories(list(repos), config)
+            found = bool(repos_to_clone)
+            if found:
+                self.do_clone(
+                    repos_to_clone, config.dest, verbose, dry_run, config
+                )
+        if found:
+            if verbose:
+                print("[green]DONE[/]")
+        else:
+            print(
+                "[yellow]No repositories were specified,"
+                " nothing to do... exiting[/]"
+            )
+
+    def pull(
+        self,
+        *repos: RepoSpecification,
+        verbose: bool | None = None,
+        dry_run: bool = False,
+        config: Config | None = None,
+    ) -> None:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        if dry_run:
+            verbose = True
+        repos_to_pull = self.do_resolve_repositories(list(repos), config)
+        if repos_to_pull:
+            self.do_pull(repos_to_pull, config.dest, verbose, dry_run, config)
+            if verbose:
+                print("[green]DONE[/]")
+        else:
+            print(
+                "[yellow]No repositories were specified,"
+                " nothing to do... exiting[/]"
+            )
+
+    def check(
+        self,
+        *repos: RepoSpecification,
+        verbose: bool | None = None,
+        as_json: bool = False,
+        config: Config | None = None,
+    ) -> list[CheckResult]:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        repos_to_check = self.do_resolve_repositories(list(repos), config)
+        if not repos_to_check:
+            print(
+                "[yellow]No repositories were specified,"
+                " nothing to do... exiting[/]"
+            )
+            return []
+        results = self.do_check(repos_to_check, config.dest, config)
+        if as_json:
+            sys.stdout.write(
+                json.dumps([r.to_dict() for r in results], indent=2) + "\n"
+            )
+        else:
+            self.do_print_check(results, verbose)
+        return results
+
+    def find(
+        self,
+        root: str = ".",
+        verbose: bool | None = None,
+        config: Config | None = None,
+    ) -> list[RepoSpecification]:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        discovery = self.create_discovery(config.find)
+        repos = discovery.repositories(root, config.dest)
+        if verbose:
+            print(
+                f"[green]Find:[/] Found {len(repos)} repositories"
+                f" ({discovery.scanned} directories scanned)"
+            )
+        sys.stdout.write(
+            "repositories:\n" + "".join(f"  - {r}\n" for r in repos)
+        )
+        return repos
+
+    def do_filter_repositories(
+        self, repos: list[RepoSpecification], filters: list[str]
+    ) -> list[RepoSpecification]:
+        if not filters:
+            return repos
+        return RepoFilter(filters).filter(repos)
+
+    def do_print_exec(self, results: list[ExecResult]) -> None:
+        missing = [r for r in results if r.returncode is None]
+        failed = [r for r in results if r.returncode]
+        succeeded = len(results) - len(missing) - len(failed)
+        for result in failed:
+            print(
+                f"[red]Failed:[/] [blue]'{result.dest}'[/]"
+                f" [red](exit {result.returncode})[/]"
+            )
+        print(
+            f"[green]Exec:[/] {succeeded} succeeded, {len(failed)} failed"
+            + (f", {len(missing)} not cloned" if missing else "")
+        )
+
+    def exec(
+        self,
+        command: list[str],
+        *repos: RepoSpecification,
+        filters: list[str] = [],
+        stream: bool = False,
+        config: Config | None = None,
+    ) -> list[ExecResult]:
+        if not config:
+            config = self.config
+        if not command:
+            raise CoreException("No command was specified.")
+        repos_to_run = self.do_filter_repositories(
+            self.do_resolve_repositories(list(repos), config), filters
+        )
+        if not repos_to_run:
+            print(
+                "[yellow]No repositories were specified,"
+                " nothing to do... exiting[/]"
+            )
+            return []
+        actions = self.do_clone_actions(repos_to_run, config.dest, config)
+        executor = Executor(
+            command, max_workers=config.exec.workers, stream=stream
+        )
+        results = executor.run([a.dest for a in actions])
+        self.do_print_exec(results)
+        return results
+
+    def search(
+        self,
+        pattern: str,
+        *repos: RepoSpecification,
+        filters: list[str] = [],
+        ignore_case: bool = False,
+        max_per_repo: int | None = None,
+        max_total: int | None = None,
+        verbose: bool | None = None,
+        config: Config | None = None,
+    ) -> int:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        repos_to_search = self.do_filter_repositories(
+            self.do_resolve_repositories(list(repos), config), filters
+        )
+        actions = self.do_clone_actions(repos_to_search, config.dest, config)
+        search = Search(
+            pattern,
+            max_workers=config.search.workers,
+            max_per_repo=max_per_repo or config.search.max_per_repo,
+            max_total=max_total or config.search.max_total,
+            ignore_case=ignore_case,
+        )
+        found = 0
+        for match in search.run([a.dest for a in actions]):
+            sys.stdout.write(f"{match}\n")
+            found += 1
+        for error in search.errors:
+            print(f"[red]Error:[/] {error}")
+        if verbose or search.limited:
+            print(
+                f"[green]Search:[/] {found} matches"
+                f" in {len(actions)} repositories"
+                + (" [yellow](limit reached)[/]" if search.limited else "")
+            )
+        return found
+
+    def bundle(
+        self,
+        *repos: RepoSpecification,
+        directory: str | None = None,
+        verbose: bool | None = None,
+        config: Config | None = None,
+    ) -> list[str]:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        directory = directory or config.bundle.dir
+        if not directory:
+            raise CoreException(
+                "No bundle directory was specified"
+                " (set bundle.dir in the configuration)."
+            )
+        repos_to_bundle = self.do_resolve_repositories(list(repos), config)
+        unique: dict[str, GitCloneAction] = {}
+        for action in self.do_clone_actions(
+            repos_to_bundle, config.dest, config
+        ):
+            if os.path.exists(action.dest):
+                unique.setdefault(action.full_url, action)
+        actions = list(unique.values())
+
+        def export(action: GitCloneAction) -> str | None:
+            try:
+                create_bundle(
+                    action.dest, bundle_path(directory, action.full_url)
+                )
+            except GitCommandError as e:
+                return f"{action.dest}: {str(e.stderr).strip()}"
+            if verbose:
+                print(f"[green]Bundle[/] [blue]'{action.dest}'[/]")
+            return None
+
+        errors: list[str] = []
+        if actions:
+            with ThreadPool(min(config.bundle.workers, len(actions))) as pool:
+                errors = [e for e in pool.map(export, actions) if e]
+        print(
+            f"[green]Bundle:[/] Created {len(actions) - len(errors)}"
+            f" bundles in {directory}"
+        )
+        if errors:
+            raise GitOperationException(
+                "Failed to create bundles:\n" + "\n".join(errors)
+            )
+        return [bundle_path(directory, a.full_url) for a in actions]
+
+    async def aclone(
+        self,
+        *repos: RepoSpecification,
+        verbose: bool | None = None,
+        dry_run: bool = False,
+        config: Config | None = None,
+    ) -> None:
+        if not config:
+            config = self.config
+        if verbose is None:
+            verbose = self.verbose
+        if dry_run:
+            verbose = True
+        repos_to_clone = await asyncio.to_thread(
+            self.do_resolve_repositories, list(repos), config
+        )
         if repos_to_clone:
-            self.do_clone(repos_to_clone, config.dest, verbose, dry_run)
+            await self.do_clone_async(
+                repos_to_clone, config.dest, verbose, dry_run, config
+            )
             if verbose:
                 print("[green]DONE[/]")
         else:
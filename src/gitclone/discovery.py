@@ -0,0 +1,148 @@
+import fnmatch
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from multiprocessing.pool import ThreadPool
+
+from gitclone.check import find_gitdir, read_remote_url
+from gitclone.repositories import RepoSpecification
+
+
+@dataclass
+class DirectoryEntry:
+    mtime: int
+    repo: bool = False
+    dirs: list[str] = field(default_factory=list)
+
+
+class DirectoryIndex:
+    def __init__(self, path: str | None = None, ignore: list[str] = []):
+        self.path = os.path.expanduser(path) if path else None
+        self.ignore = list(ignore)
+        self.entries: dict[str, DirectoryEntry] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("ignore") != self.ignore:
+                return
+            self.entries = {
+                path: DirectoryEntry(**entry)
+                for path, entry in data["dirs"].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError):
+            self.entries = {}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        data = {
+            "ignore": self.ignore,
+            "dirs": {
+                path: asdict(entry) for path, entry in self.entries.items()
+            },
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class Discovery:
+    def __init__(
+        self,
+        ignore: list[str] = [],
+        index: DirectoryIndex | None = None,
+        max_workers: int = 8,
+    ) -> None:
+        self.ignore_re = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in ignore)
+            or "(?!)"
+        )
+        self.index = index or DirectoryIndex(ignore=ignore)
+        self.max_workers = max(1, max_workers)
+        self.scanned = 0
+
+    def _ignored(self, name: str, path: str) -> bool:
+        return bool(self.ignore_re.match(name) or self.ignore_re.match(path))
+
+    def _scan(self, path: str) -> DirectoryEntry:
+        entry = DirectoryEntry(mtime=0)
+        with os.scandir(path) as it:
+            for child in it:
+                if child.name == ".git":
+                    entry.repo = True
+                elif child.is_dir(follow_symlinks=False):
+                    entry.dirs.append(child.name)
+        if entry.repo:
+            entry.dirs = []
+        return entry
+
+    def _visit(self, path: str) -> tuple[str, DirectoryEntry | None]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            known = self.index.entries.get(path)
+            if known and known.mtime == mtime:
+                return path, known
+            entry = self._scan(path)
+        except OSError:
+            return path, None
+        entry.mtime = mtime
+        return path, entry
+
+    def run(self, root: str) -> list[str]:
+        root = os.path.abspath(os.path.expanduser(root))
+        entries: dict[str, DirectoryEntry] = {}
+        repos: list[str] = []
+        pending = [root]
+        with ThreadPool(self.max_workers) as pool:
+            while pending:
+                children: list[str] = []
+                for path, entry in pool.imap_unordered(self._visit, pending):
+                    if entry is None:
+                        continue
+                    if entry is not self.index.entries.get(path):
+                        self.scanned += 1
+                    entries[path] = entry
+                    if entry.repo:
+                        repos.append(path)
+                    for name in entry.dirs:
+                        child = os.path.join(path, name)
+                        if not self._ignored(
+                            name, os.path.relpath(child, root)
+                        ):
+                            children.append(child)
+                pending = children
+        self.index.entries = {
+            path: entry
+            for path, entry in self.index.entries.items()
+            if path != root and not path.startswith(root + os.sep)
+        }
+        self.index.entries.update(entries)
+        self.index.save()
+        return sorted(repos)
+
+    def repositories(
+        self, root: str, dest_root: str = "."
+    ) -> list[RepoSpecification]:
+        dest_root = os.path.abspath(os.path.expanduser(dest_root))
+        specs: list[RepoSpecification] = []
+        for path in self.run(root):
+            gitdir = find_gitdir(path)
+            url = read_remote_url(gitdir) if gitdir else None
+            if url:
+                specs.append(
+                    RepoSpecification(
+                        url=url, dest=os.path.relpath(path, dest_root)
+                    )
+                )
+        return specs
+
+
+__all__ = ["DirectoryEntry", "DirectoryIndex", "Discovery"]
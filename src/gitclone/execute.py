@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+from typing import TextIO
+
+
+@dataclass
+class ExecResult:
+    dest: str
+    returncode: int | None
+    output: str = ""
+
+
+class Executor:
+    def __init__(
+        self,
+        command: list[str],
+        max_workers: int = 8,
+        stream: bool = False,
+        out: TextIO | None = None,
+    ) -> None:
+        self.command = command
+        self.max_workers = max(1, max_workers)
+        self.stream = stream
+        self.out = out or sys.stdout
+        self.lock = Lock()
+
+    def _write(self, text: str) -> None:
+        with self.lock:
+            self.out.write(text)
+            self.out.flush()
+
+    def execute(self, dest: str) -> ExecResult:
+        if not os.path.isdir(dest):
+            return ExecResult(dest=dest, returncode=None)
+        try:
+            process = subprocess.Popen(
+                self.command,
+                cwd=dest,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+            )
+        except OSError as e:
+            result = ExecResult(dest=dest, returncode=127, output=f"{e}\n")
+            if self.stream:
+                self._write(f"{dest}: {result.output}")
+            self._finish(result)
+            return result
+        assert process.stdout is not None
+        lines: list[str] = []
+        for line in process.stdout:
+            if self.stream:
+                self._write(f"{dest}: {line}")
+            else:
+                lines.append(line)
+        process.stdout.close()
+        result = ExecResult(
+            dest=dest, returncode=process.wait(), output="".join(lines)
+        )
+        self._finish(result)
+        return result
+
+    def _finish(self, result: ExecResult) -> None:
+        if self.stream:
+            return
+        output = result.output
+        if output and not output.endswith("\n"):
+            output += "\n"
+        self._write(f"==> {result.dest} (exit {result.returncode})\n{output}")
+
+    def run(self, dests: list[str]) -> list[ExecResult]:
+        if not dests:
+            return []
+        with ThreadPool(min(self.max_workers, len(dests))) as pool:
+            return pool.map(self.execute, dests)
+
+
+__all__ = ["ExecResult", "Executor"]
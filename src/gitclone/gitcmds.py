@@ -1,130 +1,37 @@
-import subprocess
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import shutil
 import time
-from dataclasses import dataclass
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
-from threading import RLock
-from typing import Protocol
-
-from git import RemoteProgress
-from git.repo import Repo
-from rich import progress
-from rich.console import Console
-
+from threading import Condition, Lock, RLock
+from typing import Iterator, Protocol, Sequence
+
+from git import GitCommandError
+
+from gitclone.backends import (
+    clone_command,
+    get_backend,
+    git_output,
+    ls_remote,
+    run_git,
+    run_git_async,
+)
+from gitclone.bundles import seed_from_bundle
+from gitclone.concurrency import ConcurrencyController
 from gitclone.exceptions import GitOperationException
-
-
-class GitRemoteProgress(RemoteProgress):
-    OP_CODES = [
-        "BEGIN",
-        "CHECKING_OUT",
-        "COMPRESSING",
-        "COUNTING",
-        "END",
-        "FINDING_SOURCES",
-        "RECEIVING",
-        "RESOLVING",
-        "WRITING",
-    ]
-    OP_CODE_MAP = {
-        getattr(RemoteProgress, _op_code): _op_code for _op_code in OP_CODES
-    }
-
-    @classmethod
-    def opcode_to_str(cls, op_code: int) -> str:
-        op_code_masked = op_code & cls.OP_MASK
-        return cls.OP_CODE_MAP.get(op_code_masked, "?").title()
-
-    def __init__(
-        self,
-        progressbar: "GitRichProgress",
-        task: progress.TaskID | None,
-        text: str,
-    ):
-        super().__init__()
-        self.progressbar = progressbar
-        self.task = task
-        self.text = text
-
-    def update(
-        self,
-        op_code: int,
-        cur_count: str | float,
-        max_count: float | str | None = None,
-        message: str | None = "",
-    ) -> None:
-        with self.progressbar.lock:
-            if max_count is None:
-                max_count = 100
-            cur_count = int(float(cur_count) / float(max_count) * 100)
-            max_count = 100
-
-            if self.task is None:
-                self.progressbar.log(
-                    f"{self.text}: {cur_count}/{max_count}"
-                    f" ({GitRemoteProgress.opcode_to_str(op_code)})"
-                )
-            else:
-                self.progressbar.progressbar.update(
-                    task_id=self.task,
-                    completed=float(cur_count),
-                    total=float(max_count),
-                    message=f"({GitRemoteProgress.opcode_to_str(op_code)})",
-                )
-
-    def stop(self) -> None:
-        if self.task:
-            self.progressbar.progressbar.stop_task(self.task)
-            self.progressbar.progressbar.remove_task(self.task)
-
-
-class GitRichProgress:
-    max_name_length = 20
-
-    def __init__(self, lock: RLock) -> None:
-        super().__init__()
-
-        self.lock = lock
-        self.progressbar = progress.Progress(
-            progress.SpinnerColumn(),
-            progress.TextColumn("{task.description}"),
-            progress.BarColumn(),
-            progress.TextColumn(
-                "[progress.percentage]{task.percentage:>3.0f}%"
-            ),
-            progress.TimeRemainingColumn(),
-            progress.TextColumn("[yellow]{task.fields[message]}[/]"),
-        )
-        self.progressbar = self.progressbar.__enter__()
-
-    def __del__(self) -> None:
-        try:
-            self.progressbar.__exit__(None, None, None)
-        except Exception:
-            pass
-
-    def task(self, name: str, desc: str) -> GitRemoteProgress:
-        with self.lock:
-            if Console().is_terminal:
-                if len(name) > GitRichProgress.max_name_length - 3:
-                    idx = -1 * (GitRichProgress.max_name_length - 3)
-                    name = f"...{name[idx:]}"
-                name_format = "{0: <%s}" % GitRichProgress.max_name_length
-                name = name_format.format(name)
-                text = f"[yellow]({desc})[/] {name}"
-
-                task = self.progressbar.add_task(
-                    description=text,
-                    total=100.0,
-                    message="",
-                )
-            else:
-                task = None
-                text = f"({desc}) {name}"
-            return GitRemoteProgress(self, task, text)
-
-    def log(self, msg: str) -> None:
-        self.progressbar.print(msg, justify="left")
+from gitclone.mirrors import MirrorCache
+from gitclone.progress import GitRemoteProgress, GitRichProgress
+from gitclone.repositories import normalize_host
+from gitclone.retry import RetryPolicy, is_retryable
+from gitclone.syncstate import SyncState
+from gitclone.utils import print
 
 
 class GitAction(Protocol):
@@ -148,27 +55,51 @@ class GitAction(Protocol):
     def server(self) -> str:
         ...
 
+    @property
+    def connections(self) -> int:
+        ...
+
+
+MISSING_REPOSITORY_RE = re.compile(
+    r"repository not found"
+    r"|does not appear to be a git repository"
+    r"|repository '[^']*' not found"
+)
+MISSING_BRANCH_RE = re.compile(r"remote branch \S+ not found")
+
+
+ESTIMATED_SAVINGS = {
+    "depth": 0.5,
+    "blob": 0.6,
+    "tree": 0.8,
+    "single-branch": 0.1,
+}
+
+
+def repository_missing_error(url: str) -> GitOperationException:
+    return GitOperationException(f"Repository {url} does not exist")
+
 
-def _repo_exists(url: str, branch: str | None) -> bool:
-    env = dict(GIT_TERMINAL_PROMPT="0")
-
-    if branch:
-        cmd: list[str] = [
-            "git",
-            "ls-remote",
-            "--exit-code",
-            "--heads",
-            url,
-            branch,
-        ]
-    else:
-        cmd = ["git", "ls-remote", "--exit-code", "--heads", url]
-    process = subprocess.Popen(
-        cmd, stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL, env=env
-    )
-    process.communicate()
-    exit_code = process.wait()
-    return not bool(exit_code)
+def branch_missing_error(url: str, branch: str) -> GitOperationException:
+    return GitOperationException(f"Branch {branch} does not exist at {url}")
+
+
+def classify_clone_error(
+    exc: BaseException,
+    url: str,
+    branch: str | None,
+    output: Sequence[str] = (),
+) -> BaseException:
+    if not isinstance(exc, GitCommandError):
+        return exc
+    stderr = "\n".join([str(exc.stderr), *output]).lower()
+    if branch and MISSING_BRANCH_RE.search(stderr):
+        return branch_missing_error(url, branch)
+    if MISSING_REPOSITORY_RE.search(stderr):
+        return repository_missing_error(url)
+    if output and not str(exc.stderr).strip():
+        return GitCommandError(exc.command, exc.status, "\n".join(output))
+    return exc
 
 
 @dataclass(frozen=True, eq=True)
@@ -179,6 +110,177 @@ class GitCloneAction(GitAction):
     full_url: str
     dest: str
     branch: str | None = None
+    group: str | None = None
+    reference: str | None = None
+    dissociate: bool = False
+    depth: int | None = None
+    filter: str | None = None
+    single_branch: bool = False
+    submodule_jobs: int = 1
+    shallow_submodules: bool = False
+    size: int | None = None
+    pushed_at: str | None = None
+    bundle: str | None = None
+    mirror: str | None = None
+    shared_mirror: bool = False
+    backend: str = "subprocess"
+
+    @property
+    def clone_options(self) -> list[str]:
+        options = ["--recurse-submodules"]
+        if self.submodule_jobs > 1:
+            options.append(f"--jobs={self.submodule_jobs}")
+        if self.shallow_submodules:
+            options.append("--shallow-submodules")
+        if self.depth:
+            options.append(f"--depth={self.depth}")
+        if self.filter:
+            options.append(f"--filter={self.filter}")
+        if self.single_branch:
+            options.append("--single-branch")
+        if self.reference:
+            reference = str(Path(self.reference).resolve())
+            options.append(f"--reference-if-able={reference}")
+            if self.dissociate:
+                options.append("--dissociate")
+        return options
+
+    @property
+    def full_clone(self) -> bool:
+        return not (
+            self.depth or self.filter or self.single_branch or self.reference
+        )
+
+    @property
+    def submodule_options(self) -> list[str]:
+        options = []
+        if self.submodule_jobs > 1:
+            options.append(f"--jobs={self.submodule_jobs}")
+        if self.shallow_submodules:
+            options.append("--depth=1")
+        return options
+
+    @property
+    def clone_command(self) -> list[str]:
+        return clone_command(
+            self.full_url,
+            str(Path(self.dest).resolve()),
+            self.branch,
+            self.clone_options,
+        )
+
+    @property
+    def estimated_savings(self) -> float:
+        remaining = 1.0
+        if self.depth:
+            remaining *= 1 - ESTIMATED_SAVINGS["depth"]
+        if self.filter:
+            kind = self.filter.split(":")[0]
+            remaining *= 1 - ESTIMATED_SAVINGS.get(kind, 0.0)
+        if self.single_branch:
+            remaining *= 1 - ESTIMATED_SAVINGS["single-branch"]
+        return 1 - remaining
+
+    @property
+    def savings_info(self) -> str:
+        savings = self.estimated_savings
+        if not savings:
+            return ""
+        info = f"~{savings:.0%} less data"
+        if self.size:
+            info += (
+                f", ~{self.size * (1 - savings) / 1024:.1f} MB instead of"
+                f" {self.size / 1024:.1f} MB"
+            )
+        return f" [yellow](estimated {info})[/]"
+
+    def _log_clone(
+        self, progress: GitRichProgress, verbose: bool, dry_run: bool
+    ) -> None:
+        if verbose or not progress.is_terminal:
+            progress.log(
+                f"[green]Repository Clone[/] [blue]'{self.dest}'[/]"
+                + (
+                    f" [yellow](objects from '{self.reference}')[/]"
+                    if self.reference
+                    else ""
+                )
+                + (
+                    " [yellow](from mirror)[/]"
+                    if self.mirror and self.full_clone
+                    else f" [yellow](seeded from '{self.bundle}')[/]"
+                    if self.bundle and self.full_clone
+                    else ""
+                )
+                + (self.savings_info if dry_run else "")
+            )
+
+    def _log_exists(self, progress: GitRichProgress, verbose: bool) -> None:
+        if verbose:
+            progress.log(
+                f"[yellow]Repository Clone[/] [blue]'{self.dest}'[/]"
+                " [yellow]Directory does already exist[/]"
+            )
+
+    def _clone_error(
+        self, e: BaseException, task: GitRemoteProgress | None
+    ) -> BaseException:
+        return classify_clone_error(
+            e,
+            self.full_url,
+            self.branch,
+            task.error_lines + task.other_lines if task else [],
+        )
+
+    def _seed(self, dest: str, task: GitRemoteProgress) -> bool:
+        if self.mirror and self.full_clone:
+            try:
+                MirrorCache(self.mirror).clone(
+                    self.full_url,
+                    dest,
+                    self.branch,
+                    shared=self.shared_mirror,
+                    submodule_options=self.submodule_options,
+                    task=task,
+                )
+            except BaseException:
+                shutil.rmtree(dest, ignore_errors=True)
+                raise
+            return True
+        if (
+            not self.bundle
+            or not self.full_clone
+            or not os.path.exists(self.bundle)
+        ):
+            return False
+        try:
+            seed_from_bundle(
+                self.bundle,
+                self.full_url,
+                dest,
+                self.branch,
+                self.submodule_options,
+                task,
+            )
+        except GitCommandError:
+            shutil.rmtree(dest, ignore_errors=True)
+            return False
+        return True
+
+    def _clone(self, dest: str, task: GitRemoteProgress) -> None:
+        get_backend(self.backend).clone(
+            url=self.full_url,
+            dest=dest,
+            branch=self.branch,
+            options=self.clone_options,
+            task=task,
+        )
+
+    async def _aclone(self, dest: str, task: GitRemoteProgress) -> None:
+        if self.backend == "subprocess":
+            await run_git_async(self.clone_command, task)
+        else:
+            await asyncio.to_thread(self._clone, dest, task)
 
     def run(
         self,
@@ -189,48 +291,186 @@ class GitCloneAction(GitAction):
         dest_path = Path(self.dest)
         parent_dir = dest_path.parents[0]
 
-        env = dict(GIT_TERMINAL_PROMPT="0")
-
         if not dest_path.exists():
-            if verbose or not Console().is_terminal:
-                progress.log(
-                    f"[green]Repository Clone[/] [blue]'{self.dest}'[/]"
-                )
-            if not _repo_exists(self.full_url, self.branch):
-                if not _repo_exists(self.full_url, None):
-                    raise GitOperationException(
-                        f"Repository {self.full_url}" " does not exist"
-                    )
-                else:
-                    raise GitOperationException(
-                        f"Branch {self.branch}"
-                        f" does not exist at {self.full_url}"
-                    )
+            self._log_clone(progress, verbose, dry_run)
             if not dry_run:
                 task: GitRemoteProgress | None = None
                 try:
                     parent_dir.mkdir(parents=True, exist_ok=True)
 
                     task = progress.task(self.name, self.desc)
-                    Repo.clone_from(  # type: ignore
-                        url=self.full_url,
-                        to_path=Path(self.dest).resolve(),
-                        progress=task,  # type: ignore
-                        env=env,
-                        branch=self.branch,
-                        multi_options=["--recurse-submodules"],
-                    )
+                    dest = str(dest_path.resolve())
+                    if not self._seed(dest, task):
+                        self._clone(dest, task)
                 except Exception as e:
-                    try:
-                        if task:
-                            task.stop()
-                    except Exception:
-                        pass
-                    raise e
-        elif verbose:
+                    raise self._clone_error(e, task)
+                finally:
+                    if task:
+                        task.stop()
+        else:
+            self._log_exists(progress, verbose)
+
+    async def arun(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        dest_path = Path(self.dest)
+        if dest_path.exists():
+            self._log_exists(progress, verbose)
+            return
+        self._log_clone(progress, verbose, dry_run)
+        if dry_run:
+            return
+        task: GitRemoteProgress | None = None
+        try:
+            dest_path.parents[0].mkdir(parents=True, exist_ok=True)
+            task = progress.task(self.name, self.desc)
+            dest = str(dest_path.resolve())
+            if not await asyncio.to_thread(self._seed, dest, task):
+                await self._aclone(dest, task)
+        except Exception as e:
+            raise self._clone_error(e, task)
+        finally:
+            if task:
+                task.stop()
+
+    @property
+    def name(self) -> str:
+        return self.dest
+
+    @property
+    def desc(self) -> str:
+        return "Clone"
+
+    @property
+    def server(self) -> str:
+        return normalize_host(self.base_url)
+
+    @property
+    def connections(self) -> int:
+        return self.submodule_jobs
+
+
+PULL_UPDATED = "updated"
+PULL_UNCHANGED = "unchanged"
+PULL_DIVERGED = "diverged"
+PULL_DIRTY = "dirty"
+PULL_DETACHED = "detached"
+PULL_STATES = [
+    PULL_UPDATED,
+    PULL_UNCHANGED,
+    PULL_DIVERGED,
+    PULL_DIRTY,
+    PULL_DETACHED,
+]
+
+
+class PullSummary:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.counts = {state: 0 for state in PULL_STATES}
+        self.skipped_fetches = 0
+
+    def add(self, state: str) -> None:
+        with self.lock:
+            self.counts[state] += 1
+
+    def skip_fetch(self) -> None:
+        with self.lock:
+            self.skipped_fetches += 1
+
+    def __str__(self) -> str:
+        with self.lock:
+            return ", ".join(
+                f"{count} {state}"
+                for state, count in self.counts.items()
+                if count or state != PULL_DETACHED
+            )
+
+
+@dataclass(frozen=True)
+class GitPullAction(GitAction):
+    base_url: str
+    full_url: str
+    dest: str
+    pushed_at: str | None = None
+    summary: PullSummary = field(default_factory=PullSummary, compare=False)
+    state: SyncState | None = field(default=None, compare=False)
+
+    def _git(self, *args: str) -> str:
+        return git_output(["git", "-C", self.dest, *args])
+
+    def _sync(self, progress: GitRichProgress) -> None:
+        if self.state is None:
+            self._fetch(progress)
+            return
+        known = self.state.get(self.dest, self.full_url)
+        if known and self.pushed_at and known.pushed_at == self.pushed_at:
+            self.summary.skip_fetch()
+            return
+        refs = ls_remote(self.full_url)
+        if known and known.refs == refs:
+            self.summary.skip_fetch()
+            if self.pushed_at:
+                self.state.set(self.dest, self.full_url, refs, self.pushed_at)
+            return
+        self._fetch(progress)
+        self.state.set(self.dest, self.full_url, refs, self.pushed_at)
+
+    def _fetch(self, progress: GitRichProgress) -> None:
+        task = progress.task(self.name, self.desc)
+        try:
+            run_git(
+                ["git", "-C", self.dest, "fetch", "--progress", "--prune"],
+                task,
+            )
+        finally:
+            task.stop()
+
+    def _upstream(self) -> str | None:
+        try:
+            return self._git(
+                "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"
+            )
+        except GitCommandError:
+            return None
+
+    def _update(self, dry_run: bool) -> str:
+        if not self._upstream():
+            return PULL_DETACHED
+        ahead, behind = (
+            int(count)
+            for count in self._git(
+                "rev-list", "--left-right", "--count", "HEAD...@{u}"
+            ).split()
+        )
+        if not behind:
+            return PULL_UNCHANGED
+        if ahead:
+            return PULL_DIVERGED
+        if self._git("status", "--porcelain", "--untracked-files=no"):
+            return PULL_DIRTY
+        if not dry_run:
+            self._git("merge", "--ff-only", "--quiet", "@{u}")
+        return PULL_UPDATED
+
+    def run(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        if not dry_run:
+            self._sync(progress)
+        state = self._update(dry_run)
+        self.summary.add(state)
+        if verbose or state in (PULL_DIVERGED, PULL_DIRTY):
+            color = "green" if state == PULL_UPDATED else "yellow"
             progress.log(
-                f"[yellow]Repository Clone[/] [blue]'{self.dest}'[/]"
-                " [yellow]Directory does already exist[/]"
+                f"[green]Repository Pull[/] [blue]'{self.dest}'[/]"
+                f" [{color}]{state.capitalize()}[/]"
             )
 
     @property
@@ -239,116 +479,328 @@ class GitCloneAction(GitAction):
 
     @property
     def desc(self) -> str:
-        return "Clone"
+        return "Pull"
 
     @property
     def server(self) -> str:
-        return self.base_url
+        return normalize_host(self.base_url)
+
+    @property
+    def connections(self) -> int:
+        return 1
 
 
-class GitActionMultiprocessingHandler:
+class GitActionScheduler:
+    def __init__(
+        self,
+        controller: ConcurrencyController,
+        retry: RetryPolicy | None = None,
+    ) -> None:
+        self.controller = controller
+        self.retry = retry or RetryPolicy(attempts=1)
+
+        self.actions: dict[str, deque[GitAction]] = {}
+        self.ready_servers: deque[str] = deque()
+        self.ready_servers_set: set[str] = set()
+        self.pending_actions: int = 0
+        self.cur_total_actions: int = 0
+        self.cur_connections: dict[str, int] = {}
+        self.cur_total_connections: int = 0
+        self.errors: list[tuple[GitAction, BaseException]] = []
+        self.waiting: dict[GitAction, list[GitAction]] = {}
+        self.done: set[GitAction] = set()
+        self.progress: GitRichProgress | None = None
+        self.retries: dict[GitAction, int] = {}
+        self.delayed: list[tuple[float, int, GitAction]] = []
+        self.delayed_counter = itertools.count()
+        self.open_feeds: int = 0
+
+    def _notify(self) -> None:
+        pass
+
+    def _open_feed(self) -> None:
+        self.open_feeds += 1
+
+    def _close_feed(self) -> None:
+        self.open_feeds -= 1
+        self._notify()
+
+    def _start_progress(self, progress: GitRichProgress) -> None:
+        self.progress = progress
+        progress.add_total(self.pending_actions + self.cur_total_actions)
+
+    def _add_action(
+        self, action: GitAction, after: GitAction | None = None
+    ) -> None:
+        self.pending_actions += 1
+        if self.progress is not None:
+            self.progress.add_total()
+        if after is not None and after not in self.done:
+            self.waiting.setdefault(after, []).append(action)
+        else:
+            self._enqueue(action)
+
+    def _add_error(self, action: GitAction, exc: BaseException) -> None:
+        self.errors.append((action, exc))
+        self._release(action)
+
+    def _enqueue(self, action: GitAction) -> None:
+        server = action.server
+        if server not in self.cur_connections:
+            self.cur_connections[server] = 0
+        self.actions.setdefault(server, deque()).append(action)
+        self._mark_ready(server)
+        self._notify()
+
+    def _release(self, action: GitAction) -> None:
+        self.done.add(action)
+        for waiting in self.waiting.pop(action, []):
+            self._enqueue(waiting)
+
+    def _connections(self, action: GitAction) -> int:
+        return max(
+            1,
+            min(
+                action.connections,
+                self.controller.cap(action.server),
+                self.controller.max_total,
+            ),
+        )
+
+    def _has_capacity(self, server: str) -> bool:
+        used = self.cur_connections[server]
+        if not used:
+            return True
+        needed = self._connections(self.actions[server][0])
+        return used + needed <= self.controller.limit(server)
+
+    def _has_total_capacity(self, action: GitAction) -> bool:
+        used = self.cur_total_connections
+        needed = self._connections(action)
+        return not used or used + needed <= self.controller.max_total
+
+    def _mark_ready(self, server: str) -> None:
+        if (
+            server not in self.ready_servers_set
+            and self.actions.get(server)
+            and self._has_capacity(server)
+        ):
+            self.ready_servers.append(server)
+            self.ready_servers_set.add(server)
+
+    def _release_delayed(self) -> None:
+        now = time.monotonic()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, action = heapq.heappop(self.delayed)
+            self._enqueue(action)
+
+    def _next_delay(self) -> float | None:
+        if not self.delayed:
+            return None
+        return max(0.0, self.delayed[0][0] - time.monotonic())
+
+    def _schedule_retry(self, action: GitAction, exc: BaseException) -> None:
+        retries = self.retries.get(action, 0) + 1
+        self.retries[action] = retries
+        delay = self.retry.delay(retries)
+        heapq.heappush(
+            self.delayed,
+            (time.monotonic() + delay, next(self.delayed_counter), action),
+        )
+        self.pending_actions += 1
+        if self.progress is not None:
+            reason = str(exc).strip().splitlines()[-1:] or [""]
+            self.progress.log(
+                f"[yellow]Retry {retries}/{self.retry.attempts - 1}:[/]"
+                f" {action.desc}: {action.name} in {delay:.1f}s"
+                f" [yellow]({reason[0].strip()})[/]"
+            )
+
+    def _get_next_action(self) -> GitAction | None:
+        self._release_delayed()
+        if self.cur_total_connections >= self.controller.max_total:
+            return None
+        for _ in range(len(self.ready_servers)):
+            server = self.ready_servers.popleft()
+            self.ready_servers_set.discard(server)
+            if not self.actions[server] or not self._has_capacity(server):
+                continue
+            if self._has_total_capacity(self.actions[server][0]):
+                break
+            self.ready_servers.append(server)
+            self.ready_servers_set.add(server)
+        else:
+            return None
+        action = self.actions[server].popleft()
+        connections = self._connections(action)
+        self.pending_actions -= 1
+        self.cur_total_actions += 1
+        self.cur_connections[server] += connections
+        self.cur_total_connections += connections
+        self._mark_ready(server)
+        return action
+
+    def _finish(
+        self, action: GitAction, exc: BaseException | None = None
+    ) -> None:
+        retry = False
+        if exc is None:
+            self.controller.success(action.server)
+        else:
+            if is_retryable(exc):
+                self.controller.failure(action.server)
+            retry = self.retry.should_retry(exc, self.retries.get(action, 0))
+            if retry:
+                self._schedule_retry(action, exc)
+            else:
+                self.errors.append((action, exc))
+        connections = self._connections(action)
+        self.cur_total_actions -= 1
+        self.cur_connections[action.server] -= connections
+        self.cur_total_connections -= connections
+        if not retry:
+            if self.progress is not None:
+                self.progress.advance()
+            self._release(action)
+        self._mark_ready(action.server)
+        self._notify()
+
+    def _is_finished(self) -> bool:
+        return (
+            not self.pending_actions
+            and not self.cur_total_actions
+            and not self.open_feeds
+        )
+
+    def _raise_errors(self) -> None:
+        self.progress = None
+        self.cur_total_actions = 0
+        self.cur_connections = {}
+        self.cur_total_connections = 0
+        self.done = set()
+
+        retries = self.retries
+        self.retries = {}
+        if retries:
+            print(
+                f"[yellow]Info:[/] Retried {len(retries)}"
+                f" action{'s' if len(retries) > 1 else ''}"
+                f" ({sum(retries.values())} retries in total)"
+            )
+
+        errors = self.errors
+        self.errors = []
+        error_strs: list[str] = []
+        for a, e in errors:
+            error_strs.append(
+                f"[bold]Error:[/] {a.desc}: {a.name} -> {str(e)}"
+                + (f" (after {retries[a]} retries)" if a in retries else "")
+            )
+        if error_strs:
+            error_strs = [
+                f"The following git error{'s' if len(errors)>1 else''}"
+                " occurred:"
+            ] + error_strs
+            raise GitOperationException("\n".join(error_strs))
+
+
+class GitActionMultiprocessingHandler(GitActionScheduler):
     def __init__(
         self,
         actions: list[GitAction] = [],
         max_connections_per_server: int = 5,
         max_connections_total: int = 5,
+        controller: ConcurrencyController | None = None,
+        retry: RetryPolicy | None = None,
     ) -> None:
-        self.max_connections_per_server = max_connections_per_server
-        self.max_connections_total = max_connections_total
+        if controller is None:
+            controller = ConcurrencyController(
+                max_per_host=max_connections_per_server,
+                max_total=max_connections_total,
+            )
+        super().__init__(controller, retry)
 
-        self.actions: list[GitAction] = []
-        self.cur_actions: dict[str, int] = {}
-        self.cur_total_actions: int = 0
+        self.lock = RLock()
+        self.condition = Condition(self.lock)
 
         for action in actions:
             self.add_action(action)
 
-    def add_action(self, action: GitAction) -> None:
-        if action.server not in self.cur_actions:
-            self.cur_actions[action.server] = 0
-        self.actions.append(action)
+    def _notify(self) -> None:
+        self.condition.notify()
 
-    def _get_next_action(self) -> GitAction | None:
-        for action in self.actions:
-            if (
-                self.cur_actions[action.server]
-                < self.max_connections_per_server
-                and self.cur_total_actions < self.max_connections_total
-            ):
-                return action
-        return None
+    def add_action(
+        self, action: GitAction, after: GitAction | None = None
+    ) -> None:
+        with self.condition:
+            self._add_action(action, after)
+
+    def add_error(self, action: GitAction, exc: BaseException) -> None:
+        with self.condition:
+            self._add_error(action, exc)
+
+    def open_feed(self) -> None:
+        with self.condition:
+            self._open_feed()
+
+    def close_feed(self) -> None:
+        with self.condition:
+            self._close_feed()
+
+    @contextmanager
+    def feed(self) -> Iterator[None]:
+        self.open_feed()
+        try:
+            yield
+        finally:
+            self.close_feed()
 
     def _run_action(
         self,
         pool: ThreadPool,
-        lock: RLock,
         action: GitAction,
-        errors: list[tuple[GitAction, BaseException]],
         gitrichprogress: GitRichProgress,
         verbose: bool,
         dry_run: bool,
     ) -> None:
         def callback(res: None) -> None:
-            with lock:
-                self.cur_actions[action.server] -= 1
-                self.cur_total_actions -= 1
+            with self.condition:
+                self._finish(action)
 
         def error_callback(exc: BaseException) -> None:
-            with lock:
-                errors.append((action, exc))
-                callback(None)
-
-        with lock:
-            self.cur_actions[action.server] += 1
-            self.cur_total_actions += 1
-            self.actions.remove(action)
-            pool.apply_async(
-                func=action.run,
-                args=(gitrichprogress, verbose, dry_run),
-                callback=callback,
-                error_callback=error_callback,
-            )
+            with self.condition:
+                self._finish(action, exc)
+
+        pool.apply_async(
+            func=action.run,
+            args=(gitrichprogress, verbose, dry_run),
+            callback=callback,
+            error_callback=error_callback,
+        )
 
     def run(self, verbose: bool = False, dry_run: bool = False) -> None:
-        lock = RLock()
-
-        gitrichprogress = GitRichProgress(lock)
-
-        errors: list[tuple[GitAction, BaseException]] = []
-
-        with ThreadPool(self.max_connections_total) as pool:
-            while True:
-                with lock:
-                    action = self._get_next_action()
-                if action:
-                    self._run_action(
-                        pool,
-                        lock,
-                        action,
-                        errors,
-                        gitrichprogress,
-                        verbose,
-                        dry_run,
-                    )
-                else:
-                    time.sleep(0.2)
-                with lock:
-                    if not self.cur_total_actions and not self.actions:
-                        break
-        self.cur_actions = {}
-        self.cur_total_actions = 0
+        gitrichprogress = GitRichProgress(RLock())
 
-        error_strs: list[str] = []
-        for a, e in errors:
-            error_strs.append(
-                f"[bold]Error:[/] {a.desc}: {a.name} -> {str(e)}"
-            )
-        if error_strs:
-            error_strs = [
-                f"The following git error{'s' if len(errors)>1 else''}"
-                " occurred:"
-            ] + error_strs
-            raise GitOperationException("\n".join(error_strs))
+        try:
+            with self.condition:
+                self._start_progress(gitrichprogress)
+            with ThreadPool(self.controller.max_total) as pool:
+                with self.condition:
+                    while not self._is_finished():
+                        action = self._get_next_action()
+                        if action:
+                            self._run_action(
+                                pool,
+                                action,
+                                gitrichprogress,
+                                verbose,
+                                dry_run,
+                            )
+                        else:
+                            self.condition.wait(self._next_delay())
+        finally:
+            gitrichprogress.close()
+        self._raise_errors()
 
 
 __all__ = [
@@ -356,5 +808,11 @@ __all__ = [
     "GitRichProgress",
     "GitAction",
     "GitCloneAction",
+    "GitPullAction",
+    "PullSummary",
+    "GitActionScheduler",
     "GitActionMultiprocessingHandler",
+    "classify_clone_error",
+    "repository_missing_error",
+    "branch_missing_error",
 ]
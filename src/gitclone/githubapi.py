@@ -0,0 +1,553 @@
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.pool import ThreadPool
+from typing import Any, Callable, Iterator
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from gitclone.exceptions import CoreException
+
+GITHUB_API_URL = "https://api.github.com"
+MAX_PAGE_SIZE = 100
+RATE_LIMIT_RETRIES = 3
+SECONDARY_RATE_LIMIT_DELAY = 60.0
+LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+GRAPHQL_REPOSITORIES = """
+query($cursor: String, $privacy: RepositoryPrivacy) {
+  viewer {
+    login
+    repositories(
+      first: 100
+      after: $cursor
+      privacy: $privacy
+      ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        owner { login }
+        isFork
+        parent { nameWithOwner }
+        diskUsage
+        pushedAt
+        defaultBranchRef { name }
+      }
+    }
+  }
+}
+"""
+
+
+class GithubApiException(CoreException):
+    pass
+
+
+@dataclass(frozen=True)
+class GithubRepository:
+    name: str
+    full_name: str
+    owner: str
+    fork: bool = False
+    parent: str | None = None
+    size: int | None = None
+    pushed_at: str | None = None
+    default_branch: str | None = None
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "GithubRepository":
+        source = data.get("source") or data.get("parent") or {}
+        return cls(
+            name=data["name"],
+            full_name=data["full_name"],
+            owner=data["owner"]["login"],
+            fork=bool(data.get("fork")),
+            parent=source.get("full_name"),
+            size=data.get("size"),
+            pushed_at=data.get("pushed_at"),
+            default_branch=data.get("default_branch"),
+        )
+
+    @classmethod
+    def from_graphql(cls, node: dict[str, Any]) -> "GithubRepository":
+        parent = node.get("parent") or {}
+        branch = node.get("defaultBranchRef") or {}
+        return cls(
+            name=node["name"],
+            full_name=node["nameWithOwner"],
+            owner=node["owner"]["login"],
+            fork=bool(node.get("isFork")),
+            parent=parent.get("nameWithOwner"),
+            size=node.get("diskUsage"),
+            pushed_at=node.get("pushedAt"),
+            default_branch=branch.get("name"),
+        )
+
+
+@dataclass
+class ApiResponse:
+    status: int
+    headers: dict[str, str]
+    data: Any = None
+    links: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def last_page(self) -> int | None:
+        last = self.links.get("last")
+        if not last:
+            return None
+        return int(parse_qs(urlsplit(last).query)["page"][0])
+
+
+def parse_links(header: str) -> dict[str, str]:
+    return {rel: url for url, rel in LINK_RE.findall(header)}
+
+
+def parse_json(data: bytes) -> Any:
+    try:
+        return json.loads(data) if data else None
+    except ValueError:
+        return None
+
+
+def graphql_rate_limited(data: Any) -> bool:
+    errors = data.get("errors") if isinstance(data, dict) else None
+    return any(
+        isinstance(e, dict) and e.get("type") == "RATE_LIMITED"
+        for e in errors or []
+    )
+
+
+def rate_limit_delay(
+    status: int, headers: dict[str, str], data: Any
+) -> float | None:
+    limited = graphql_rate_limited(data)
+    if status not in (403, 429) and not limited:
+        return None
+    if "retry-after" in headers:
+        try:
+            return max(0.0, float(headers["retry-after"]))
+        except ValueError:
+            return SECONDARY_RATE_LIMIT_DELAY
+    if headers.get("x-ratelimit-remaining") == "0":
+        return 0.0
+    message = data.get("message", "") if isinstance(data, dict) else ""
+    if limited or "rate limit" in message.lower():
+        return SECONDARY_RATE_LIMIT_DELAY
+    return None
+
+
+class RateBudget:
+    def __init__(
+        self,
+        max_wait: float = 900.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset = 0.0
+        self.blocked_until = 0.0
+        self.inflight = 0
+        self.requests = 0
+        self.limited = 0
+        self.waited = 0.0
+
+    def _delay(self) -> float | None:
+        now = self.clock()
+        delay = self.blocked_until - now
+        remaining = self.remaining if self.reset > now else self.limit
+        if remaining is not None and remaining <= self.inflight:
+            if self.reset <= now:
+                return None if delay <= 0 else delay
+            delay = max(delay, self.reset - now)
+        return delay
+
+    def acquire(self) -> None:
+        while True:
+            with self.condition:
+                delay = self._delay()
+                if delay is None:
+                    self.condition.wait()
+                    continue
+                if delay <= 0:
+                    self.inflight += 1
+                    return
+                if delay > self.max_wait:
+                    raise GithubApiException(
+                        f"GitHub API rate limit exhausted, next request"
+                        f" possible in {delay:.0f}s"
+                    )
+                self.waited += delay
+            self.sleep(delay)
+
+    def release(self, headers: dict[str, str] | None = None) -> None:
+        with self.condition:
+            self.inflight -= 1
+            self.condition.notify_all()
+            if headers is None:
+                return
+            self.requests += 1
+            try:
+                remaining = int(headers["x-ratelimit-remaining"])
+                reset = float(headers["x-ratelimit-reset"])
+                limit = int(headers.get("x-ratelimit-limit", remaining))
+            except (KeyError, ValueError):
+                return
+            if reset == self.reset and self.remaining is not None:
+                remaining = min(remaining, self.remaining)
+            elif reset < self.reset:
+                return
+            self.remaining = remaining
+            self.reset = reset
+            self.limit = limit
+
+    def block(self, delay: float) -> None:
+        with self.lock:
+            self.limited += 1
+            self.blocked_until = max(self.blocked_until, self.clock() + delay)
+
+    def __str__(self) -> str:
+        text = f"{self.requests} requests"
+        if self.remaining is not None and self.limit is not None:
+            text += f", {self.remaining} of {self.limit} remaining"
+            reset = self.reset - self.clock()
+            if reset > 0:
+                text += f" (resets in {reset / 60:.0f} min)"
+        if self.limited:
+            text += f", rate limited {self.limited} times"
+        if self.waited:
+            text += f", waited {self.waited:.0f}s"
+        return text
+
+
+class ResponseCache:
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.expanduser(directory)
+
+    def path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> ApiResponse | None:
+        try:
+            with open(self.path(key), "r") as f:
+                data = json.load(f)
+            return ApiResponse(
+                status=data["status"],
+                headers=data["headers"],
+                data=data["data"],
+                links=data["links"],
+            )
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def set(self, key: str, response: ApiResponse) -> None:
+        path = self.path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "status": response.status,
+                    "headers": response.headers,
+                    "data": response.data,
+                    "links": response.links,
+                },
+                f,
+            )
+        os.replace(tmp, path)
+
+
+class GithubClient:
+    def __init__(
+        self,
+        token: str | None = None,
+        api_url: str = GITHUB_API_URL,
+        timeout: float = 30.0,
+        cache: ResponseCache | None = None,
+        budget: RateBudget | None = None,
+    ) -> None:
+        url = urlsplit(api_url.rstrip("/"))
+        self.scheme = url.scheme
+        self.netloc = url.netloc
+        self.base_path = url.path
+        self.token = token
+        self.timeout = timeout
+        self.cache = cache
+        self.budget = budget or RateBudget()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.not_modified = 0
+        self.modified = 0
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection: http.client.HTTPConnection | None = getattr(
+            self.local, "connection", None
+        )
+        if connection is None:
+            if self.scheme == "http":
+                connection = http.client.HTTPConnection(
+                    self.netloc, timeout=self.timeout
+                )
+            else:
+                connection = http.client.HTTPSConnection(
+                    self.netloc, timeout=self.timeout
+                )
+            self.local.connection = connection
+        return connection
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "gitclone",
+        }
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        return headers
+
+    def cache_key(self, url: str) -> str:
+        token = self.token or ""
+        credentials = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return f"{self.scheme}://{self.netloc}{url} {credentials}"
+
+    def _exchange(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        extra: dict[str, str] = {},
+    ) -> tuple[int, dict[str, str], bytes]:
+        connection = self._connection()
+        headers = dict(self.headers(), **extra)
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        try:
+            connection.request(method, url, body, headers)
+            response = connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self.local.connection = None
+            raise
+        headers = {k.lower(): v for k, v in response.getheaders()}
+        return response.status, headers, data
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        extra: dict[str, str] = {},
+    ) -> tuple[int, dict[str, str], bytes]:
+        try:
+            return self._exchange(method, url, body, extra)
+        except (http.client.HTTPException, OSError):
+            return self._exchange(method, url, body, extra)
+
+    def _paced(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        extra: dict[str, str],
+    ) -> tuple[int, dict[str, str], bytes]:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.budget.acquire()
+            try:
+                status, headers, data = self._send(method, url, body, extra)
+            except (http.client.HTTPException, OSError) as e:
+                self.budget.release()
+                raise GithubApiException(f"GitHub API request failed: {e}")
+            self.budget.release(headers)
+            delay = rate_limit_delay(status, headers, parse_json(data))
+            if delay is None or attempt == RATE_LIMIT_RETRIES:
+                break
+            self.budget.block(delay)
+        return status, headers, data
+
+    def _validators(self, cached: ApiResponse | None) -> dict[str, str]:
+        if cached is None:
+            return {}
+        headers: dict[str, str] = {}
+        if "etag" in cached.headers:
+            headers["If-None-Match"] = cached.headers["etag"]
+        if "last-modified" in cached.headers:
+            headers["If-Modified-Since"] = cached.headers["last-modified"]
+        return headers
+
+    def _revalidate(
+        self, key: str, cached: ApiResponse | None, response: ApiResponse
+    ) -> ApiResponse:
+        assert self.cache is not None
+        if response.status == 304 and cached is not None:
+            with self.lock:
+                self.not_modified += 1
+            return cached
+        with self.lock:
+            self.modified += 1
+        if response.status == 200 and (
+            "etag" in response.headers or "last-modified" in response.headers
+        ):
+            self.cache.set(key, response)
+        return response
+
+    def request(
+        self,
+        path: str,
+        params: dict[str, str | int] = {},
+        method: str = "GET",
+        body: Any = None,
+    ) -> ApiResponse:
+        url = self.base_path + path
+        if params:
+            url += "?" + urlencode(params)
+        payload = (
+            json.dumps(body).encode("utf-8") if body is not None else None
+        )
+        cacheable = self.cache is not None and method == "GET"
+        key = self.cache_key(url)
+        cached = self.cache.get(key) if self.cache and cacheable else None
+        status, headers, data = self._paced(
+            method, url, payload, self._validators(cached)
+        )
+        try:
+            decoded = json.loads(data) if data else None
+        except ValueError:
+            if status < 400:
+                raise GithubApiException(
+                    f"GitHub API request {path} returned invalid JSON"
+                )
+            decoded = None
+        response = ApiResponse(
+            status=status,
+            headers=headers,
+            data=decoded,
+            links=parse_links(headers.get("link", "")),
+        )
+        if status >= 400:
+            message = (
+                response.data.get("message", "")
+                if isinstance(response.data, dict)
+                else ""
+            )
+            raise GithubApiException(
+                f"GitHub API request {path} failed"
+                f" with status {status}: {message}"
+            )
+        if cacheable:
+            return self._revalidate(key, cached, response)
+        return response
+
+    def pages(
+        self,
+        path: str,
+        params: dict[str, str | int] = {},
+        max_workers: int = 8,
+    ) -> Iterator[list[Any]]:
+        params = dict(params, per_page=MAX_PAGE_SIZE)
+        first = self.request(path, params)
+        yield first.data
+        last = first.last_page
+        if not last or last < 2:
+            return
+
+        def page(number: int) -> list[Any]:
+            response = self.request(path, dict(params, page=number))
+            data: list[Any] = response.data
+            return data
+
+        with ThreadPool(min(max_workers, last - 1)) as pool:
+            yield from pool.imap(page, range(2, last + 1))
+
+    def repositories(
+        self,
+        path: str,
+        params: dict[str, str | int] = {},
+        max_workers: int = 8,
+    ) -> Iterator[list[GithubRepository]]:
+        for page in self.pages(path, params, max_workers):
+            yield [GithubRepository.from_json(data) for data in page]
+
+    def repository(self, full_name: str) -> GithubRepository:
+        return GithubRepository.from_json(
+            self.request(f"/repos/{full_name}").data
+        )
+
+    def graphql(
+        self, query: str, variables: dict[str, Any] = {}
+    ) -> dict[str, Any]:
+        response = self.request(
+            "/graphql",
+            method="POST",
+            body={"query": query, "variables": variables},
+        )
+        if not isinstance(response.data, dict):
+            raise GithubApiException(
+                "GitHub GraphQL request returned a malformed response"
+            )
+        errors = response.data.get("errors")
+        if errors:
+            raise GithubApiException(
+                "GitHub GraphQL request failed: "
+                + "; ".join(
+                    str(e.get("message", "")) if isinstance(e, dict) else ""
+                    for e in errors
+                )
+            )
+        data = response.data.get("data")
+        if not isinstance(data, dict):
+            raise GithubApiException(
+                "GitHub GraphQL request returned a malformed response"
+            )
+        return data
+
+    def graphql_repositories(
+        self, private: bool = False
+    ) -> Iterator[tuple[str, list[GithubRepository]]]:
+        variables: dict[str, Any] = {
+            "cursor": None,
+            "privacy": None if private else "PUBLIC",
+        }
+        while True:
+            viewer = self.graphql(GRAPHQL_REPOSITORIES, variables)["viewer"]
+            repositories = viewer["repositories"]
+            yield viewer["login"], [
+                GithubRepository.from_graphql(node)
+                for node in repositories["nodes"]
+            ]
+            page_info = repositories["pageInfo"]
+            if not page_info["hasNextPage"]:
+                return
+            variables["cursor"] = page_info["endCursor"]
+
+    def login(self) -> str:
+        login: str = self.request("/user").data["login"]
+        return login
+
+
+__all__ = [
+    "GITHUB_API_URL",
+    "MAX_PAGE_SIZE",
+    "GRAPHQL_REPOSITORIES",
+    "GithubApiException",
+    "GithubRepository",
+    "ApiResponse",
+    "parse_links",
+    "parse_json",
+    "graphql_rate_limited",
+    "rate_limit_delay",
+    "RateBudget",
+    "ResponseCache",
+    "GithubClient",
+]
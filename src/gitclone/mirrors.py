@@ -0,0 +1,146 @@
+import hashlib
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator
+
+from gitclone.backends import git_output, run_git
+from gitclone.progress import GitRemoteProgress
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+_locks: dict[str, Lock] = {}
+_locks_lock = Lock()
+
+
+def mirror_key(url: str) -> str:
+    key = url.strip().rstrip("/").removesuffix(".git")
+    _, sep, rest = key.partition("://")
+    if sep:
+        host, _, path = rest.partition("/")
+        host = host.rpartition("@")[2].split(":")[0]
+    else:
+        scp = re.match(r"^(?:[^@/]+@)?([^:/]+):(.*)$", key)
+        host, path = scp.groups() if scp else ("", key)
+    return f"{host.lower()}/{path.strip('/')}"
+
+
+def mirror_name(url: str) -> str:
+    key = mirror_key(url)
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", key.rpartition("/")[2])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+    return f"{name or 'repository'}-{digest}.git"
+
+
+def directory_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return size
+
+
+class MirrorCache:
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+
+    def path(self, url: str) -> str:
+        return os.path.join(self.directory, mirror_name(url))
+
+    @contextmanager
+    def lock(self, path: str) -> Iterator[None]:
+        with _locks_lock:
+            lock = _locks.setdefault(path, Lock())
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.lock", "w") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(
+        self, url: str, path: str, task: GitRemoteProgress | None
+    ) -> None:
+        if os.path.isdir(path):
+            git_output(["git", "-C", path, "remote", "set-url", "origin", url])
+            run_git(
+                ["git", "-C", path, "fetch", "--progress", "--prune"], task
+            )
+        else:
+            tmp = f"{path}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            run_git(["git", "clone", "--mirror", "--progress", url, tmp], task)
+            os.replace(tmp, path)
+        os.utime(path)
+
+    def update(self, url: str, task: GitRemoteProgress | None = None) -> str:
+        path = self.path(url)
+        with self.lock(path):
+            self._refresh(url, path, task)
+        return path
+
+    def clone(
+        self,
+        url: str,
+        dest: str,
+        branch: str | None,
+        shared: bool = False,
+        submodule_options: list[str] = [],
+        task: GitRemoteProgress | None = None,
+    ) -> None:
+        path = self.path(url)
+        cmd = ["git", "clone", "--quiet"]
+        if shared:
+            cmd.append("--shared")
+        if branch:
+            cmd += ["--branch", branch]
+        with self.lock(path):
+            self._refresh(url, path, task)
+            git_output(cmd + ["--", path, dest])
+        git_output(["git", "-C", dest, "remote", "set-url", "origin", url])
+        if os.path.exists(os.path.join(dest, ".gitmodules")):
+            git_output(
+                ["git", "-C", dest, "submodule", "update", "--init"]
+                + ["--recursive"]
+                + submodule_options
+            )
+
+    def evict(self, max_size: int) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        mirrors: list[tuple[float, str, int]] = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".git") and entry.is_dir():
+                mirrors.append(
+                    (
+                        entry.stat().st_mtime,
+                        entry.path,
+                        directory_size(entry.path),
+                    )
+                )
+        total = sum(size for _, _, size in mirrors)
+        evicted: list[str] = []
+        for _, path, size in sorted(mirrors):
+            if total <= max_size:
+                break
+            with self.lock(path):
+                shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted.append(path)
+        return evicted
+
+
+__all__ = ["mirror_key", "mirror_name", "directory_size", "MirrorCache"]
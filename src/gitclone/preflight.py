@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import subprocess
+import time
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from typing import Callable
+
+from gitclone.backends import git_env
+from gitclone.exceptions import GitOperationException
+from gitclone.gitcmds import (
+    MISSING_REPOSITORY_RE,
+    GitCloneAction,
+    branch_missing_error,
+    repository_missing_error,
+)
+
+PREFLIGHT_OK = "ok"
+PREFLIGHT_MISSING_REPOSITORY = "missing-repository"
+PREFLIGHT_MISSING_BRANCH = "missing-branch"
+PREFLIGHT_UNKNOWN = "unknown"
+LS_REMOTE_NO_MATCH = 2
+
+
+def _ls_remote(url: str, branch: str | None) -> tuple[int, str]:
+    cmd = ["git", "ls-remote", "--exit-code", "--heads", url]
+    if branch:
+        cmd.append(branch)
+    process = subprocess.Popen(
+        cmd,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        env=git_env(),
+        text=True,
+        errors="replace",
+    )
+    _, stderr = process.communicate()
+    return process.wait(), stderr
+
+
+def check_remote(url: str, branch: str | None) -> str:
+    exit_code, stderr = _ls_remote(url, branch)
+    if exit_code == 0:
+        return PREFLIGHT_OK
+    if exit_code == LS_REMOTE_NO_MATCH:
+        return PREFLIGHT_MISSING_BRANCH if branch else PREFLIGHT_OK
+    if MISSING_REPOSITORY_RE.search(stderr.lower()):
+        return PREFLIGHT_MISSING_REPOSITORY
+    return PREFLIGHT_UNKNOWN
+
+
+class PreflightCache:
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: int = 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = os.path.expanduser(path) if path else None
+        self.ttl = ttl
+        self.clock = clock
+        self.results: dict[tuple[str, str | None], str] = {}
+        self.persisted: dict[str, float] = {}
+        self.load()
+
+    @staticmethod
+    def _digest(url: str, branch: str | None) -> str:
+        key = f"{url}\n{branch or ''}".encode("utf-8")
+        return hashlib.sha256(key).hexdigest()
+
+    def get(self, url: str, branch: str | None) -> str | None:
+        result = self.results.get((url, branch))
+        if result is not None:
+            return result
+        checked = self.persisted.get(self._digest(url, branch))
+        if checked is not None and self.clock() - checked < self.ttl:
+            self.results[(url, branch)] = PREFLIGHT_OK
+            return PREFLIGHT_OK
+        return None
+
+    def set(self, url: str, branch: str | None, result: str) -> None:
+        self.results[(url, branch)] = result
+        if self.path and result == PREFLIGHT_OK:
+            self.persisted[self._digest(url, branch)] = self.clock()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = self.clock()
+        self.persisted = {
+            k: float(v)
+            for k, v in data.items()
+            if isinstance(v, (int, float)) and now - v < self.ttl
+        }
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        now = self.clock()
+        data = {k: v for k, v in self.persisted.items() if now - v < self.ttl}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+
+class Preflight:
+    def __init__(
+        self,
+        cache: PreflightCache | None = None,
+        max_connections: int = 16,
+    ) -> None:
+        self.cache = cache or PreflightCache()
+        self.max_connections = max(1, max_connections)
+        self.checked = 0
+
+    def _check(self, key: tuple[str, str | None]) -> str:
+        return check_remote(*key)
+
+    def run(
+        self, actions: list[GitCloneAction]
+    ) -> list[tuple[GitCloneAction, GitOperationException]]:
+        keys = OrderedDict.fromkeys((a.full_url, a.branch) for a in actions)
+        unchecked = [k for k in keys if self.cache.get(*k) is None]
+        if unchecked:
+            connections = min(self.max_connections, len(unchecked))
+            with ThreadPool(connections) as pool:
+                for key, result in zip(
+                    unchecked, pool.imap(self._check, unchecked)
+                ):
+                    self.cache.set(*key, result)
+            self.cache.save()
+        self.checked += len(unchecked)
+
+        failures: list[tuple[GitCloneAction, GitOperationException]] = []
+        for action in actions:
+            checked = self.cache.get(action.full_url, action.branch)
+            if checked == PREFLIGHT_MISSING_REPOSITORY:
+                failures.append(
+                    (action, repository_missing_error(action.full_url))
+                )
+            elif checked == PREFLIGHT_MISSING_BRANCH and action.branch:
+                failures.append(
+                    (
+                        action,
+                        branch_missing_error(action.full_url, action.branch),
+                    )
+                )
+        return failures
+
+
+__all__ = [
+    "PREFLIGHT_OK",
+    "PREFLIGHT_MISSING_REPOSITORY",
+    "PREFLIGHT_MISSING_BRANCH",
+    "PREFLIGHT_UNKNOWN",
+    "check_remote",
+    "PreflightCache",
+    "Preflight",
+]
@@ -0,0 +1,256 @@
+import re
+import time
+from threading import Event, RLock, Thread, current_thread
+
+from git import RemoteProgress
+from rich import filesize, progress
+
+
+class GitRemoteProgress(RemoteProgress):
+    OP_CODES = [
+        "BEGIN",
+        "CHECKING_OUT",
+        "COMPRESSING",
+        "COUNTING",
+        "END",
+        "FINDING_SOURCES",
+        "RECEIVING",
+        "RESOLVING",
+        "WRITING",
+    ]
+    OP_CODE_MAP = {
+        getattr(RemoteProgress, _op_code): _op_code for _op_code in OP_CODES
+    }
+
+    @classmethod
+    def opcode_to_str(cls, op_code: int) -> str:
+        op_code_masked = op_code & cls.OP_MASK
+        return cls.OP_CODE_MAP.get(op_code_masked, "?").title()
+
+    log_threshold = 25
+
+    def __init__(
+        self,
+        progressbar: "GitRichProgress",
+        task: progress.TaskID | None,
+        text: str,
+    ):
+        super().__init__()
+        self.progressbar = progressbar
+        self.task = task
+        self.text = text
+        self.state: tuple[str, int] | None = None
+        self.rendered: tuple[str, int] | None = None
+        self.logged: tuple[str, int] | None = None
+        self.received: int = 0
+
+    def update(
+        self,
+        op_code: int,
+        cur_count: str | float,
+        max_count: float | str | None = None,
+        message: str | None = "",
+    ) -> None:
+        if max_count is None:
+            max_count = 100
+        percentage = int(float(cur_count) / float(max_count) * 100)
+        self.update_phase(GitRemoteProgress.opcode_to_str(op_code), percentage)
+        if message:
+            self.update_received(parse_size(message))
+
+    def update_received(self, received: int | None) -> None:
+        if received is not None:
+            self.received = received
+
+    def update_phase(self, phase: str, percentage: int) -> None:
+        if self.task is not None:
+            self.state = (phase, percentage)
+        elif self._should_log(phase, percentage):
+            self.logged = (phase, percentage)
+            self.progressbar.log(f"{self.text}: {percentage}/100 ({phase})")
+
+    def _should_log(self, phase: str, percentage: int) -> bool:
+        if self.logged is None or self.logged[0] != phase:
+            return True
+        last = self.logged[1]
+        if percentage == 100:
+            return last != 100
+        return percentage // self.log_threshold > last // self.log_threshold
+
+    def flush(self) -> None:
+        state = self.state
+        if self.task is None or state is None or state is self.rendered:
+            return
+        self.rendered = state
+        phase, percentage = state
+        self.progressbar.progressbar.update(
+            task_id=self.task,
+            completed=float(percentage),
+            total=100.0,
+            message=f"({phase})",
+        )
+
+    def stop(self) -> None:
+        self.progressbar.remove(self)
+
+
+PROGRESS_RE = re.compile(rb"^(?:remote: )?([A-Za-z ]+):\s+(\d+)%")
+
+
+def parse_progress(line: bytes) -> tuple[str, int] | None:
+    result = PROGRESS_RE.match(line)
+    if not result:
+        return None
+    phase = result.group(1).decode("ascii").split(" ")[0].title()
+    return phase, int(result.group(2))
+
+
+SIZE_RE = re.compile(r"([\d.]+) (GiB|MiB|KiB|bytes?)")
+SIZE_UNITS = {"GiB": 1024**3, "MiB": 1024**2, "KiB": 1024}
+
+
+def parse_size(text: str) -> int | None:
+    result = SIZE_RE.search(text)
+    if not result:
+        return None
+    return int(float(result.group(1)) * SIZE_UNITS.get(result.group(2), 1))
+
+
+def split_progress_lines(buffer: bytes) -> tuple[list[bytes], bytes]:
+    lines = re.split(rb"[\r\n]", buffer)
+    return [line for line in lines[:-1] if line], lines[-1]
+
+
+class GitRichProgress:
+    max_name_length = 20
+    refresh_per_second = 10
+
+    def __init__(self, lock: RLock) -> None:
+        super().__init__()
+
+        self.lock = lock
+        self.tasks: list[GitRemoteProgress] = []
+        self.closed = Event()
+        self.renderer: Thread | None = None
+        self.overall: progress.TaskID | None = None
+        self.total = 0
+        self.completed = 0
+        self.finished_bytes = 0
+        self.started = time.monotonic()
+        self.progressbar = progress.Progress(
+            progress.SpinnerColumn(),
+            progress.TextColumn("{task.description}"),
+            progress.BarColumn(),
+            progress.TextColumn(
+                "[progress.percentage]{task.percentage:>3.0f}%"
+            ),
+            progress.TimeRemainingColumn(),
+            progress.TextColumn("[yellow]{task.fields[message]}[/]"),
+            refresh_per_second=self.refresh_per_second,
+        )
+        self.progressbar = self.progressbar.__enter__()
+        self.is_terminal = self.progressbar.console.is_terminal
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.closed.set()
+        renderer = self.renderer
+        if renderer is not None and renderer is not current_thread():
+            renderer.join()
+        try:
+            self.flush()
+            self.progressbar.__exit__(None, None, None)
+        except Exception:
+            pass
+
+    def _render(self) -> None:
+        while not self.closed.wait(1 / self.refresh_per_second):
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            for task in self.tasks:
+                task.flush()
+            self._flush_overall()
+
+    def _flush_overall(self) -> None:
+        if self.overall is None:
+            return
+        received = self.finished_bytes + sum(t.received for t in self.tasks)
+        rate = received / max(time.monotonic() - self.started, 1e-6)
+        self.progressbar.update(
+            task_id=self.overall,
+            description=(
+                f"[green](Total)[/] {self.completed}/{self.total}".ljust(
+                    GitRichProgress.max_name_length + 20
+                )
+            ),
+            completed=float(self.completed),
+            total=float(self.total),
+            message=f"{filesize.decimal(received)}"
+            f" {filesize.decimal(int(rate))}/s",
+        )
+
+    def add_total(self, count: int = 1) -> None:
+        with self.lock:
+            self.total += count
+            if self.overall is None and self.is_terminal:
+                self.overall = self.progressbar.add_task(
+                    description="", total=float(self.total), message=""
+                )
+            self._flush_overall()
+
+    def advance(self) -> None:
+        with self.lock:
+            self.completed += 1
+            self._flush_overall()
+
+    def remove(self, task: GitRemoteProgress) -> None:
+        with self.lock:
+            if task not in self.tasks:
+                return
+            self.tasks.remove(task)
+            self.finished_bytes += task.received
+            if task.task is not None:
+                self.progressbar.remove_task(task.task)
+
+    def task(self, name: str, desc: str) -> GitRemoteProgress:
+        with self.lock:
+            if self.is_terminal:
+                if len(name) > GitRichProgress.max_name_length - 3:
+                    idx = -1 * (GitRichProgress.max_name_length - 3)
+                    name = f"...{name[idx:]}"
+                name_format = "{0: <%s}" % GitRichProgress.max_name_length
+                name = name_format.format(name)
+                text = f"[yellow]({desc})[/] {name}"
+
+                task = self.progressbar.add_task(
+                    description=text,
+                    total=100.0,
+                    message="",
+                )
+                remote_progress = GitRemoteProgress(self, task, text)
+                self.tasks.append(remote_progress)
+                if self.renderer is None:
+                    self.renderer = Thread(target=self._render, daemon=True)
+                    self.renderer.start()
+                return remote_progress
+            else:
+                text = f"({desc}) {name}"
+                remote_progress = GitRemoteProgress(self, None, text)
+                self.tasks.append(remote_progress)
+                return remote_progress
+
+    def log(self, msg: str) -> None:
+        self.progressbar.print(msg, justify="left")
+
+
+__all__ = [
+    "GitRemoteProgress",
+    "GitRichProgress",
+    "parse_progress",
+    "parse_size",
+    "split_progress_lines",
+]
@@ -1,24 +1,64 @@
 import re
 from typing import Any
 
-from pydantic import ValidationError, root_validator
-
-from gitclone.config import BaseConfig
-from gitclone.exceptions import RepositoryFormatException
+from pydantic import ValidationError, root_validator, validator
+
+from gitclone.config import (
+    BaseConfig,
+    validate_clone_depth,
+    validate_clone_filter,
+    validate_submodule_jobs,
+)
+from gitclone.exceptions import CoreException, RepositoryFormatException
 from gitclone.utils import rpartition
 
 ssh_re = r"^([^@/]+@[^:]+):([^@]+)(?:@([^@]+))?$"
 oauth_re = r"^([a-z]+://[^@/]+@[^@/]+)/([^@]+)(?:@([^@]+))?$"
 normal_re = r"^([a-z]+://[^@/]+)/([^@]+)(?:@([^@]+))?$"
+option_re = r"^([a-z][a-z_-]*)=(.*)$"
+backref_re = r"\\[1-9]|\(\?P="
+repo_options = [
+    "group",
+    "depth",
+    "filter",
+    "single_branch",
+    "submodule_jobs",
+    "shallow_submodules",
+]
+
+
+def normalize_host(base_url: str) -> str:
+    host = base_url.partition("://")[2] or base_url
+    host = host.rpartition("@")[2]
+    host = host.split("/")[0].split(":")[0]
+    return host.lower()
 
 
 class RepoSpecification(BaseConfig):
     url: str = ""
     dest: str = ""
+    group: str | None = None
+    depth: int | None = None
+    filter: str | None = None
+    single_branch: bool | None = None
+    submodule_jobs: int | None = None
+    shallow_submodules: bool | None = None
+    size: int | None = None
+    pushed_at: str | None = None
 
     class Config:
         frozen = True
 
+    _validate_depth = validator("depth", allow_reuse=True)(
+        validate_clone_depth
+    )
+    _validate_filter = validator("filter", allow_reuse=True)(
+        validate_clone_filter
+    )
+    _validate_submodule_jobs = validator("submodule_jobs", allow_reuse=True)(
+        validate_submodule_jobs
+    )
+
     def matches(self, regex: str) -> bool:
         if self.url:
             if re.match(regex, self.url):
@@ -39,13 +79,27 @@ class RepoSpecification(BaseConfig):
 
     @classmethod
     def parse(cls, repostr: str) -> "RepoSpecification":
-        repostr = repostr.strip()
-        url, dest = rpartition(repostr, " ")
+        parts = repostr.split()
+        options: dict[str, str] = {}
+        while len(parts) > 1:
+            option = re.match(option_re, parts[-1])
+            if not option:
+                break
+            key = option.group(1).replace("-", "_")
+            if key not in repo_options:
+                raise RepositoryFormatException(
+                    f"[red]Got invalid repository option[/]"
+                    f" [yellow]'{parts[-1]}'[/]",
+                    repostr=repostr,
+                )
+            options[key] = option.group(2)
+            parts.pop()
+        url, dest = rpartition(" ".join(parts), " ")
         url = url.strip()
         dest = dest.strip()
 
         try:
-            return cls(url=url, dest=dest)
+            return cls(url=url, dest=dest, **options)
         except ValidationError as e:
             raise RepositoryFormatException(e, repostr=repostr)
 
@@ -97,4 +151,59 @@ class RepoSpecification(BaseConfig):
         return (baseurl, delimiter, path, fullurl, branch, dest)
 
 
-__all__ = ["RepoSpecification"]
+def compile_patterns(patterns: list[str]) -> list[re.Pattern[str]]:
+    compiled: list[re.Pattern[str]] = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as e:
+            raise CoreException(
+                f"[red]Got invalid repository pattern[/]"
+                f" [yellow]'{pattern}'[/]: {e}"
+            )
+    if len(compiled) < 2 or any(
+        p.flags & ~re.UNICODE or re.search(backref_re, p.pattern)
+        for p in compiled
+    ):
+        return compiled
+    try:
+        return [re.compile("|".join(f"(?:{p.pattern})" for p in compiled))]
+    except re.error:
+        return compiled
+
+
+class RepoFilter:
+    def __init__(
+        self, includes: list[str] = [], excludes: list[str] = []
+    ) -> None:
+        self.includes = compile_patterns(includes)
+        self.excludes = compile_patterns(excludes)
+
+    def _matches(self, patterns: list[re.Pattern[str]], value: str) -> bool:
+        return bool(value) and any(p.match(value) for p in patterns)
+
+    def matches(self, repo: RepoSpecification) -> bool:
+        if self.includes and not (
+            self._matches(self.includes, repo.url)
+            or self._matches(self.includes, repo.dest)
+        ):
+            return False
+        return not (
+            self._matches(self.excludes, repo.url)
+            or self._matches(self.excludes, repo.dest)
+        )
+
+    def filter(
+        self, repos: list[RepoSpecification]
+    ) -> list[RepoSpecification]:
+        if not self.includes and not self.excludes:
+            return repos
+        return [r for r in repos if self.matches(r)]
+
+
+__all__ = [
+    "RepoSpecification",
+    "RepoFilter",
+    "compile_patterns",
+    "normalize_host",
+]
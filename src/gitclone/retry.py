@@ -0,0 +1,45 @@
+import random
+import re
+from dataclasses import dataclass
+
+from git import GitCommandError
+
+RETRYABLE_RE = re.compile(
+    r"connection reset"
+    r"|connection timed out"
+    r"|operation timed out"
+    r"|connection refused"
+    r"|the requested url returned error: 5\d\d"
+    r"|http/2 stream \d+ was not closed cleanly"
+    r"|rpc failed"
+    r"|early eof"
+    r"|unexpected disconnect"
+    r"|remote end hung up unexpectedly"
+    r"|gnutls_handshake\(\) failed"
+    r"|ssl_read"
+    r"|temporary failure in name resolution"
+)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if not isinstance(exc, GitCommandError):
+        return False
+    return bool(RETRYABLE_RE.search(str(exc.stderr).lower()))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    jitter: float = 0.5
+
+    def should_retry(self, exc: BaseException, retries: int) -> bool:
+        return retries + 1 < self.attempts and is_retryable(exc)
+
+    def delay(self, retry: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2.0 ** (retry - 1))
+        return delay * random.uniform(1 - self.jitter, 1)
+
+
+__all__ = ["is_retryable", "RetryPolicy"]
@@ -0,0 +1,180 @@
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from multiprocessing.pool import ThreadPool
+from queue import Empty, Full, Queue
+from threading import Event, Lock
+from typing import IO, Generator, Iterator
+
+from gitclone.backends import git_env
+from gitclone.exceptions import GitOperationException
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    dest: str
+    path: str
+    line: int
+    text: str
+
+    def __str__(self) -> str:
+        return f"{os.path.join(self.dest, self.path)}:{self.line}:{self.text}"
+
+
+def grep_command(pattern: str, ignore_case: bool = False) -> list[str]:
+    cmd = ["git", "grep", "--null", "-n", "-I", "--no-color"]
+    if ignore_case:
+        cmd.append("-i")
+    return cmd + ["-e", pattern]
+
+
+def parse_grep_line(dest: str, line: bytes) -> SearchMatch | None:
+    parts = line.rstrip(b"\n").split(b"\0", 2)
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return SearchMatch(
+        dest=dest,
+        path=parts[0].decode("utf-8", "replace"),
+        line=int(parts[1]),
+        text=parts[2].decode("utf-8", "replace"),
+    )
+
+
+class Search:
+    def __init__(
+        self,
+        pattern: str,
+        max_workers: int = 8,
+        max_per_repo: int | None = None,
+        max_total: int | None = None,
+        ignore_case: bool = False,
+        queue_size: int = 1024,
+    ) -> None:
+        self.command = grep_command(pattern, ignore_case)
+        self.max_workers = max(1, max_workers)
+        self.max_per_repo = max_per_repo
+        self.max_total = max_total
+        self.queue_size = queue_size
+        self.lock = Lock()
+        self.processes: set[subprocess.Popen[bytes]] = set()
+        self.limited = False
+        self.errors: list[GitOperationException] = []
+
+    def _start(self, dest: str, stderr: IO[bytes]) -> subprocess.Popen[bytes]:
+        process = subprocess.Popen(
+            self.command,
+            cwd=dest,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            env=git_env(),
+        )
+        with self.lock:
+            self.processes.add(process)
+        return process
+
+    def _stop(self, process: subprocess.Popen[bytes]) -> None:
+        with self.lock:
+            self.processes.discard(process)
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    def grep(self, dest: str) -> Generator[SearchMatch, None, None]:
+        with tempfile.TemporaryFile() as stderr:
+            yield from self._grep(dest, stderr)
+
+    def _grep(
+        self, dest: str, stderr: IO[bytes]
+    ) -> Generator[SearchMatch, None, None]:
+        process = self._start(dest, stderr)
+        assert process.stdout is not None
+        count = 0
+        try:
+            for line in process.stdout:
+                match = parse_grep_line(dest, line)
+                if match is None:
+                    continue
+                yield match
+                count += 1
+                if self.max_per_repo and count >= self.max_per_repo:
+                    self.limited = True
+                    return
+            status = process.wait()
+            if status > 1:
+                stderr.seek(0)
+                error = stderr.read().decode("utf-8", "replace")
+                raise GitOperationException(
+                    f"Search in {dest} failed: {error.strip()}"
+                )
+        finally:
+            process.stdout.close()
+            self._stop(process)
+
+    def _put(self, results: Queue[object], item: object, stop: Event) -> None:
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    def _worker(self, dest: str, results: Queue[object], stop: Event) -> None:
+        try:
+            if stop.is_set() or not os.path.isdir(dest):
+                return
+            matches = self.grep(dest)
+            try:
+                for match in matches:
+                    self._put(results, match, stop)
+                    if stop.is_set():
+                        break
+            finally:
+                matches.close()
+        except GitOperationException as e:
+            with self.lock:
+                self.errors.append(e)
+        finally:
+            self._put(results, None, stop)
+
+    def _kill(self) -> None:
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+    def run(self, dests: list[str]) -> Iterator[SearchMatch]:
+        if not dests:
+            return
+        results: Queue[object] = Queue(self.queue_size)
+        stop = Event()
+        pending = len(dests)
+        found = 0
+        with ThreadPool(min(self.max_workers, len(dests))) as pool:
+            for dest in dests:
+                pool.apply_async(self._worker, (dest, results, stop))
+            try:
+                while pending:
+                    try:
+                        item = results.get(timeout=0.1)
+                    except Empty:
+                        continue
+                    if item is None:
+                        pending -= 1
+                        continue
+                    assert isinstance(item, SearchMatch)
+                    yield item
+                    found += 1
+                    if self.max_total and found >= self.max_total:
+                        self.limited = True
+                        break
+            finally:
+                stop.set()
+                self._kill()
+            pool.close()
+            pool.join()
+
+
+__all__ = ["SearchMatch", "grep_command", "parse_grep_line", "Search"]
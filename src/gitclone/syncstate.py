@@ -0,0 +1,69 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+
+
+@dataclass
+class RemoteState:
+    url: str
+    refs: dict[str, str] = field(default_factory=dict)
+    pushed_at: str | None = None
+
+
+class SyncState:
+    def __init__(self, path: str | None = None) -> None:
+        self.path = os.path.expanduser(path) if path else None
+        self.lock = Lock()
+        self.remotes: dict[str, RemoteState] = {}
+        self.changed = False
+        self.load()
+
+    def get(self, dest: str, url: str) -> RemoteState | None:
+        with self.lock:
+            state = self.remotes.get(os.path.abspath(dest))
+        if state is None or state.url != url:
+            return None
+        return state
+
+    def set(
+        self,
+        dest: str,
+        url: str,
+        refs: dict[str, str],
+        pushed_at: str | None = None,
+    ) -> None:
+        with self.lock:
+            self.remotes[os.path.abspath(dest)] = RemoteState(
+                url=url, refs=refs, pushed_at=pushed_at
+            )
+            self.changed = True
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.remotes = {
+                dest: RemoteState(**remote) for dest, remote in data.items()
+            }
+        except (OSError, ValueError, TypeError):
+            self.remotes = {}
+
+    def save(self) -> None:
+        if not self.path or not self.changed:
+            return
+        with self.lock:
+            data = {
+                dest: asdict(remote) for dest, remote in self.remotes.items()
+            }
+            self.changed = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+__all__ = ["RemoteState", "SyncState"]
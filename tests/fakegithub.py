@@ -0,0 +1,250 @@
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Generator
+from urllib.parse import parse_qs, urlsplit
+
+
+def fake_repo(
+    owner: str, name: str, fork: bool = False, size: int = 1
+) -> dict[str, Any]:
+    return {
+        "name": name,
+        "full_name": f"{owner}/{name}",
+        "owner": {"login": owner},
+        "fork": fork,
+        "size": size,
+        "pushed_at": "2022-01-01T00:00:00Z",
+        "default_branch": "master",
+    }
+
+
+def encode(data: Any) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    return json.dumps(data).encode("utf-8")
+
+
+class FakeGithub:
+    def __init__(self, login: str = "user", delay: float = 0.0) -> None:
+        self.login = login
+        self.delay = delay
+        self.repos: list[dict[str, Any]] = []
+        self.parents: dict[str, str] = {}
+        self.graphql_errors: list[str] = []
+        self.graphql_limited = 0
+        self.graphql_payloads: list[Any] = []
+        self.failures: list[int] = []
+        self.lock = threading.Lock()
+        self.requests: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.not_modified = 0
+        self.url = ""
+        self.clock: Callable[[], float] = time.time
+        self.rate_limit: int | None = None
+        self.rate_remaining = 0
+        self.rate_reset = 0.0
+        self.secondary: list[int] = []
+        self.limited = 0
+
+    def add(self, *repos: dict[str, Any]) -> None:
+        self.repos += repos
+
+    def rate_headers(self) -> dict[str, str]:
+        if self.rate_limit is None:
+            return {}
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.rate_remaining),
+            "X-RateLimit-Reset": str(int(self.rate_reset)),
+        }
+
+    def throttle(self) -> tuple[int, Any, dict[str, str]] | None:
+        if self.failures:
+            status = self.failures.pop(0)
+            return status, b"<html>Bad Gateway</html>", {}
+        if self.secondary:
+            self.limited += 1
+            message = "You have exceeded a secondary rate limit."
+            retry_after = str(self.secondary.pop(0))
+            return 403, {"message": message}, {"Retry-After": retry_after}
+        if self.rate_limit is None:
+            return None
+        now = self.clock()
+        if now >= self.rate_reset:
+            self.rate_remaining = self.rate_limit
+            self.rate_reset = now + 3600
+        if not self.rate_remaining:
+            self.limited += 1
+            message = "API rate limit exceeded."
+            return 403, {"message": message}, self.rate_headers()
+        self.rate_remaining -= 1
+        return None
+
+    def page(
+        self, query: dict[str, list[str]]
+    ) -> tuple[list[dict[str, Any]], int]:
+        per_page = int(query.get("per_page", ["30"])[0])
+        number = int(query.get("page", ["1"])[0])
+        start = (number - 1) * per_page
+        end = start + per_page
+        last = max(1, -(-len(self.repos) // per_page))
+        return self.repos[start:end], last
+
+    def node(self, repo: dict[str, Any]) -> dict[str, Any]:
+        parent = self.parents.get(repo["full_name"])
+        return {
+            "name": repo["name"],
+            "nameWithOwner": repo["full_name"],
+            "owner": {"login": repo["owner"]["login"]},
+            "isFork": repo["fork"],
+            "parent": {"nameWithOwner": parent} if parent else None,
+            "diskUsage": repo["size"],
+            "pushedAt": repo["pushed_at"],
+            "defaultBranchRef": {"name": repo["default_branch"]},
+        }
+
+    def graphql(
+        self, body: dict[str, Any], authorized: bool
+    ) -> tuple[int, Any, dict[str, str]]:
+        if not authorized:
+            return 401, {"message": "Requires authentication"}, {}
+        if self.graphql_payloads:
+            return 200, self.graphql_payloads.pop(0), {}
+        if self.graphql_limited:
+            self.graphql_limited -= 1
+            self.limited += 1
+            error = {"type": "RATE_LIMITED", "message": "API rate limit"}
+            return 200, {"data": None, "errors": [error]}, {}
+        if self.graphql_errors:
+            errors = [{"message": m} for m in self.graphql_errors]
+            return 200, {"data": None, "errors": errors}, {}
+        variables = body.get("variables") or {}
+        start = int(variables.get("cursor") or 0)
+        end = min(start + 100, len(self.repos))
+        nodes = [self.node(r) for r in self.repos[start:end]]
+        repositories = {
+            "pageInfo": {
+                "hasNextPage": end < len(self.repos),
+                "endCursor": str(end),
+            },
+            "nodes": nodes,
+        }
+        viewer = {"login": self.login, "repositories": repositories}
+        return 200, {"data": {"viewer": viewer}}, {}
+
+    def respond(
+        self, path: str, query: dict[str, list[str]]
+    ) -> tuple[int, Any, dict[str, str]]:
+        if path == "/user":
+            return 200, {"login": self.login}, {}
+        if path.startswith("/repos/"):
+            full_name = path.removeprefix("/repos/")
+            for repo in self.repos:
+                if repo["full_name"] == full_name:
+                    repo = dict(repo)
+                    if full_name in self.parents:
+                        owner, name = self.parents[full_name].split("/")
+                        repo["source"] = fake_repo(owner, name)
+                    return 200, repo, {}
+            return 404, {"message": "Not Found"}, {}
+        if path == "/user/repos" or path.startswith("/users/"):
+            data, last = self.page(query)
+            headers = {}
+            if last > 1:
+                params = {k: v[0] for k, v in query.items() if k != "page"}
+                base = (
+                    self.url
+                    + path
+                    + "?"
+                    + "&".join(f"{k}={v}" for k, v in params.items())
+                )
+                headers["Link"] = (
+                    f'<{base}&page=2>; rel="next",'
+                    f' <{base}&page={last}>; rel="last"'
+                )
+            return 200, data, headers
+        return 404, {"message": "Not Found"}, {}
+
+
+@contextmanager
+def fake_github(
+    fake: FakeGithub | None = None,
+) -> Generator[FakeGithub, None, None]:
+    github = fake or FakeGithub()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _handle(self, method: str) -> tuple[int, Any, dict[str, str]]:
+            url = urlsplit(self.path)
+            with github.lock:
+                github.requests.append(
+                    self.path if method == "GET" else f"{method} {url.path}"
+                )
+                github.active += 1
+                github.max_active = max(github.max_active, github.active)
+                limited = github.throttle()
+                rate_headers = github.rate_headers()
+            try:
+                time.sleep(github.delay)
+                if method == "POST":
+                    length = int(self.headers["Content-Length"] or 0)
+                    body = json.loads(self.rfile.read(length))
+                if limited:
+                    return limited
+                if method == "POST" and url.path == "/graphql":
+                    status, data, headers = github.graphql(
+                        body, bool(self.headers["Authorization"])
+                    )
+                else:
+                    status, data, headers = github.respond(
+                        url.path, parse_qs(url.query)
+                    )
+                return status, data, dict(headers, **rate_headers)
+            finally:
+                with github.lock:
+                    github.active -= 1
+
+        def _reply(
+            self, status: int, body: bytes, headers: dict[str, str]
+        ) -> None:
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            status, data, headers = self._handle("GET")
+            body = encode(data)
+            etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+            if status == 200 and self.headers["If-None-Match"] == etag:
+                with github.lock:
+                    github.not_modified += 1
+                status, body = 304, b""
+            self._reply(status, body, dict(headers, ETag=etag))
+
+        def do_POST(self) -> None:
+            status, data, headers = self._handle("POST")
+            self._reply(status, encode(data), headers)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    github.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield github
+    finally:
+        server.shutdown()
+        server.server_close()
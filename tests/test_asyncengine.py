@@ -0,0 +1,144 @@
+import asyncio
+import os
+from dataclasses import dataclass, field
+
+import pytest
+
+from gitclone.asyncengine import AsyncGitActionHandler
+from gitclone.core import GitcloneCore
+from gitclone.exceptions import GitOperationException
+from gitclone.gitcmds import GitRichProgress
+
+from .utils import bare_repo, coreconfig, write
+
+
+@dataclass
+class Tracker:
+    running: dict[str, int] = field(default_factory=dict)
+    max_running: dict[str, int] = field(default_factory=dict)
+    finished: list[str] = field(default_factory=list)
+    cancelled: list[str] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class FakeAsyncAction:
+    tracker: Tracker
+    server: str
+    name: str
+    fail: bool = False
+    connections: int = 1
+    delay: float = 0.01
+
+    def run(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        asyncio.run(self.arun(progress, verbose, dry_run))
+
+    async def arun(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        running = self.tracker.running.get(self.server, 0) + 1
+        self.tracker.running[self.server] = running
+        self.tracker.max_running[self.server] = max(
+            running, self.tracker.max_running.get(self.server, 0)
+        )
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.tracker.cancelled.append(self.name)
+            raise
+        finally:
+            self.tracker.running[self.server] -= 1
+        self.tracker.finished.append(self.name)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+
+    @property
+    def desc(self) -> str:
+        return "Fake"
+
+
+def test_async_handler_respects_connection_limits() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAsyncAction(tracker, server=f"server{i % 4}", name=f"a{i}")
+        for i in range(100)
+    ]
+    handler = AsyncGitActionHandler(
+        actions,  # type: ignore
+        max_connections_per_server=3,
+        max_connections_total=50,
+    )
+    asyncio.run(handler.run())
+    assert sorted(tracker.finished) == sorted(a.name for a in actions)
+    assert max(tracker.max_running.values()) == 3
+
+
+def test_async_handler_reports_errors() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAsyncAction(tracker, server="server", name="ok"),
+        FakeAsyncAction(tracker, server="server", name="broken", fail=True),
+    ]
+    with pytest.raises(GitOperationException) as e:
+        asyncio.run(AsyncGitActionHandler(actions).run())  # type: ignore
+    assert "broken failed" in str(e.value)
+
+
+def test_async_handler_waits_for_cancelled_actions() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAsyncAction(tracker, server="server", name=f"a{i}", delay=10)
+        for i in range(3)
+    ]
+    handler = AsyncGitActionHandler(actions)  # type: ignore
+
+    async def cancel() -> None:
+        task = asyncio.create_task(handler.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert sorted(tracker.cancelled) == ["a0", "a1", "a2"]
+        assert not handler.tasks
+
+    asyncio.run(cancel())
+
+
+def test_core_aclone_local_repos() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git", commits=2)
+        write(
+            f,
+            f"""
+            preflight:
+                enabled: false
+            repositories:
+                - {url} local
+                - {url} shallow depth=1
+                - {url}@missing branch
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        with pytest.raises(GitOperationException) as e:
+            asyncio.run(core.aclone())
+        assert f"Branch missing does not exist at {url}" in str(e.value)
+        assert os.path.exists(os.path.join("local", "README.md"))
+        assert os.path.exists(os.path.join("shallow", ".git", "shallow"))
+        assert not os.path.exists("branch")
+
+
+def test_core_aclone_all_remotes_missing() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(f, f"repositories:\n  - {url}-missing missing\n")
+        core = GitcloneCore(load_global=False)
+        with pytest.raises(GitOperationException) as e:
+            asyncio.run(core.aclone())
+        assert f"Repository {url}-missing does not exist" in str(e.value)
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sys
+from dataclasses import replace
+from threading import RLock
+
+import pytest
+
+from gitclone.backends import (
+    BACKENDS,
+    GitOutput,
+    GitPythonBackend,
+    run_git_async,
+)
+from gitclone.exceptions import GitOperationException
+from gitclone.gitcmds import GitCloneAction, classify_clone_error
+from gitclone.progress import (
+    GitRemoteProgress,
+    GitRichProgress,
+    parse_progress,
+)
+
+from .utils import bare_repo, tempdir
+
+
+class RecordingProgress(GitRemoteProgress):
+    def __init__(self) -> None:
+        progressbar = GitRichProgress(RLock())
+        progressbar.close()
+        super().__init__(progressbar, None, "test")
+        self.task = 0  # type: ignore
+        self.phases: list[tuple[str, int]] = []
+
+    def update_phase(self, phase: str, percentage: int) -> None:
+        self.phases.append((phase, percentage))
+
+
+def test_parse_progress() -> None:
+    assert parse_progress(b"Receiving objects:  45% (9/20)") == (
+        "Receiving",
+        45,
+    )
+    assert parse_progress(b"remote: Counting objects: 100% (3/3), done.") == (
+        "Counting",
+        100,
+    )
+    assert parse_progress(b"Cloning into 'dest'...") is None
+
+
+def test_git_output() -> None:
+    task = RecordingProgress()
+    output = GitOutput(task)
+    output.feed(b"Cloning into 'dest'...\nReceiving objects:  10% (1/10)\r")
+    output.feed(b"Receiving objects: 100% (10/10), done.\nfatal: broken")
+    assert task.phases == [("Receiving", 10), ("Receiving", 100)]
+    assert output.close() == "Cloning into 'dest'...\nfatal: broken"
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backend_clone(backend: str) -> None:
+    with tempdir():
+        url = bare_repo("remote.git", commits=2)
+        BACKENDS[backend].clone(
+            url=url,
+            dest=os.path.abspath("dest"),
+            branch="master",
+            options=["--depth=1"],
+            task=RecordingProgress(),
+        )
+        assert os.path.exists(os.path.join("dest", "README.md"))
+        assert os.path.exists(os.path.join("dest", ".git", "shallow"))
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("task", [True, False])
+def test_backend_clone_missing_branch(backend: str, task: bool) -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        progress = RecordingProgress() if task else None
+        with pytest.raises(Exception) as e:
+            BACKENDS[backend].clone(
+                url=url,
+                dest=os.path.abspath("dest"),
+                branch="missing",
+                options=[],
+                task=progress,
+            )
+        output = (
+            progress.error_lines + progress.other_lines if progress else []
+        )
+        error = classify_clone_error(e.value, url, "missing", output)
+        assert str(error) == f"Branch missing does not exist at {url}"
+
+
+def test_clone_action_backend() -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        action = GitCloneAction(
+            base_url="file://localhost",
+            delimiter="/",
+            remote_src=url,
+            full_url=url,
+            dest="dest",
+            backend="gitpython",
+        )
+        progress = GitRichProgress(RLock())
+        try:
+            action.run(progress)
+        finally:
+            progress.close()
+        assert os.path.exists(os.path.join("dest", "README.md"))
+
+
+def test_clone_action_async_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    class RecordingBackend(GitPythonBackend):
+        def clone(
+            self,
+            url: str,
+            dest: str,
+            branch: str | None,
+            options: list[str],
+            task: GitRemoteProgress | None,
+        ) -> None:
+            calls.append(dest)
+            super().clone(url, dest, branch, options, task)
+
+    monkeypatch.setitem(BACKENDS, "gitpython", RecordingBackend())
+    with tempdir():
+        url = bare_repo("remote.git")
+        action = GitCloneAction(
+            base_url="file://localhost",
+            delimiter="/",
+            remote_src=url,
+            full_url=url,
+            dest="dest",
+            backend="gitpython",
+        )
+        progress = GitRichProgress(RLock())
+        try:
+            asyncio.run(action.arun(progress))
+            with pytest.raises(GitOperationException):
+                asyncio.run(
+                    replace(action, dest="bad", backend="unknown").arun(
+                        progress
+                    )
+                )
+        finally:
+            progress.close()
+        assert calls == [os.path.abspath("dest")]
+        assert os.path.exists(os.path.join("dest", "README.md"))
+
+
+def test_subprocess_backend_reports_progress_without_terminal() -> None:
+    with tempdir():
+        url = bare_repo("remote.git", commits=2)
+        task = RecordingProgress()
+        task.task = None
+        BACKENDS["subprocess"].clone(
+            url=url,
+            dest=os.path.abspath("dest"),
+            branch=None,
+            options=[],
+            task=task,
+        )
+        assert ("Receiving", 100) in task.phases
+
+
+def test_run_git_async_kills_cancelled_process() -> None:
+    with tempdir():
+        script = (
+            "import os, time\n"
+            "open('pid', 'w').write(str(os.getpid()))\n"
+            "time.sleep(30)\n"
+        )
+
+        async def cancel() -> None:
+            task = asyncio.create_task(
+                run_git_async([sys.executable, "-c", script])
+            )
+            while not os.path.exists("pid") or not os.path.getsize("pid"):
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+        with open("pid") as f:
+            pid = int(f.read())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
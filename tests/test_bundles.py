@@ -0,0 +1,123 @@
+import os
+
+import pytest
+
+from gitclone.bundles import (
+    bundle_head,
+    bundle_name,
+    create_bundle,
+    seed_from_bundle,
+)
+from gitclone.core import GitcloneCore
+from gitclone.repositories import RepoSpecification
+
+from .utils import bare_repo, coreconfig, git, tempdir, write
+
+
+def push_change(remote: str, content: str) -> None:
+    work = f"{remote}.work"
+    with open(os.path.join(work, "README.md"), "w") as f:
+        f.write(content)
+    git("commit", "-q", "-am", "Change", cwd=work)
+    git("push", "-q", os.path.abspath(remote), "master", cwd=work)
+
+
+def test_bundle_name() -> None:
+    name = bundle_name("git@github.com:leahevy/gitclone.git")
+    assert name.startswith("gitclone-") and name.endswith(".bundle")
+    assert name == bundle_name("git@github.com:leahevy/gitclone.git")
+    assert name != bundle_name("https://github.com/leahevy/gitclone.git")
+
+
+def test_seed_from_bundle() -> None:
+    with tempdir():
+        url = bare_repo("remote.git", branches=["master", "dev"], commits=2)
+        git("clone", "-q", url, "source")
+        create_bundle("source", os.path.join("bundles", "remote.bundle"))
+        push_change("remote.git", "new\n")
+
+        seed_from_bundle(
+            os.path.abspath(os.path.join("bundles", "remote.bundle")),
+            url,
+            "seeded",
+            None,
+            [],
+        )
+        assert git("remote", "get-url", "origin", cwd="seeded").strip() == url
+        assert (
+            git("rev-parse", "--abbrev-ref", "@{u}", cwd="seeded").strip()
+            == "origin/master"
+        )
+        with open(os.path.join("seeded", "README.md")) as f:
+            assert f.read() == "new\n"
+        assert not git("for-each-ref", "refs/bundle/", cwd="seeded")
+        assert "origin/dev" in git("branch", "-r", cwd="seeded")
+
+
+def test_bundle_head() -> None:
+    with tempdir():
+        url = bare_repo("remote.git", branches=["master", "dev"])
+        git("clone", "-q", "--branch", "dev", url, "source")
+        create_bundle("source", "remote.bundle")
+        assert bundle_head("remote.bundle") == "dev"
+        git("branch", "copy", cwd="source")
+        create_bundle("source", "remote.bundle")
+        assert bundle_head("remote.bundle") is None
+
+
+def test_core_clone_from_bundle(capsys: pytest.CaptureFixture[str]) -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            bundle:
+                dir: bundles
+            repositories:
+                - {url} seeded
+                - {url}@master broken
+                - {url} shallow depth=1
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        core.clone(RepoSpecification.parse(f"{url} source"))
+        core.bundle(RepoSpecification.parse(f"{url} source"))
+        assert len(os.listdir("bundles")) == 1
+        with open(os.path.join("bundles", os.listdir("bundles")[0]), "w"):
+            pass
+        core.clone(RepoSpecification.parse(f"{url} broken"), verbose=True)
+        assert os.path.exists(os.path.join("broken", "README.md"))
+
+        core.bundle(RepoSpecification.parse(f"{url} source"))
+        push_change("remote.git", "new\n")
+        capsys.readouterr()
+        core.clone(RepoSpecification.parse(f"{url} seeded"), verbose=True)
+        assert "seeded from" in capsys.readouterr().out
+        assert "clone: from" not in git("reflog", cwd="seeded")
+        assert "clone: from" in git("reflog", cwd="broken")
+        with open(os.path.join("seeded", "README.md")) as r:
+            assert r.read() == "new\n"
+
+        capsys.readouterr()
+        core.clone(RepoSpecification.parse(f"{url} shallow depth=1"))
+        assert "seeded from" not in capsys.readouterr().out
+        assert os.path.exists(os.path.join("shallow", ".git", "shallow"))
+
+
+def test_core_bundle_shared_remote() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            bundle:
+                dir: bundles
+            repositories:
+                - {url} first
+                - {url} second
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        core.clone()
+        assert core.bundle() == [os.path.join("bundles", bundle_name(url))]
+        assert os.listdir("bundles") == [bundle_name(url)]
@@ -0,0 +1,86 @@
+import os
+
+from gitclone.check import (
+    CHECK_AHEAD,
+    CHECK_BEHIND,
+    CHECK_CLEAN,
+    CHECK_DIRTY,
+    CHECK_INVALID,
+    CHECK_MISSING,
+    CHECK_STALE,
+    Checker,
+    find_gitdir,
+    read_head,
+)
+from gitclone.core import GitcloneCore
+from gitclone.repositories import RepoSpecification
+from gitclone.syncstate import SyncState
+
+from .utils import bare_repo, coreconfig, git, tempdir, write
+
+
+def test_read_head_packed_refs() -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        git("clone", "-q", url, "local")
+        sha = git("rev-parse", "HEAD", cwd="local").strip()
+        git("pack-refs", "--all", cwd="local")
+        gitdir = find_gitdir("local")
+        assert gitdir is not None
+        assert not os.path.exists(
+            os.path.join(gitdir, "refs", "heads", "master")
+        )
+        assert read_head(gitdir) == ("master", sha)
+
+
+def test_checker_states() -> None:
+    with tempdir():
+        url = bare_repo("remote.git", commits=2)
+        for dest in ["clean", "dirty", "ahead", "behind", "stale"]:
+            git("clone", "-q", url, dest)
+        os.mkdir("invalid")
+        with open(os.path.join("dirty", "README.md"), "w") as f:
+            f.write("local change\n")
+        git("commit", "-q", "--allow-empty", "-m", "Local", cwd="ahead")
+        git("reset", "-q", "--hard", "HEAD~1", cwd="behind")
+
+        state = SyncState()
+        state.set("stale", url, {"refs/heads/master": "0" * 40})
+        checker = Checker(state=state, url_for={"stale": url})
+        results = checker.run(
+            ["clean", "dirty", "ahead", "behind", "stale", "invalid", "gone"]
+        )
+        assert [r.status for r in results] == [
+            CHECK_CLEAN,
+            CHECK_DIRTY,
+            CHECK_AHEAD,
+            CHECK_BEHIND,
+            CHECK_STALE,
+            CHECK_INVALID,
+            CHECK_MISSING,
+        ]
+        assert results[2].ahead == 1
+        assert results[3].behind == 1
+
+
+def test_core_check_uses_clone_destinations() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            dest: repos
+            check:
+                workers: 1
+            repositories:
+                - {url} local
+                - {url} missing
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        core.clone(RepoSpecification.parse(f"{url} local"))
+        results = core.check(as_json=True)
+        assert [(r.dest, r.status) for r in results] == [
+            (os.path.join("repos", "local"), CHECK_CLEAN),
+            (os.path.join("repos", "missing"), CHECK_MISSING),
+        ]
@@ -7,7 +7,7 @@ from typer.testing import CliRunner
 
 from gitclone.cli import cli, main
 
-from .utils import coreconfig, write
+from .utils import bare_repo, coreconfig, write
 
 runner = CliRunner()
 
@@ -51,7 +51,7 @@ def test_cli_clone_and_pull() -> None:
             """,
         )
         result = runner.invoke(cli, ["pull"])
-        assert result.exit_code != 0  # TODO: Not implemented
+        assert result.exit_code == 0
 
         assert os.path.exists(os.path.join("gitclone", ".git"))
         assert os.path.exists(os.path.join("gitclone2", ".git"))
@@ -75,3 +75,20 @@ def test_cli_main_clone() -> None:
 
         assert os.path.exists(os.path.join("gitclone", ".git"))
         assert os.path.exists(os.path.join("gitclone2", ".git"))
+
+
+def test_cli_clone_all_remotes_missing() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            repositories:
+                - {url}-missing missing
+                - {url}-gone gone
+            """,
+        )
+        result = runner.invoke(cli, ["clone"])
+        assert result.exit_code != 0
+        assert not os.path.exists("missing")
+        assert not os.path.exists("gone")
@@ -0,0 +1,73 @@
+from gitclone.concurrency import ConcurrencyController
+from gitclone.config import Config
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_controller_static_limits() -> None:
+    controller = ConcurrencyController(
+        max_per_host=3, max_total=10, hosts={"Slow.example.com": 1}
+    )
+    assert controller.limit("github.com") == 3
+    assert controller.limit("slow.example.com") == 1
+    controller.failure("github.com")
+    assert controller.limit("github.com") == 3
+
+
+def test_controller_increases_while_throughput_improves() -> None:
+    clock = FakeClock()
+    controller = ConcurrencyController(
+        max_per_host=4, adaptive=True, initial=1, clock=clock
+    )
+    assert controller.limit("host") == 1
+    clock.now = 1.0
+    controller.success("host")
+    assert controller.limit("host") == 2
+    clock.now = 2.0
+    controller.success("host")
+    controller.success("host")
+    assert controller.limit("host") == 3
+    clock.now = 4.0
+    for _ in range(3):
+        controller.success("host")
+    assert controller.limit("host") == 3
+    clock.now = 5.0
+    for _ in range(3):
+        controller.success("host")
+    assert controller.limit("host") == 4
+    clock.now = 5.5
+    for _ in range(4):
+        controller.success("host")
+    assert controller.limit("host") == 4
+
+
+def test_controller_backs_off_on_failure() -> None:
+    controller = ConcurrencyController(
+        max_per_host=8, adaptive=True, initial=8
+    )
+    controller.failure("host")
+    assert controller.limit("host") == 4
+    controller.failure("host")
+    controller.failure("host")
+    controller.failure("host")
+    assert controller.limit("host") == 1
+
+
+def test_connections_config() -> None:
+    config = Config.parse_raw(  # type: ignore
+        """
+        connections:
+            total: 16
+            hosts:
+                GitHub.com: 12
+        """
+    )
+    assert config.connections.total == 16
+    assert config.connections.per_host == 5
+    assert config.connections.hosts == {"github.com": 12}
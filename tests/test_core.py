@@ -1,9 +1,13 @@
 import os
 import os.path
 
+import pytest
+
 from gitclone.core import GitcloneCore
+from gitclone.exceptions import GitOperationException
+from gitclone.repositories import RepoSpecification
 
-from .utils import coreconfig, write
+from .utils import bare_repo, coreconfig, git, write
 
 
 def clone() -> None:
@@ -109,3 +113,173 @@ def test_core_main_invalid_url() -> None:
         except Exception:
             pass
         assert not os.path.exists("test")
+
+
+def test_core_local_repos() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            repositories:
+                - {url} local
+                - {url}@master local-branch
+            """,
+        )
+        clone()
+        assert os.path.exists(os.path.join("local", "README.md"))
+        assert os.path.exists(os.path.join("local-branch", "README.md"))
+
+
+def test_core_local_missing_without_preflight() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            preflight:
+                enabled: false
+            repositories:
+                - {url}@missing branch
+                - {url}-missing repo
+            """,
+        )
+        with pytest.raises(GitOperationException) as e:
+            clone()
+        assert f"Branch missing does not exist at {url}" in str(e.value)
+        assert f"Repository {url}-missing does not exist" in str(e.value)
+        assert not os.path.exists("branch")
+        assert not os.path.exists("repo")
+
+
+def test_core_local_shared_objects() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            repositories:
+                - {url} upstream group=remote
+                - {url} fork1 group=remote
+                - {url} fork2 group=remote
+            """,
+        )
+        clone()
+        alternates = os.path.join(".git", "objects", "info", "alternates")
+        assert not os.path.exists(os.path.join("upstream", alternates))
+        for fork in ["fork1", "fork2"]:
+            assert os.path.exists(os.path.join(fork, "README.md"))
+            with open(os.path.join(fork, alternates)) as alt:
+                assert os.path.abspath("upstream") in alt.read()
+
+
+def test_core_local_shallow() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git", branches=["master", "dev"], commits=3)
+        write(
+            f,
+            f"""
+            clone:
+                depth: 1
+            repositories:
+                - {url} shallow
+                - {url} full depth=100 single-branch=false
+            """,
+        )
+        clone()
+        assert os.path.exists(os.path.join("shallow", ".git", "shallow"))
+        assert not os.path.exists(os.path.join("full", ".git", "shallow"))
+        log = git("log", "--oneline", cwd="shallow")
+        assert len(log.splitlines()) == 1
+
+
+def test_core_local_pull() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            repositories:
+                - {url} clean
+                - {url} dirty
+                - {url} diverged
+                - {url} uncloned
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        core.clone(
+            *[
+                RepoSpecification.parse(f"{url} {dest}")
+                for dest in ["clean", "dirty", "diverged"]
+            ]
+        )
+
+        with open(os.path.join("remote.git.work", "README.md"), "w") as w:
+            w.write("remote change\n")
+        git("commit", "-q", "-am", "Remote", cwd="remote.git.work")
+        remote = os.path.abspath("remote.git")
+        git("push", "-q", remote, "master", cwd="remote.git.work")
+        with open(os.path.join("dirty", "README.md"), "w") as w:
+            w.write("local change\n")
+        with open(os.path.join("diverged", "LOCAL.md"), "w") as w:
+            w.write("local commit\n")
+        git("add", "LOCAL.md", cwd="diverged")
+        git("commit", "-q", "-m", "Local", cwd="diverged")
+
+        summary = core.do_pull(core.do_resolve_repositories([], core.config))
+        assert summary.counts == {
+            "updated": 1,
+            "unchanged": 0,
+            "diverged": 1,
+            "dirty": 1,
+            "detached": 0,
+        }
+        with open(os.path.join("clean", "README.md")) as r:
+            assert r.read() == "remote change\n"
+        with open(os.path.join("dirty", "README.md")) as r:
+            assert r.read() == "local change\n"
+        assert not os.path.exists("uncloned")
+
+        summary = core.do_pull(
+            core.do_resolve_repositories([], core.config), dry_run=True
+        )
+        assert summary.counts["unchanged"] == 1
+
+
+def test_core_local_pull_sync_state() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            sync:
+                state: sync.json
+            repositories:
+                - {url} local
+                - {url} pushed
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        clone()
+        local, pushed = core.do_resolve_repositories([], core.config)
+        repos = [
+            local,
+            pushed.copy(update={"pushed_at": "2022-01-01T00:00:00"}),
+        ]
+
+        summary = core.do_pull(repos)
+        assert summary.skipped_fetches == 0
+        summary = core.do_pull(repos)
+        assert summary.skipped_fetches == 2
+
+        with open(os.path.join("remote.git.work", "README.md"), "w") as w:
+            w.write("remote change\n")
+        git("commit", "-q", "-am", "Remote", cwd="remote.git.work")
+        remote = os.path.abspath("remote.git")
+        git("push", "-q", remote, "master", cwd="remote.git.work")
+
+        summary = core.do_pull(repos)
+        assert summary.skipped_fetches == 1
+        assert summary.counts["updated"] == 1
+        with open(os.path.join("local", "README.md")) as r:
+            assert r.read() == "remote change\n"
@@ -0,0 +1,57 @@
+import os
+
+from gitclone.core import GitcloneCore
+from gitclone.discovery import DirectoryIndex, Discovery
+
+from .utils import bare_repo, coreconfig, git, tempdir, write
+
+
+def test_discovery_prunes_and_ignores() -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        git("clone", "-q", url, os.path.join("work", "a"))
+        git("clone", "-q", url, os.path.join("work", "group", "b"))
+        git("init", "-q", os.path.join("work", "a", "nested"))
+        git("init", "-q", os.path.join("work", "node_modules", "dep"))
+        git("init", "-q", os.path.join("work", "build", "out"))
+
+        discovery = Discovery(ignore=["node_modules", "build/*"])
+        assert discovery.run("work") == [
+            os.path.abspath(os.path.join("work", "a")),
+            os.path.abspath(os.path.join("work", "group", "b")),
+        ]
+
+
+def test_discovery_index_skips_unchanged() -> None:
+    with tempdir():
+        os.makedirs(os.path.join("work", "x", "y", "z"))
+        git("init", "-q", os.path.join("work", "x", "repo"))
+
+        index = DirectoryIndex("index.json")
+        discovery = Discovery(index=index)
+        assert len(discovery.run("work")) == 1
+        assert discovery.scanned == 5
+
+        discovery = Discovery(index=DirectoryIndex("index.json"))
+        assert len(discovery.run("work")) == 1
+        assert discovery.scanned == 0
+
+        git("init", "-q", os.path.join("work", "x", "y", "other"))
+        discovery = Discovery(index=DirectoryIndex("index.json"))
+        assert len(discovery.run("work")) == 2
+        assert discovery.scanned == 2
+
+
+def test_core_find_repositories() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            """
+            dest: repos
+            """,
+        )
+        git("clone", "-q", url, os.path.join("repos", "local"))
+        git("init", "-q", os.path.join("repos", "no-remote"))
+        repos = GitcloneCore(load_global=False).find("repos")
+        assert [str(r) for r in repos] == [f"{url} local"]
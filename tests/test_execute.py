@@ -0,0 +1,61 @@
+import io
+import os
+import sys
+
+from gitclone.core import GitcloneCore
+from gitclone.execute import Executor
+
+from .utils import coreconfig, tempdir, write
+
+SCRIPT = "import os, sys; print(os.path.basename(os.getcwd())); sys.exit({})"
+
+
+def test_executor_buffered() -> None:
+    with tempdir():
+        os.mkdir("a")
+        os.mkdir("b")
+        out = io.StringIO()
+        executor = Executor(
+            [sys.executable, "-c", SCRIPT.format(0)],
+            out=out,
+        )
+        results = executor.run(["a", "b", "missing"])
+        assert [r.returncode for r in results] == [0, 0, None]
+        assert [r.output for r in results] == ["a\n", "b\n", ""]
+        assert "==> a (exit 0)\na\n" in out.getvalue()
+        assert "==> b (exit 0)\nb\n" in out.getvalue()
+
+
+def test_executor_stream() -> None:
+    with tempdir():
+        os.mkdir("a")
+        out = io.StringIO()
+        executor = Executor(
+            [sys.executable, "-c", SCRIPT.format(3)], stream=True, out=out
+        )
+        results = executor.run(["a"])
+        assert results[0].returncode == 3
+        assert out.getvalue() == "a: a\n"
+
+
+def test_core_exec_filters() -> None:
+    with coreconfig() as f:
+        write(
+            f,
+            """
+            repositories:
+                - https://github.com/leahevy/gitclone.git api-one
+                - https://github.com/leahevy/gitclone.git api-two
+                - https://github.com/leahevy/gitclone.git web
+            """,
+        )
+        for dest in ["api-one", "api-two", "web"]:
+            os.mkdir(dest)
+        results = GitcloneCore(load_global=False).exec(
+            [sys.executable, "-c", SCRIPT.format(0)],
+            filters=["api-"],
+        )
+        assert [os.path.basename(r.dest) for r in results] == [
+            "api-one",
+            "api-two",
+        ]
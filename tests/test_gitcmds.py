@@ -0,0 +1,267 @@
+import time
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+
+import pytest
+from git import GitCommandError
+
+from gitclone.concurrency import ConcurrencyController
+from gitclone.exceptions import GitOperationException
+from gitclone.gitcmds import (
+    GitActionMultiprocessingHandler,
+    GitCloneAction,
+    GitRichProgress,
+)
+from gitclone.retry import RetryPolicy
+
+
+@dataclass
+class Tracker:
+    lock: Lock = field(default_factory=Lock)
+    running: dict[str, int] = field(default_factory=dict)
+    max_running: dict[str, int] = field(default_factory=dict)
+    finished: list[str] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class FakeAction:
+    tracker: Tracker
+    server: str
+    name: str
+    duration: float = 0.01
+    fail: bool = False
+    connections: int = 1
+
+    def run(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        with self.tracker.lock:
+            running = self.tracker.running.get(self.server, 0) + 1
+            self.tracker.running[self.server] = running
+            self.tracker.max_running[self.server] = max(
+                running, self.tracker.max_running.get(self.server, 0)
+            )
+        time.sleep(self.duration)
+        with self.tracker.lock:
+            self.tracker.running[self.server] -= 1
+            self.tracker.finished.append(self.name)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+
+    @property
+    def desc(self) -> str:
+        return "Fake"
+
+
+def test_handler_respects_connection_limits() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAction(tracker, server=f"server{i % 3}", name=f"a{i}")
+        for i in range(30)
+    ]
+    GitActionMultiprocessingHandler(
+        actions,  # type: ignore
+        max_connections_per_server=2,
+        max_connections_total=4,
+    ).run()
+    assert sorted(tracker.finished) == sorted(a.name for a in actions)
+    assert all(m <= 2 for m in tracker.max_running.values())
+
+
+def test_handler_counts_submodule_connections() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAction(tracker, server="server", name=f"a{i}", connections=3)
+        for i in range(4)
+    ] + [FakeAction(tracker, server="server", name="big", connections=10)]
+    GitActionMultiprocessingHandler(
+        actions,  # type: ignore
+        max_connections_per_server=4,
+        max_connections_total=8,
+    ).run()
+    assert sorted(tracker.finished) == sorted(a.name for a in actions)
+    assert tracker.max_running["server"] == 1
+
+
+def test_handler_reports_errors() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAction(tracker, server="server", name="ok"),
+        FakeAction(tracker, server="server", name="broken", fail=True),
+    ]
+    with pytest.raises(GitOperationException) as e:
+        GitActionMultiprocessingHandler(actions).run()  # type: ignore
+    assert "broken failed" in str(e.value)
+    assert sorted(tracker.finished) == ["broken", "ok"]
+
+
+def test_handler_starts_next_action_without_delay() -> None:
+    tracker = Tracker()
+    actions = [
+        FakeAction(tracker, server="server", name=f"a{i}", duration=0.0)
+        for i in range(50)
+    ]
+    start = time.perf_counter()
+    GitActionMultiprocessingHandler(
+        actions, max_connections_total=1  # type: ignore
+    ).run()
+    assert time.perf_counter() - start < 2.0
+    assert tracker.finished == [a.name for a in actions]
+
+
+def test_handler_runs_dependent_actions_after_prerequisite() -> None:
+    tracker = Tracker()
+    source = FakeAction(tracker, server="server", name="source", duration=0.1)
+    dependents = [
+        FakeAction(tracker, server="server", name=f"fork{i}", duration=0.0)
+        for i in range(3)
+    ]
+    handler = GitActionMultiprocessingHandler(
+        max_connections_per_server=5, max_connections_total=5
+    )
+    handler.add_action(source)  # type: ignore
+    for dependent in dependents:
+        handler.add_action(dependent, after=source)  # type: ignore
+    handler.run()
+    assert tracker.finished[0] == "source"
+    assert sorted(tracker.finished[1:]) == ["fork0", "fork1", "fork2"]
+
+
+def test_handler_accepts_actions_while_running() -> None:
+    tracker = Tracker()
+    handler = GitActionMultiprocessingHandler()
+    first = FakeAction(tracker, server="server", name="first")
+    second = FakeAction(tracker, server="server", name="second")
+
+    def feed() -> None:
+        with handler.feed():
+            handler.add_action(first)  # type: ignore
+            deadline = time.monotonic() + 5
+            while not tracker.finished and time.monotonic() < deadline:
+                time.sleep(0.01)
+            handler.add_action(second)  # type: ignore
+
+    feeder = Thread(target=feed)
+    feeder.start()
+    handler.run()
+    feeder.join()
+    assert tracker.finished == ["first", "second"]
+
+
+def test_clone_action_options() -> None:
+    action = GitCloneAction(
+        base_url="https://github.com",
+        delimiter="/",
+        remote_src="leahevy/gitclone.git",
+        full_url="https://github.com/leahevy/gitclone.git",
+        dest="gitclone",
+        depth=1,
+        filter="blob:none",
+        single_branch=True,
+        submodule_jobs=8,
+        shallow_submodules=True,
+        size=10240,
+    )
+    assert action.clone_options == [
+        "--recurse-submodules",
+        "--jobs=8",
+        "--shallow-submodules",
+        "--depth=1",
+        "--filter=blob:none",
+        "--single-branch",
+    ]
+    assert action.connections == 8
+    assert 0.0 < action.estimated_savings < 1.0
+    assert "MB instead of 10.0 MB" in action.savings_info
+
+
+@dataclass(eq=False)
+class FlakyAction(FakeAction):
+    failures: int = 0
+    error: str = "fatal: unable to access: Connection reset by peer"
+    attempts: int = 0
+
+    def run(
+        self,
+        progress: GitRichProgress,
+        verbose: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise GitCommandError(["git", "clone"], 128, self.error)
+        super().run(progress, verbose, dry_run)
+
+
+def test_handler_retries_transient_errors() -> None:
+    tracker = Tracker()
+    flaky = FlakyAction(tracker, server="server", name="flaky", failures=2)
+    ok = FakeAction(tracker, server="server", name="ok")
+    handler = GitActionMultiprocessingHandler(
+        [flaky, ok],  # type: ignore
+        retry=RetryPolicy(attempts=3, backoff=0.01),
+    )
+    handler.run()
+    assert flaky.attempts == 3
+    assert sorted(tracker.finished) == ["flaky", "ok"]
+
+
+def test_handler_reports_retries_on_failure() -> None:
+    tracker = Tracker()
+    flaky = FlakyAction(tracker, server="server", name="flaky", failures=5)
+    fatal = FlakyAction(
+        tracker,
+        server="server",
+        name="fatal",
+        failures=5,
+        error="fatal: repository 'x' not found",
+    )
+    with pytest.raises(GitOperationException) as e:
+        GitActionMultiprocessingHandler(
+            [flaky, fatal],  # type: ignore
+            retry=RetryPolicy(attempts=2, backoff=0.01),
+        ).run()
+    assert flaky.attempts == 2
+    assert fatal.attempts == 1
+    assert "flaky -> " in str(e.value)
+    assert "(after 1 retries)" in str(e.value)
+
+
+def test_handler_backs_off_only_on_network_errors() -> None:
+    tracker = Tracker()
+    controller = ConcurrencyController(
+        max_per_host=4, adaptive=True, initial=4
+    )
+    fatal = FlakyAction(
+        tracker,
+        server="server",
+        name="fatal",
+        failures=1,
+        error="fatal: repository 'x' not found",
+    )
+    with pytest.raises(GitOperationException):
+        GitActionMultiprocessingHandler(
+            [fatal], controller=controller  # type: ignore
+        ).run()
+    assert controller.limit("server") == 4
+    flaky = FlakyAction(tracker, server="server", name="flaky", failures=1)
+    GitActionMultiprocessingHandler(
+        [flaky],  # type: ignore
+        controller=controller,
+        retry=RetryPolicy(attempts=2, backoff=0.01),
+    ).run()
+    assert controller.limit("server") == 2
+
+
+def test_retry_policy() -> None:
+    policy = RetryPolicy(attempts=3, backoff=1.0, max_backoff=3.0)
+    error = GitCommandError(["git"], 128, "error: RPC failed; curl 56")
+    assert policy.should_retry(error, 0)
+    assert policy.should_retry(error, 1)
+    assert not policy.should_retry(error, 2)
+    assert not policy.should_retry(RuntimeError("boom"), 0)
+    assert 0.5 <= policy.delay(1) <= 1.0
+    assert 1.5 <= policy.delay(5) <= 3.0
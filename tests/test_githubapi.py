@@ -0,0 +1,414 @@
+import os
+import time
+from threading import Lock, Thread
+from typing import Iterator
+
+import pytest
+from pydantic import ValidationError
+
+from gitclone.config import GithubAutofetchConfig
+from gitclone.core import GitcloneCore
+from gitclone.exceptions import GitOperationException
+from gitclone.gitcmds import GitActionMultiprocessingHandler
+from gitclone.githubapi import (
+    GithubApiException,
+    GithubClient,
+    RateBudget,
+    ResponseCache,
+    parse_links,
+    rate_limit_delay,
+)
+from gitclone.repositories import RepoSpecification
+
+from .fakegithub import FakeGithub, fake_github, fake_repo
+from .utils import bare_repo, coreconfig, tempdir, write
+
+
+def test_parse_links() -> None:
+    links = parse_links(
+        '<https://api.github.com/user/repos?page=2>; rel="next", '
+        '<https://api.github.com/user/repos?page=5>; rel="last"'
+    )
+    assert links == {
+        "next": "https://api.github.com/user/repos?page=2",
+        "last": "https://api.github.com/user/repos?page=5",
+    }
+
+
+def test_client_fetches_pages_concurrently() -> None:
+    with fake_github(FakeGithub(delay=0.1)) as github:
+        github.add(*[fake_repo("user", f"repo{i}") for i in range(450)])
+        client = GithubClient(api_url=github.url)
+        pages = list(client.repositories("/users/user/repos", {}, 4))
+        assert [len(page) for page in pages] == [100, 100, 100, 100, 50]
+        assert pages[4][-1].full_name == "user/repo449"
+        assert len(github.requests) == 5
+        assert github.max_active == 4
+
+
+def test_client_error_status() -> None:
+    with fake_github() as github:
+        client = GithubClient(api_url=github.url)
+        with pytest.raises(GithubApiException):
+            client.repository("user/missing")
+
+
+def test_core_resolve_autofetch() -> None:
+    with fake_github() as github:
+        github.add(
+            fake_repo("user", "project"),
+            fake_repo("user", "fork", fork=True),
+            fake_repo("user", "other"),
+        )
+        github.parents["user/fork"] = "upstream/fork"
+        config = GithubAutofetchConfig(
+            user="user",
+            api_url=github.url,
+            share_objects=True,
+            excludes=["other"],
+        )
+        repos = GitcloneCore(load_global=False).do_resolve_github(config)
+        assert [(r.url, r.dest, r.group) for r in repos] == [
+            ("https://github.com/user/project.git", "project", "user/project"),
+            ("https://github.com/user/fork.git", "fork", "upstream/fork"),
+        ]
+        assert "/repos/user/fork" in github.requests
+
+
+def test_client_revalidates_cached_pages() -> None:
+    with tempdir(), fake_github() as github:
+        github.add(*[fake_repo("user", f"repo{i}") for i in range(150)])
+
+        def names() -> list[str]:
+            client = GithubClient(
+                api_url=github.url, cache=ResponseCache("cache")
+            )
+            pages = client.repositories("/users/user/repos")
+            return [repo.name for page in pages for repo in page]
+
+        first = names()
+        assert github.not_modified == 0
+        assert names() == first
+        assert github.not_modified == 2
+
+        github.add(fake_repo("user", "new"))
+        assert names() == first + ["new"]
+        assert github.not_modified == 3
+
+
+def test_client_cache_is_keyed_by_credentials() -> None:
+    with tempdir(), fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        for token in [None, "a", "b", "a"]:
+            client = GithubClient(
+                token=token, api_url=github.url, cache=ResponseCache("cache")
+            )
+            client.repository("user/project")
+        assert github.not_modified == 1
+
+
+def test_core_resolve_autofetch_from_cache() -> None:
+    with tempdir(), fake_github() as github:
+        github.add(fake_repo("user", "project"), fake_repo("user", "other"))
+        config = GithubAutofetchConfig(
+            user="user", api_url=github.url, cache="cache"
+        )
+        core = GitcloneCore(load_global=False)
+        first = core.do_resolve_github(config)
+        assert core.do_resolve_github(config) == first
+        assert github.not_modified == 1
+
+
+def test_core_clone_streams_autofetch_pages() -> None:
+    with fake_github() as github, coreconfig() as f:
+        github.add(*[fake_repo("user", f"repo{i}") for i in range(150)])
+        for i in range(150):
+            os.makedirs(os.path.join("github", f"repo{i}"))
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            preflight:
+                enabled: false
+            autofetch:
+                -
+                    github:
+                        user: user
+                        api_url: {github.url}
+                        path: github/{{repo}}
+            repositories:
+                - {url} local
+            """,
+        )
+        GitcloneCore(load_global=False).clone()
+        assert os.path.exists(os.path.join("local", ".git"))
+        assert len(github.requests) == 2
+
+
+def test_client_graphql_pages() -> None:
+    with fake_github() as github:
+        github.add(*[fake_repo("user", f"repo{i}") for i in range(150)])
+        github.add(fake_repo("user", "fork", fork=True, size=42))
+        github.parents["user/fork"] = "upstream/fork"
+        client = GithubClient(token="token", api_url=github.url)
+        pages = list(client.graphql_repositories())
+        assert [(login, len(page)) for login, page in pages] == [
+            ("user", 100),
+            ("user", 51),
+        ]
+        fork = pages[1][1][-1]
+        assert (fork.full_name, fork.fork, fork.parent, fork.size) == (
+            "user/fork",
+            True,
+            "upstream/fork",
+            42,
+        )
+        assert fork.default_branch == "master"
+        assert github.requests == ["POST /graphql", "POST /graphql"]
+
+
+def test_client_graphql_errors() -> None:
+    with fake_github() as github:
+        with pytest.raises(GithubApiException, match="status 401"):
+            list(GithubClient(api_url=github.url).graphql_repositories())
+        github.graphql_errors = ["Something went wrong"]
+        client = GithubClient(token="token", api_url=github.url)
+        with pytest.raises(GithubApiException, match="Something went wrong"):
+            list(client.graphql_repositories())
+        github.graphql_errors = []
+        github.graphql_payloads = [b"", [], {"data": None}]
+        for _ in range(3):
+            with pytest.raises(GithubApiException, match="malformed"):
+                list(client.graphql_repositories())
+
+
+def test_core_resolve_autofetch_graphql() -> None:
+    with fake_github() as github:
+        github.add(
+            fake_repo("user", "project"), fake_repo("user", "fork", fork=True)
+        )
+        github.parents["user/fork"] = "upstream/fork"
+        config = GithubAutofetchConfig(
+            user="user",
+            token="token",
+            api="graphql",
+            api_url=github.url,
+            path="{user}/{repo}",
+            share_objects=True,
+        )
+        repos = GitcloneCore(load_global=False).do_resolve_github(config)
+        assert [(r.dest, r.group, r.size) for r in repos] == [
+            ("user/project", "user/project", 1),
+            ("user/fork", "upstream/fork", 1),
+        ]
+        assert github.requests == ["POST /graphql"]
+
+
+def test_config_graphql_requires_token() -> None:
+    with pytest.raises(ValidationError):
+        GithubAutofetchConfig(user="user", api="graphql")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.lock = Lock()
+
+    def __call__(self) -> float:
+        with self.lock:
+            return self.now
+
+    def sleep(self, delay: float) -> None:
+        with self.lock:
+            self.now += delay
+
+
+def rate_limited_client(
+    github: FakeGithub, max_wait: float = 7200.0
+) -> tuple[GithubClient, FakeClock]:
+    clock = FakeClock()
+    github.clock = clock
+    budget = RateBudget(max_wait=max_wait, clock=clock, sleep=clock.sleep)
+    return GithubClient(api_url=github.url, budget=budget), clock
+
+
+def test_client_paces_requests_within_rate_limit() -> None:
+    with fake_github() as github:
+        github.add(*[fake_repo("user", f"repo{i}") for i in range(450)])
+        github.rate_limit = 3
+        client, clock = rate_limited_client(github)
+        pages = list(client.repositories("/users/user/repos", {}, 4))
+        assert sum(len(page) for page in pages) == 450
+        assert github.limited == 0
+        assert clock.now >= 1000.0 + 3600
+        assert client.budget.requests == 5
+        assert "5 requests" in str(client.budget)
+
+
+def test_client_waits_for_rate_limit_reset() -> None:
+    with fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        github.rate_limit = 5
+        client, clock = rate_limited_client(github)
+        github.rate_reset = clock.now + 100
+        assert client.repository("user/project").name == "project"
+        assert github.limited == 1
+        assert client.budget.waited == 100
+        assert client.budget.remaining == 4
+
+
+def test_client_honors_retry_after() -> None:
+    with fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        github.secondary = [7, 3]
+        client, clock = rate_limited_client(github)
+        assert client.repository("user/project").name == "project"
+        assert client.budget.limited == 2
+        assert client.budget.waited == 10
+
+
+def test_client_gives_up_on_exhausted_rate_limit() -> None:
+    with fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        github.rate_limit = 1
+        client, _ = rate_limited_client(github, max_wait=60)
+        client.repository("user/project")
+        with pytest.raises(GithubApiException, match="rate limit"):
+            client.repository("user/project")
+        assert github.limited == 0
+
+
+def test_client_html_error_status() -> None:
+    with fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        github.failures = [502, 200]
+        client = GithubClient(api_url=github.url)
+        with pytest.raises(GithubApiException, match="status 502"):
+            client.repository("user/project")
+        with pytest.raises(GithubApiException, match="invalid JSON"):
+            client.repository("user/project")
+        assert client.repository("user/project").name == "project"
+
+
+def test_client_retries_graphql_rate_limit() -> None:
+    with fake_github() as github:
+        github.add(fake_repo("user", "project"))
+        github.graphql_limited = 2
+        client, clock = rate_limited_client(github)
+        client.token = "token"
+        pages = list(client.graphql_repositories())
+        assert [repo.name for _, page in pages for repo in page] == ["project"]
+        assert client.budget.limited == 2
+        assert client.budget.waited == 120
+        github.graphql_limited = 4
+        with pytest.raises(GithubApiException, match="API rate limit"):
+            list(client.graphql_repositories())
+
+
+def test_rate_limit_delay() -> None:
+    assert rate_limit_delay(200, {}, None) is None
+    assert rate_limit_delay(404, {"retry-after": "5"}, None) is None
+    assert rate_limit_delay(429, {"retry-after": "5"}, None) == 5
+    assert rate_limit_delay(403, {"x-ratelimit-remaining": "0"}, {}) == 0
+    message = {"message": "You have exceeded a secondary rate limit"}
+    assert rate_limit_delay(403, {}, message) == 60
+    assert rate_limit_delay(403, {}, {"message": "Forbidden"}) is None
+    errors = {"errors": [{"type": "RATE_LIMITED"}]}
+    assert rate_limit_delay(200, {}, errors) == 60
+    assert rate_limit_delay(200, {"x-ratelimit-remaining": "0"}, errors) == 0
+
+
+class SlowThread(Thread):
+    def run(self) -> None:
+        time.sleep(0.2)
+        super().run()
+
+
+def test_core_clone_stream_waits_for_late_feeder(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            """
+            preflight:
+                enabled: false
+            autofetch:
+                -
+                    github:
+                        user: user
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+
+        def pages(
+            github: GithubAutofetchConfig,
+        ) -> Iterator[list[RepoSpecification]]:
+            yield [RepoSpecification(url=url, dest="late")]
+
+        monkeypatch.setattr(core, "do_github_pages", pages)
+        monkeypatch.setattr("gitclone.core.Thread", SlowThread)
+        core.clone()
+        assert os.path.exists(os.path.join("late", ".git"))
+
+
+def test_core_clone_stream_stops_feeder_on_failure(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with coreconfig() as f:
+        write(
+            f,
+            """
+            preflight:
+                enabled: false
+            autofetch:
+                -
+                    github:
+                        user: user
+            """,
+        )
+        core = GitcloneCore(load_global=False)
+        fetched: list[int] = []
+
+        def pages(
+            github: GithubAutofetchConfig,
+        ) -> Iterator[list[RepoSpecification]]:
+            for i in range(1000):
+                time.sleep(0.01)
+                fetched.append(i)
+                if i == 2:
+                    raise GithubApiException("listing broken")
+                yield []
+
+        def run(
+            self: GitActionMultiprocessingHandler,
+            verbose: bool = False,
+            dry_run: bool = False,
+        ) -> None:
+            time.sleep(0.2)
+            raise GitOperationException("clone broken")
+
+        monkeypatch.setattr(core, "do_github_pages", pages)
+        monkeypatch.setattr(GitActionMultiprocessingHandler, "run", run)
+        with pytest.raises(GitOperationException, match="clone broken"):
+            core.clone()
+        assert "listing broken" in capsys.readouterr().out
+
+        def endless(
+            github: GithubAutofetchConfig,
+        ) -> Iterator[list[RepoSpecification]]:
+            for i in range(1000):
+                time.sleep(0.01)
+                fetched.append(i)
+                yield []
+
+        monkeypatch.setattr(core, "do_github_pages", endless)
+        fetched.clear()
+        start = time.monotonic()
+        with pytest.raises(GitOperationException, match="clone broken"):
+            core.clone()
+        assert time.monotonic() - start < 2
+        count = len(fetched)
+        time.sleep(0.1)
+        assert len(fetched) == count < 100
@@ -0,0 +1,123 @@
+import os
+
+from gitclone.core import GitcloneCore
+from gitclone.mirrors import MirrorCache, directory_size, mirror_key
+
+from .utils import bare_repo, coreconfig, git, tempdir, write
+
+
+def test_mirror_key() -> None:
+    for url in [
+        "git@github.com:leahevy/gitclone.git",
+        "https://github.com/leahevy/gitclone",
+        "https://user@GitHub.com/leahevy/gitclone.git/",
+        "ssh://git@github.com:22/leahevy/gitclone.git",
+    ]:
+        assert mirror_key(url) == "github.com/leahevy/gitclone"
+    assert mirror_key("file://localhost/tmp/remote.git") == (
+        "localhost/tmp/remote"
+    )
+
+
+def test_mirror_cache_evicts_least_recently_used() -> None:
+    with tempdir():
+        cache = MirrorCache("cache")
+        old = cache.update(bare_repo("old.git"))
+        new = cache.update(bare_repo("new.git"))
+        os.utime(old, (1, 1))
+        assert cache.evict(directory_size(new) + 1) == [old]
+        assert not os.path.exists(old)
+        assert os.path.exists(new)
+        assert cache.evict(0) == [new]
+
+
+def test_core_clone_from_mirror() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        write(
+            f,
+            f"""
+            mirror:
+                dir: cache
+            repositories:
+                - {url} first
+                - {url} second
+            """,
+        )
+        GitcloneCore(load_global=False).clone()
+        assert len([d for d in os.listdir("cache") if d.endswith(".git")]) == 1
+        for dest in ["first", "second"]:
+            assert os.path.exists(os.path.join(dest, "README.md"))
+            assert git("remote", "get-url", "origin", cwd=dest).strip() == url
+            assert (
+                git("rev-parse", "--abbrev-ref", "@{u}", cwd=dest).strip()
+                == "origin/master"
+            )
+
+        work = "remote.git.work"
+        with open(os.path.join(work, "README.md"), "w") as w:
+            w.write("new\n")
+        git("commit", "-q", "-am", "Change", cwd=work)
+        git("push", "-q", os.path.abspath("remote.git"), "master", cwd=work)
+        write(
+            f,
+            f"""
+            mirror:
+                dir: cache
+                max_size: 1
+            repositories:
+                - {url} third
+            """,
+        )
+        GitcloneCore(load_global=False).clone()
+        with open(os.path.join("third", "README.md")) as r:
+            assert r.read() == "new\n"
+
+
+def test_core_mirror_skipped_for_shallow_clones() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git", branches=["master", "dev"], commits=3)
+        write(
+            f,
+            f"""
+            mirror:
+                dir: cache
+            repositories:
+                - {url} shallow depth=1
+                - {url} single single-branch=true
+            """,
+        )
+        GitcloneCore(load_global=False).clone()
+        assert not os.path.exists("cache")
+        assert os.path.exists(os.path.join("shallow", ".git", "shallow"))
+        branches = git("branch", "-r", cwd="single").split()
+        assert "origin/dev" not in branches
+
+
+def test_core_shared_mirror_not_evicted() -> None:
+    with coreconfig() as f:
+        url = bare_repo("remote.git")
+        work = "remote.git.work"
+        with open(os.path.join(work, "data.bin"), "wb") as b:
+            b.write(os.urandom(2 * 1024 * 1024))
+        git("add", "data.bin", cwd=work)
+        git("commit", "-q", "-m", "Data", cwd=work)
+        git("push", "-q", os.path.abspath("remote.git"), "master", cwd=work)
+        write(
+            f,
+            f"""
+            mirror:
+                dir: cache
+                max_size: 1
+                shared: true
+            repositories:
+                - {url} shared
+            """,
+        )
+        GitcloneCore(load_global=False).clone()
+        assert [d for d in os.listdir("cache") if d.endswith(".git")]
+        assert os.path.exists(
+            os.path.join("shared", ".git", "objects", "info", "alternates")
+        )
+        git("fsck", "--no-progress", cwd="shared")
+        assert os.path.exists(os.path.join("shared", "data.bin"))
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from gitclone.gitcmds import GitCloneAction
+from gitclone.preflight import (
+    PREFLIGHT_MISSING_BRANCH,
+    PREFLIGHT_MISSING_REPOSITORY,
+    PREFLIGHT_OK,
+    PREFLIGHT_UNKNOWN,
+    Preflight,
+    PreflightCache,
+    check_remote,
+)
+
+from .utils import bare_repo, git, tempdir
+
+
+def action(url: str, dest: str, branch: str | None = None) -> GitCloneAction:
+    base_url, _, remote_src = url.partition("localhost")
+    return GitCloneAction(
+        base_url=base_url + "localhost",
+        delimiter="/",
+        remote_src=remote_src,
+        full_url=url,
+        dest=dest,
+        branch=branch,
+    )
+
+
+def test_check_remote() -> None:
+    with tempdir():
+        url = bare_repo("remote.git", branches=["master", "feature"])
+        assert check_remote(url, None) == PREFLIGHT_OK
+        assert check_remote(url, "feature") == PREFLIGHT_OK
+        assert check_remote(url, "missing") == PREFLIGHT_MISSING_BRANCH
+        assert (
+            check_remote(url + "-missing", None)
+            == PREFLIGHT_MISSING_REPOSITORY
+        )
+
+
+def test_check_remote_uses_git_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with tempdir():
+        bare_repo("remote.git")
+        base = f"file://localhost{os.getcwd()}/"
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.{base}.insteadOf")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "alias:")
+        assert check_remote("alias:remote.git", None) == PREFLIGHT_OK
+
+
+def test_check_remote_leaves_other_failures_to_clone() -> None:
+    with tempdir():
+        git("init", "-q", "--bare", "empty.git")
+        empty = f"file://localhost{os.path.abspath('empty.git')}"
+        assert check_remote(empty, None) == PREFLIGHT_OK
+        assert check_remote(empty, "master") == PREFLIGHT_MISSING_BRANCH
+        unreachable = "http://127.0.0.1:1/remote.git"
+        assert check_remote(unreachable, None) == PREFLIGHT_UNKNOWN
+        failures = Preflight().run([action(unreachable, "unreachable")])
+        assert failures == []
+
+
+def test_preflight_reports_failures() -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        good = action(url, "good")
+        duplicate = action(url, "duplicate")
+        branch = action(url, "branch", branch="missing")
+        repo = action(url + "-missing", "repo")
+        preflight = Preflight()
+        failures = preflight.run([good, duplicate, branch, repo])
+        assert preflight.checked == 3
+        assert [(a, str(e)) for a, e in failures] == [
+            (branch, f"Branch missing does not exist at {url}"),
+            (repo, f"Repository {url}-missing does not exist"),
+        ]
+
+
+def test_preflight_cache_persists_with_ttl() -> None:
+    with tempdir():
+        url = bare_repo("remote.git")
+        now = [1000.0]
+        path = os.path.join("cache", "preflight.json")
+
+        cache = PreflightCache(path=path, ttl=60, clock=lambda: now[0])
+        Preflight(cache=cache).run([action(url, "dest")])
+        assert os.path.exists(path)
+
+        cache = PreflightCache(path=path, ttl=60, clock=lambda: now[0])
+        assert cache.get(url, None) == PREFLIGHT_OK
+        assert url not in open(path).read()
+
+        now[0] += 120
+        cache = PreflightCache(path=path, ttl=60, clock=lambda: now[0])
+        assert cache.get(url, None) is None
@@ -0,0 +1,71 @@
+from threading import RLock
+
+from gitclone.progress import GitRemoteProgress, GitRichProgress, parse_size
+
+
+def test_progress_coalesces_updates() -> None:
+    progressbar = GitRichProgress(RLock())
+    try:
+        task_id = progressbar.progressbar.add_task(
+            description="test", total=100.0, message=""
+        )
+        task = GitRemoteProgress(progressbar, task_id, "test")
+        progressbar.tasks.append(task)
+        for percentage in range(50):
+            task.update_phase("Receiving", percentage)
+        rich_task = progressbar.progressbar.tasks[0]
+        assert rich_task.completed == 0
+        progressbar.flush()
+        assert rich_task.completed == 49
+        assert rich_task.fields["message"] == "(Receiving)"
+        task.stop()
+        assert not progressbar.tasks
+        assert not progressbar.progressbar.tasks
+    finally:
+        progressbar.close()
+
+
+def test_progress_logs_only_phase_changes_and_thresholds() -> None:
+    progressbar = GitRichProgress(RLock())
+    progressbar.close()
+    logged: list[str] = []
+    progressbar.log = logged.append  # type: ignore
+    task = GitRemoteProgress(progressbar, None, "test")
+    for phase in ["Counting", "Receiving"]:
+        for percentage in range(101):
+            task.update_phase(phase, percentage)
+    assert logged == [
+        f"test: {percentage}/100 ({phase})"
+        for phase in ["Counting", "Receiving"]
+        for percentage in [0, 25, 50, 75, 100]
+    ]
+
+
+def test_parse_size() -> None:
+    assert parse_size("1.50 KiB | 1.00 MiB/s") == 1536
+    assert parse_size("2.00 GiB") == 2 * 1024**3
+    assert parse_size("512 bytes | 0 bytes/s") == 512
+    assert parse_size("done.") is None
+
+
+def test_progress_overall_task() -> None:
+    progressbar = GitRichProgress(RLock())
+    progressbar.is_terminal = True
+    try:
+        progressbar.add_total(3)
+        tasks = [progressbar.task(f"repo{i}", "Clone") for i in range(3)]
+        assert len(progressbar.progressbar.tasks) == 4
+        for i, task in enumerate(tasks):
+            task.update_received(1000 * (i + 1))
+        tasks[0].stop()
+        progressbar.advance()
+        progressbar.flush()
+
+        overall = progressbar.progressbar.tasks[0]
+        assert len(progressbar.progressbar.tasks) == 3
+        assert overall.completed == 1
+        assert overall.total == 3
+        assert "1/3" in str(overall.description)
+        assert overall.fields["message"].startswith("6.0 kB")
+    finally:
+        progressbar.close()
@@ -1,5 +1,12 @@
-from gitclone.exceptions import RepositoryFormatException
-from gitclone.repositories import RepoSpecification
+import pytest
+
+from gitclone.exceptions import CoreException, RepositoryFormatException
+from gitclone.repositories import (
+    RepoFilter,
+    RepoSpecification,
+    compile_patterns,
+    normalize_host,
+)
 
 
 def parse_url(repostr: str) -> tuple[str, str, str, str, str, str]:
@@ -458,3 +465,73 @@ def test_url_failing_invalid_url5() -> None:
         assert res is None
     except RepositoryFormatException:
         pass
+
+
+def test_normalize_host() -> None:
+    assert normalize_host("https://github.com") == "github.com"
+    assert normalize_host("https://token@GitHub.com") == "github.com"
+    assert normalize_host("git@github.com") == "github.com"
+    assert normalize_host("ssh://git@github.com:22") == "github.com"
+
+
+def test_repo_options() -> None:
+    repo = RepoSpecification.parse(
+        "https://github.com/leahevy/gitclone.git dest group=gitclone"
+    )
+    assert repo.url == "https://github.com/leahevy/gitclone.git"
+    assert repo.dest == "dest"
+    assert repo.group == "gitclone"
+
+    repo = RepoSpecification.parse(
+        "https://github.com/leahevy/gitclone.git group=gitclone"
+    )
+    assert repo.dest == ""
+    assert repo.group == "gitclone"
+
+
+def test_repo_options_failing_unknown() -> None:
+    try:
+        res = RepoSpecification.parse(
+            "https://github.com/leahevy/gitclone.git dest unknown=1"
+        )
+        assert res is None
+    except RepositoryFormatException:
+        pass
+
+
+def test_repo_options_failing_internal() -> None:
+    for option in ["url=x", "size=1", "pushed-at=2022-01-01"]:
+        with pytest.raises(RepositoryFormatException):
+            RepoSpecification.parse(
+                f"https://github.com/leahevy/gitclone.git dest {option}"
+            )
+
+
+def test_repo_filter() -> None:
+    repos = [
+        RepoSpecification.parse(f"https://github.com/user/{name}.git {name}")
+        for name in ["api", "api-docs", "web", "tools"]
+    ]
+    repo_filter = RepoFilter(
+        includes=["api", "web", ".*/tools"], excludes=[".*-docs", "web"]
+    )
+    assert [r.dest for r in repo_filter.filter(repos)] == ["api", "tools"]
+    assert RepoFilter(excludes=["api", "web"]).filter(repos) == [repos[3]]
+    assert RepoFilter().filter(repos) == repos
+    assert len(compile_patterns(["a", "b", "c"])) == 1
+    assert len(compile_patterns(["(a)\\1", "b"])) == 2
+    assert len(compile_patterns(["(?i)A", "b"])) == 2
+    assert len(compile_patterns(["(?P<n>api)$", "(?P<n>web)$"])) == 2
+    assert RepoFilter(["(?P<n>api)$", "(?P<n>web)$"]).filter(repos) == [
+        repos[0],
+        repos[2],
+    ]
+    assert RepoFilter(["(?i)API$", "web"]).filter(repos) == [
+        repos[0],
+        repos[2],
+    ]
+
+
+def test_repo_filter_invalid_pattern() -> None:
+    with pytest.raises(CoreException):
+        RepoFilter(["("])
@@ -0,0 +1,94 @@
+import os
+import sys
+from threading import Thread
+
+from gitclone.core import GitcloneCore
+from gitclone.search import Search, parse_grep_line
+
+from .utils import coreconfig, git, tempdir, write
+
+
+def repo(path: str, lines: int) -> None:
+    git("init", "-q", path)
+    with open(os.path.join(path, "file.txt"), "w") as f:
+        f.write("".join(f"needle {i}\n" for i in range(lines)))
+    git("add", "file.txt", cwd=path)
+
+
+def test_parse_grep_line() -> None:
+    match = parse_grep_line("repo", b"dir/a.txt\x0012\x00some: text\n")
+    assert match is not None
+    assert str(match) == os.path.join("repo", "dir/a.txt") + ":12:some: text"
+    assert parse_grep_line("repo", b"Binary file matches\n") is None
+
+
+def test_search_limits() -> None:
+    with tempdir():
+        repo("a", 5)
+        repo("b", 5)
+
+        search = Search("needle")
+        matches = list(search.run(["a", "b", "missing"]))
+        assert len(matches) == 10
+        assert not search.limited
+        assert [m.line for m in matches if m.dest == "a"] == [1, 2, 3, 4, 5]
+
+        search = Search("needle", max_per_repo=2)
+        assert len(list(search.run(["a", "b"]))) == 4
+        assert search.limited
+
+        search = Search("needle", max_total=3, queue_size=1)
+        assert len(list(search.run(["a", "b"]))) == 3
+        assert search.limited
+        assert not search.processes
+
+
+def test_search_errors() -> None:
+    with tempdir():
+        os.mkdir("plain")
+        search = Search("needle")
+        assert list(search.run(["plain"])) == []
+        assert len(search.errors) == 1
+
+
+def test_core_search() -> None:
+    with coreconfig() as f:
+        write(
+            f,
+            """
+            repositories:
+                - https://github.com/leahevy/gitclone.git one
+                - https://github.com/leahevy/gitclone.git two
+            """,
+        )
+        repo("one", 3)
+        repo("two", 3)
+        core = GitcloneCore(load_global=False)
+        assert core.search("NEEDLE 1", ignore_case=True) == 2
+        assert core.search("needle", filters=["one"]) == 3
+
+
+def test_search_with_large_stderr() -> None:
+    with tempdir():
+        os.mkdir("noisy")
+        search = Search("needle")
+        search.command = [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "sys.stderr.write('warning\\n' * 100000)\n"
+            "sys.stderr.flush()\n"
+            "sys.stdout.write('file.txt\\x001\\x00needle\\n')\n"
+            "sys.exit(2)\n",
+        ]
+        matches: list[object] = []
+        thread = Thread(
+            target=lambda: matches.extend(search.run(["noisy"])),
+            daemon=True,
+        )
+        thread.start()
+        thread.join(10)
+        assert not thread.is_alive()
+        assert len(matches) == 1
+        assert len(search.errors) == 1
+        assert "warning" in str(search.errors[0])
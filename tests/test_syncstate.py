@@ -0,0 +1,28 @@
+import os
+
+from gitclone.syncstate import SyncState
+
+from .utils import tempdir
+
+
+def test_sync_state_persists() -> None:
+    with tempdir():
+        state = SyncState("state/sync.json")
+        state.set("repo", "url", {"refs/heads/master": "abc"}, "2022-01-01")
+        state.save()
+        assert os.path.exists(os.path.join("state", "sync.json"))
+
+        loaded = SyncState("state/sync.json")
+        remote = loaded.get("repo", "url")
+        assert remote is not None
+        assert remote.refs == {"refs/heads/master": "abc"}
+        assert remote.pushed_at == "2022-01-01"
+        assert loaded.get("repo", "other-url") is None
+        assert loaded.get("other-repo", "url") is None
+
+
+def test_sync_state_ignores_invalid_file() -> None:
+    with tempdir():
+        with open("sync.json", "w") as f:
+            f.write("{invalid")
+        assert SyncState("sync.json").remotes == {}
@@ -1,5 +1,6 @@
 import os
 import os.path
+import subprocess
 import tempfile
 import textwrap
 from contextlib import contextmanager
@@ -35,4 +36,42 @@ def coreconfig() -> Generator[TextIO, None, None]:
 
 def write(f: TextIO, s: str) -> None:
     f.write(textwrap.dedent(s))
+    f.truncate()
     f.seek(0)
+
+
+def git(*args: str, cwd: str | None = None) -> str:
+    return subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=gitclone",
+            "-c",
+            "user.email=gitclone@example.com",
+            "-c",
+            "init.defaultBranch=master",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def bare_repo(
+    path: str, branches: list[str] = ["master"], commits: int = 1
+) -> str:
+    path = os.path.abspath(path)
+    work = f"{path}.work"
+    git("init", "-q", work)
+    for i in range(commits):
+        with open(os.path.join(work, "README.md"), "w") as f:
+            f.write(f"test {i}\n")
+        git("add", "README.md", cwd=work)
+        git("commit", "-q", "-m", f"Commit {i}", cwd=work)
+    for branch in branches:
+        if branch != "master":
+            git("branch", branch, cwd=work)
+    git("clone", "-q", "--bare", work, path)
+    return f"file://localhost{path}"